@@ -7,18 +7,88 @@ With AI-powered B-roll selection and enhanced captions
 
 import os
 import json
+import importlib.util
 import random
+from collections import Counter, OrderedDict
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import tempfile
 import shutil
 
-try:
-    from moviepy.editor import *
-    from moviepy.video.fx.all import *
-    MOVIEPY = True
-except ImportError:
-    MOVIEPY = False
+# MoviePy is imported inside the methods that render, so importing this
+# module (e.g. for topic analysis) stays fast
+MOVIEPY = importlib.util.find_spec('moviepy') is not None
+
+from broll_library import BrollLibrary, LibraryClip, query_terms, tokenize
+from broll_schedule import BrollWindow, assign_offsets, assign_topics, plan_windows
+from caption_overlay import apply_captions
+from ffmpeg_render import cut_audio
+from footage_cache import DEFAULT_FOOTAGE_MAX_BYTES, FootageCache
+from highlights import Highlight, clip_captions
+from media_info import probe_media
+from parallel_render import write_video
+from subtitles import CAPTION_STYLES
+
+
+def media_duration(path: str, audio: bool = False) -> float:
+    """Duration from the job's ffprobe pass; a MoviePy reader only without ffprobe"""
+    try:
+        return probe_media(path).duration
+    except (OSError, RuntimeError):
+        from moviepy.editor import AudioFileClip, VideoFileClip
+        clip = AudioFileClip(path) if audio else VideoFileClip(path, audio=False)
+        try:
+            return clip.duration
+        finally:
+            clip.close()
+
+
+class FootageSources:
+    """
+    B-roll sources opened on first use, at most `max_open` decoders at a
+    time. Windows render in time order, so a source is closed soon after
+    the timeline moves past its run of windows. A forked render worker
+    never touches the decoders it inherited and opens its own.
+    """
+
+    def __init__(self, fit, max_open: int = 2):
+        self.fit = fit  # clip -> clip filling the output frame
+        self.max_open = max_open
+        self._open: "OrderedDict[str, Tuple[object, object]]" = OrderedDict()
+        self._pid = os.getpid()
+
+    def frame(self, path: str, t: float):
+        if self._pid != os.getpid():
+            # Inherited readers share the parent's pipes; leave them to it
+            self._open = OrderedDict()
+            self._pid = os.getpid()
+        if path in self._open:
+            self._open.move_to_end(path)
+        else:
+            from moviepy.editor import VideoFileClip
+            raw = VideoFileClip(path, audio=False)
+            self._open[path] = (raw, self.fit(raw))
+            while len(self._open) > self.max_open:
+                _, (old, _) = self._open.popitem(last=False)
+                old.close()
+        return self._open[path][1].get_frame(t)
+
+    def clip(self, path: str, offset: float, duration: float, size: Tuple[int, int]):
+        """Window clip reading `path` from `offset`; nothing is opened until a frame is needed"""
+        from moviepy.editor import VideoClip
+
+        # make_frame is set afterwards: VideoClip(make_frame) would decode
+        # frame 0 immediately just to learn the size
+        clip = VideoClip()
+        clip.make_frame = lambda t: self.frame(path, offset + t)
+        clip.size = size
+        return clip.set_duration(duration)
+
+    def close(self):
+        if self._pid == os.getpid():
+            for raw, _ in self._open.values():
+                raw.close()
+        self._open = OrderedDict()
 
 
 class AdvancedVideoAgent:
@@ -26,9 +96,36 @@ class AdvancedVideoAgent:
     Enhanced agent with AI content analysis and stock footage integration
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        caption_renderer: str = "ass",
+        render_workers: int = 1,
+        footage_cache_dir: Optional[str] = None,
+        footage_cache_bytes: int = DEFAULT_FOOTAGE_MAX_BYTES,
+        prefetch_workers: Optional[int] = None,
+        footage_library: Optional[str] = None,
+        library_index: Optional[str] = None,
+        rescan_library: bool = False
+    ):
         self.temp_dir = Path(tempfile.mkdtemp())
-        self.footage_cache = {}
+        self.caption_renderer = caption_renderer  # ass or overlay
+        self.render_workers = render_workers  # >1 renders in parallel chunks (0 = one per core)
+        # Prepared B-roll clips, shared across runs (default: ~/.cache/.../footage)
+        self.footage_cache = FootageCache(footage_cache_dir, footage_cache_bytes)
+        self._pinned_footage: List[Path] = []  # cached clips in use until release_footage()
+        self.prefetch_workers = prefetch_workers
+        self.resolution = (1920, 1080)
+        self.fps = 30
+        # Indexed directory of real clips; the index is built by
+        # `broll_library.py scan` (or rescan_library) and only looked up here
+        self.library = None
+        if footage_library:
+            self.library = BrollLibrary(footage_library, library_index)
+            if rescan_library:
+                self.library.scan()
+            elif not len(self.library):
+                print(f"⚠️  B-roll index for {footage_library} is empty; "
+                      f"run: python broll_library.py scan {footage_library}")
 
     def analyze_content_topics(self, captions: List[Dict]) -> List[str]:
         """
@@ -38,6 +135,12 @@ class AdvancedVideoAgent:
         # Simple keyword extraction (placeholder for NLP)
         all_text = " ".join([c['text'] for c in captions])
 
+        # With a footage library, topics are the caption words it has clips for
+        if self.library is not None:
+            topics = self.library.rank_topics(all_text)
+            if topics:
+                return topics
+
         # Common keywords (would be AI-extracted in full version)
         keywords = [
             "technology", "business", "nature", "city", 
@@ -55,6 +158,7 @@ class AdvancedVideoAgent:
         """
         Fetch stock footage from free sources
         Supports: Pexels, Pixabay (would need API keys)
+        Returns a cached clip at least `duration` long; trim it when using it
         """
         # Placeholder: In production, integrates with:
         # - Pexels API
@@ -65,7 +169,119 @@ class AdvancedVideoAgent:
         if not MOVIEPY:
             return None
 
-        clip = ColorClip(size=(1920, 1080), color=(random.randint(20, 40), random.randint(20, 40), random.randint(40, 60)))
+        path = self.footage_cache.get(
+            topic, duration, self.resolution, self.fps, self._render_placeholder, pin=True
+        )
+        self._pinned_footage.append(path)
+        return str(path)
+
+    def prefetch_stock_footage(self, requests: List[Tuple[str, float]]) -> List[str]:
+        """
+        Make sure footage for every (topic, duration) exists, fetching misses
+        concurrently; the clips are pinned in the cache until release_footage()
+        """
+        if not MOVIEPY:
+            return []
+        paths = self.footage_cache.prefetch(
+            requests, self.resolution, self.fps, self._render_placeholder,
+            workers=self.prefetch_workers, pin=True
+        )
+        self._pinned_footage.extend(paths)
+        return [str(p) for p in paths]
+
+    def release_footage(self):
+        """Let the footage cache evict the clips this agent fetched again"""
+        self.footage_cache.release(self._pinned_footage)
+        self._pinned_footage = []
+
+    def select_library_footage(
+        self,
+        topic: str,
+        window_text: str,
+        duration: float,
+        exclude: Optional[set] = None
+    ) -> Optional[LibraryClip]:
+        """
+        Best library clip for a caption window: its words plus the topic
+        (weighted up), at least `duration` long, preferring clips not in `exclude`
+        """
+        if self.library is None:
+            return None
+        query = Counter({term: 3.0 for term in tokenize(topic)})
+        query.update(query_terms(window_text))
+        for skip in (exclude or set(), set()):
+            clips = self.library.search(query, min_duration=duration, limit=1, exclude=skip)
+            if clips:
+                return clips[0]
+        return None
+
+    def _assign_footage(self, windows: List[BrollWindow]):
+        """
+        Give each window a source clip. A topic keeps its current library clip
+        while that clip has unused footage, then moves on to the next best
+        unused match for the window's captions. Topics without library
+        footage share one cached placeholder each.
+        """
+        current: Dict[str, str] = {}
+        remaining: Dict[str, float] = {}
+        used = set()
+        placeholders: Dict[str, float] = {}
+
+        for window in windows:
+            if window.topic is None:
+                continue
+            source = current.get(window.topic)
+            if source is None or remaining[source] < window.duration:
+                source = None
+                clip = self.select_library_footage(
+                    window.topic, window.text, window.duration, used
+                )
+                if clip is not None:
+                    source = clip.path
+                    remaining[source] = clip.duration
+            if source is not None:
+                current[window.topic] = source
+                used.add(source)
+                remaining[source] -= window.duration
+                window.source = source
+            else:
+                placeholders[window.topic] = max(
+                    placeholders.get(window.topic, 0.0), window.duration
+                )
+
+        if not placeholders:
+            return
+        # One placeholder per topic, long enough for its longest window
+        paths = dict(zip(placeholders, self.prefetch_stock_footage(list(placeholders.items()))))
+        for window in windows:
+            if window.source is None and window.topic in paths:
+                window.source = paths[window.topic]
+
+    def _fill_frame(self, clip):
+        """Scale a library clip to cover the output frame and crop the overflow"""
+        width, height = self.resolution
+        if tuple(clip.size) == (width, height):
+            return clip
+        scale = max(width / clip.w, height / clip.h)
+        clip = clip.resize(scale)
+        return clip.crop(x_center=clip.w / 2, y_center=clip.h / 2, width=width, height=height)
+
+    @staticmethod
+    def _render_placeholder(
+        topic: str,
+        duration: float,
+        resolution: Tuple[int, int],
+        fps: int,
+        path: Path
+    ):
+        """Colored background with the topic name; the color is stable per topic"""
+        from moviepy.editor import ColorClip, CompositeVideoClip, TextClip
+
+        rng = random.Random(topic)
+        clip = ColorClip(
+            size=resolution,
+            color=(rng.randint(20, 40), rng.randint(20, 40), rng.randint(40, 60))
+        )
         clip = clip.set_duration(duration)
 
         # Add topic text
@@ -77,12 +293,7 @@ class AdvancedVideoAgent:
         ).set_duration(duration).set_position('center')
 
         composite = CompositeVideoClip([clip, txt])
-
-        # Save temp file
-        temp_path = self.temp_dir / f"stock_{topic}.mp4"
-        composite.write_videofile(str(temp_path), fps=30, verbose=False, logger=None)
-
-        return str(temp_path)
+        composite.write_videofile(str(path), fps=fps, audio=False, verbose=False, logger=None)
 
     def create_dynamic_b_roll(
         self,
@@ -97,105 +308,104 @@ class AdvancedVideoAgent:
 
         if not MOVIEPY:
             raise RuntimeError("MoviePy required")
+        from moviepy.editor import AudioFileClip, ColorClip, concatenate_videoclips
 
         # Analyze topics
         topics = self.analyze_content_topics(captions)
         print(f"📊 Detected topics: {topics}")
 
-        # Load audio
-        audio = AudioFileClip(audio_path)
-
-        # Create segments with matching footage
-        video_segments = []
-        segment_duration = 5.0  # seconds per B-roll clip
-
-        for i, topic in enumerate(topics):
-            start_time = i * segment_duration
-            if start_time >= audio.duration:
-                break
+        duration = media_duration(audio_path, audio=True)
 
-            duration = min(segment_duration, audio.duration - start_time)
+        # Tile the whole audio with caption-aligned windows, one topic each
+        windows = plan_windows(captions, duration)
+        assign_topics(windows, topics)
+        self._assign_footage(windows)
 
-            # Get footage for this topic
-            footage_path = self.fetch_stock_footage(topic, duration)
+        # Sources are opened lazily while rendering and only the ranges
+        # windows use are decoded; consecutive windows share one decoder
+        paths = {window.source for window in windows if window.source}
+        assign_offsets(windows, {path: media_duration(path) for path in paths})
+        print(f"🎞️  {len(windows)} B-roll windows from {len(paths)} clips")
+        sources = FootageSources(self._fill_frame)
 
-            if footage_path:
-                segment = VideoFileClip(footage_path)
-                segment = segment.subclip(0, duration)
-                video_segments.append(segment)
+        video_segments = []
+        for window in windows:
+            if window.source:
+                segment = sources.clip(
+                    window.source, window.offset, window.duration, self.resolution
+                )
+            else:
+                segment = ColorClip(size=self.resolution, color=(30, 30, 40))
+                segment = segment.set_duration(window.duration)
+            video_segments.append(segment)
 
         # Concatenate
         if video_segments:
             final_video = concatenate_videoclips(video_segments)
-            final_video = final_video.set_audio(audio.subclip(0, final_video.duration))
         else:
             # Fallback to color background
             final_video = ColorClip(size=(1920, 1080), color=(30, 30, 40))
-            final_video = final_video.set_duration(audio.duration).set_audio(audio)
+            final_video = final_video.set_duration(duration)
+        if not shutil.which('ffmpeg'):
+            # write_video muxes `audio_path` in only with FFmpeg on PATH
+            final_video = final_video.set_audio(AudioFileClip(audio_path))
 
         # Add captions
-        final_video = self._add_enhanced_captions(final_video, captions)
+        final_video, caption_params = self._add_enhanced_captions(final_video, captions)
 
         # Export
-        final_video.write_videofile(
-            output_path,
-            fps=30,
-            codec='libx264',
-            audio_codec='aac',
-            preset='medium'
-        )
+        segment_bounds = [window.end for window in windows[:-1]]
+        try:
+            write_video(
+                final_video,
+                output_path,
+                self.temp_dir / "chunks",
+                workers=self.render_workers,
+                fps=30,
+                boundaries=segment_bounds,
+                audio_path=audio_path,
+                preset='medium',
+                ffmpeg_params=caption_params,
+                audio_codec='aac'
+            )
+        finally:
+            sources.close()
+            self.release_footage()
 
         return output_path
 
     def _add_enhanced_captions(self, video, captions: List[Dict]):
-        """Add modern, YouTube-style captions"""
-        caption_clips = []
-
-        for cap in captions:
-            # Modern caption style with background
-            txt = TextClip(
-                cap['text'].upper(),
-                fontsize=60,
-                color='yellow',
-                stroke_color='black',
-                stroke_width=3,
-                font='Arial-Bold',
-                method='caption',
-                size=(video.w * 0.9, None),
-                align='center'
-            )
-
-            # Add semi-transparent background
-            bg = ColorClip(
-                size=(txt.w + 40, txt.h + 20),
-                color=(0, 0, 0)
-            ).set_opacity(0.6)
-
-            txt = txt.set_start(cap['start']).set_duration(cap['end'] - cap['start'])
-            bg = bg.set_start(cap['start']).set_duration(cap['end'] - cap['start'])
-
-            # Center positioning
-            txt = txt.set_position(('center', 'bottom')).margin(bottom=80, opacity=0)
-            bg = bg.set_position(('center', 'bottom')).margin(bottom=80, opacity=0)
-
-            caption_clips.extend([bg, txt])
-
-        return CompositeVideoClip([video] + caption_clips)
+        """Add modern, YouTube-style captions; returns (clip, ffmpeg_params)"""
+        return apply_captions(
+            video,
+            captions,
+            CAPTION_STYLES['youtube'],
+            self.caption_renderer,
+            self.temp_dir / "captions_youtube.ass"
+        )
 
     def create_youtube_shorts(
         self,
         audio_path: str,
         captions: List[Dict],
         output_path: str,
-        hook_text: str = ""
+        hook_text: str = "",
+        footage: Optional[str] = None
     ) -> str:
         """
         Create YouTube Shorts (9:16 format) from audio
+        `footage` fills the 16:9 content area, looped if it is too short;
+        render a highlight's cut audio (see create_highlight_shorts) rather
+        than a whole episode
         """
         print("📱 Creating YouTube Shorts format...")
 
         if not MOVIEPY:
             raise RuntimeError("MoviePy required")
+        from moviepy.editor import (
+            AudioFileClip, ColorClip, CompositeVideoClip, TextClip, VideoFileClip
+        )
+        from moviepy.video.fx.all import loop
 
         # 9:16 aspect ratio (1080x1920)
         target_size = (1080, 1920)
@@ -210,8 +420,18 @@ class AdvancedVideoAgent:
         bg = bg.set_duration(audio.duration)
 
         # Main content area (centered, 16:9 cropped to fit)
-        content = ColorClip(size=(1080, 608), color=(40, 40, 60))  # 16:9 in middle
-        content = content.set_duration(audio.duration)
+        if footage:
+            content = VideoFileClip(footage, audio=False)
+            content = content.resize(max(1080 / content.w, 608 / content.h))
+            content = content.crop(
+                x_center=content.w / 2, y_center=content.h / 2, width=1080, height=608
+            )
+            if content.duration < audio.duration:
+                content = loop(content, duration=audio.duration)
+            content = content.subclip(0, audio.duration)
+        else:
+            content = ColorClip(size=(1080, 608), color=(40, 40, 60))  # 16:9 in middle
+            content = content.set_duration(audio.duration)
         content = content.set_position(('center', 'center'))
 
         # Hook text at top
@@ -233,39 +453,78 @@ class AdvancedVideoAgent:
         final = final.set_audio(audio)
 
         # Add captions optimized for mobile
-        final = self._add_mobile_captions(final, captions)
+        final, caption_params = self._add_mobile_captions(final, captions)
 
-        final.write_videofile(
+        write_video(
+            final,
             output_path,
+            self.temp_dir / "chunks",
+            workers=self.render_workers,
             fps=30,
-            codec='libx264'
+            audio_path=audio_path,
+            ffmpeg_params=caption_params
         )
 
         return output_path
 
-    def _add_mobile_captions(self, video, captions):
-        """Captions optimized for mobile viewing"""
-        caption_clips = []
-
-        for cap in captions:
-            txt = TextClip(
-                cap['text'],
-                fontsize=80,  # Larger for mobile
-                color='white',
-                stroke_color='black',
-                stroke_width=4,
-                font='Arial-Bold',
-                method='caption',
-                size=(video.w * 0.95, None),
-                align='center'
-            )
-
-            txt = txt.set_start(cap['start']).set_duration(cap['end'] - cap['start'])
-            txt = txt.set_position(('center', 1400))  # Lower third for mobile
-
-            caption_clips.append(txt)
+    def create_highlight_shorts(
+        self,
+        audio_path: str,
+        captions: List[Dict],
+        highlights: List[Highlight],
+        output_dir: str
+    ) -> List[str]:
+        """
+        One Short per highlight: its span of the audio is cut by stream copy
+        and only that span is rendered, over footage for the span's topic
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        plans = []
+        for highlight in highlights:
+            clip_caps = clip_captions(captions, highlight.start, highlight.end)
+            topic = self.analyze_content_topics(clip_caps)[0]
+            match = self.select_library_footage(topic, highlight.text, highlight.duration)
+            plans.append((highlight, clip_caps, topic, match.path if match else None))
+
+        # Placeholder footage for spans the library has nothing for, fetched together
+        missing = [(topic, h.duration) for h, _, topic, path in plans if path is None]
+        fetched = iter(self.prefetch_stock_footage(missing))
+
+        outputs = []
+        try:
+            for i, (highlight, clip_caps, topic, footage) in enumerate(plans, 1):
+                if footage is None:
+                    footage = next(fetched, None)
+                audio = cut_audio(
+                    audio_path, highlight.start, highlight.end,
+                    self.temp_dir / f"highlight_{i:02d}{Path(audio_path).suffix}"
+                )
+                output_path = output_dir / f"short_{i:02d}.mp4"
+                print(f"✂️  Short {i}: {highlight.start:.1f}s-{highlight.end:.1f}s ({topic})")
+                self.create_youtube_shorts(str(audio), clip_caps, str(output_path), footage=footage)
+                audio.unlink(missing_ok=True)
+                outputs.append(str(output_path))
+        finally:
+            self.release_footage()
+        return outputs
+
+    def cleanup(self):
+        """Remove temporary files"""
+        self.release_footage()
+        if self.temp_dir.exists():
+            shutil.rmtree(self.temp_dir)
 
-        return CompositeVideoClip([video] + caption_clips)
+    def _add_mobile_captions(self, video, captions):
+        """Captions optimized for mobile viewing; returns (clip, ffmpeg_params)"""
+        return apply_captions(
+            video,
+            captions,
+            CAPTION_STYLES['mobile'],
+            self.caption_renderer,
+            self.temp_dir / "captions_mobile.ass"
+        )
 
 
 def create_complete_workflow():
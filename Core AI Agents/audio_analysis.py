@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Audio decoding and segmentation helpers shared by the video agents
+Decodes each input once into PCM that every stage can reuse
+"""
+
+import importlib.util
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# librosa takes seconds to import; it is only loaded when FFmpeg is missing
+LIBROSA_AVAILABLE = importlib.util.find_spec('librosa') is not None
+
+
+# Whisper works at 16 kHz mono, which is also plenty for energy analysis
+CANONICAL_SAMPLE_RATE = 16000
+
+# Decoded audio larger than this is memory-mapped instead of held in RAM
+MMAP_THRESHOLD_BYTES = 256 * 1024 * 1024
+
+# Samples per RMS frame (32 ms at the canonical rate)
+HOP_LENGTH = 512
+
+
+def can_decode() -> bool:
+    """True when audio can be decoded to PCM (FFmpeg or librosa + NumPy)"""
+    return NUMPY_AVAILABLE and (shutil.which('ffmpeg') is not None or LIBROSA_AVAILABLE)
+
+
+@dataclass(frozen=True)
+class PcmFile:
+    """
+    Picklable reference to (a slice of) a raw float32 PCM file
+    Lets worker processes map the job's decoded audio instead of copying it
+    """
+    path: str
+    sample_rate: int = CANONICAL_SAMPLE_RATE
+    start: int = 0
+    length: int = -1
+
+    def open(self) -> "np.ndarray":
+        shape = None if self.length < 0 else (self.length,)
+        return np.memmap(self.path, dtype=np.float32, mode='r', offset=self.start * 4, shape=shape)
+
+
+@dataclass
+class DecodedAudio:
+    """
+    PCM for one input file, decoded once at the canonical sample rate
+    The samples live in `pcm_path` (raw float32) and are memory-mapped when large
+    """
+    source_path: str
+    pcm_path: Path
+    samples: "np.ndarray"
+    sample_rate: int = CANONICAL_SAMPLE_RATE
+    _clip: object = field(default=None, repr=False)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / float(self.sample_rate)
+
+    @property
+    def is_memory_mapped(self) -> bool:
+        return isinstance(self.samples, np.memmap)
+
+    @property
+    def pcm_file(self) -> PcmFile:
+        return PcmFile(str(self.pcm_path), self.sample_rate, 0, len(self.samples))
+
+    @classmethod
+    def load(
+        cls,
+        audio_path: str,
+        work_dir: Path,
+        sample_rate: int = CANONICAL_SAMPLE_RATE,
+        mmap_threshold: int = MMAP_THRESHOLD_BYTES
+    ) -> "DecodedAudio":
+        """Decode `audio_path` to mono float32 PCM inside `work_dir`"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy required for audio decoding")
+
+        work_dir = Path(work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        fd, pcm_name = tempfile.mkstemp(prefix=f"{Path(audio_path).stem}.", suffix='.f32', dir=work_dir)
+        os.close(fd)
+        pcm_path = Path(pcm_name)
+
+        if shutil.which('ffmpeg'):
+            # Decode straight to disk so the full signal never sits in a pipe buffer
+            cmd = [
+                'ffmpeg', '-y', '-v', 'error',
+                '-i', str(audio_path),
+                '-ac', '1', '-ar', str(sample_rate),
+                '-f', 'f32le', str(pcm_path)
+            ]
+            subprocess.run(cmd, check=True)
+        elif LIBROSA_AVAILABLE:
+            import librosa
+            y, _ = librosa.load(audio_path, sr=sample_rate, mono=True)
+            y.astype(np.float32).tofile(pcm_path)
+            del y
+        else:
+            raise RuntimeError("FFmpeg or librosa required for audio decoding")
+
+        if pcm_path.stat().st_size >= mmap_threshold:
+            samples = np.memmap(pcm_path, dtype=np.float32, mode='r')
+        else:
+            samples = np.fromfile(pcm_path, dtype=np.float32)
+
+        return cls(source_path=str(audio_path), pcm_path=pcm_path,
+                   samples=samples, sample_rate=sample_rate)
+
+    def audio_clip(self):
+        """
+        MoviePy AudioFileClip for the original file, opened once per job
+        This decodes the source again: the canonical PCM is 16 kHz mono,
+        fine for analysis but not for the soundtrack. Renders normally mux
+        the source file in with FFmpeg and never read this clip's samples.
+        """
+        if self._clip is None:
+            from moviepy.editor import AudioFileClip
+            self._clip = AudioFileClip(self.source_path)
+        return self._clip
+
+    def close(self):
+        """Release the clip reader and the on-disk PCM"""
+        if self._clip is not None:
+            self._clip.close()
+            self._clip = None
+        self.samples = np.zeros(0, dtype=np.float32)
+        if self.pcm_path.exists():
+            self.pcm_path.unlink()
+
+
+def frame_rms(samples: "np.ndarray", hop_length: int = HOP_LENGTH) -> "np.ndarray":
+    """RMS energy of consecutive non-overlapping frames (trailing partial frame dropped)"""
+    n_frames = len(samples) // hop_length
+    frames = np.asarray(samples[:n_frames * hop_length], dtype=np.float32).reshape(n_frames, hop_length)
+    # einsum sums the squares row by row without materialising a squared copy
+    return np.sqrt(np.einsum('ij,ij->i', frames, frames) / hop_length)
+
+
+def silent_runs(mask: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """Run-length encode a boolean mask; returns (starts, lengths) of the True runs"""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.diff(padded)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return starts, ends - starts
+
+
+def _segment(start: float, end: float) -> Dict:
+    return {
+        'start': start,
+        'end': end,
+        'duration': end - start,
+        'type': 'content'
+    }
+
+
+def _enforce_min_length(
+    boundaries: "np.ndarray",
+    strength: "np.ndarray",
+    min_length: float
+) -> "np.ndarray":
+    """
+    Drop the weaker end of every gap shorter than `min_length`
+    Each pass is vectorized; only local minima among the nominated
+    boundaries are removed so neighbouring gaps are not over-merged
+    """
+    while len(boundaries) > 2:
+        short = np.diff(boundaries) < min_length
+        if not np.any(short):
+            break
+        left = np.arange(len(short))
+        nominated = np.where(strength[left] <= strength[left + 1], left, left + 1)[short]
+        victim = np.zeros(len(boundaries), dtype=bool)
+        victim[nominated] = True
+
+        prev_victim = np.concatenate(([False], victim[:-1]))
+        next_victim = np.concatenate((victim[1:], [False]))
+        prev_strength = np.concatenate(([np.inf], strength[:-1]))
+        next_strength = np.concatenate((strength[1:], [np.inf]))
+        drop = (victim
+                & (~prev_victim | (strength < prev_strength))
+                & (~next_victim | (strength <= next_strength)))
+
+        boundaries, strength = boundaries[~drop], strength[~drop]
+    return boundaries
+
+
+def _split_long(boundaries: "np.ndarray", max_length: float) -> "np.ndarray":
+    """Evenly subdivide every gap longer than `max_length`"""
+    gaps = np.diff(boundaries)
+    pieces = np.maximum(1, np.ceil(gaps / max_length - 1e-9)).astype(int)
+    owner = np.repeat(np.arange(len(gaps)), pieces)
+    step = np.arange(len(owner)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    starts = boundaries[owner] + gaps[owner] * step / pieces[owner]
+    return np.concatenate((starts, boundaries[-1:]))
+
+
+def _snap_to_pauses(pauses: "np.ndarray", duration: float, count: int) -> "np.ndarray":
+    """
+    Place `count` segments: evenly spaced boundaries moved onto the nearest
+    pause when one lies within half a spacing, so the order is preserved
+    """
+    ideal = np.linspace(0.0, duration, count + 1)
+    inner = ideal[1:-1]
+    if len(pauses) and len(inner):
+        right = np.clip(np.searchsorted(pauses, inner), 0, len(pauses) - 1)
+        left = np.clip(right - 1, 0, len(pauses) - 1)
+        nearest = np.where(
+            np.abs(pauses[left] - inner) <= np.abs(pauses[right] - inner),
+            pauses[left], pauses[right]
+        )
+        tolerance = 0.45 * duration / count
+        ideal[1:-1] = np.where(np.abs(nearest - inner) <= tolerance, nearest, inner)
+    return ideal
+
+
+def align_slides(segments: List[Dict], duration: float, count: int) -> List[float]:
+    """
+    Durations of `count` slides whose changes move from even spacing onto
+    the nearest segment boundary (a pause) within half a slide; the
+    segments themselves are left as they are
+    """
+    pauses = np.array([s['end'] for s in segments[:-1]], dtype=np.float64)
+    edges = _snap_to_pauses(pauses, duration, count)
+    return np.diff(edges).tolist()
+
+
+def detect_segments(
+    energy: "np.ndarray",
+    frame_seconds: float,
+    duration: float,
+    threshold_ratio: float = 0.5,
+    min_pause: float = 0.3,
+    min_segment: float = 3.0,
+    max_segment: float = 10.0,
+    target_segments: Optional[int] = None
+) -> List[Dict]:
+    """
+    Pause-based segmentation of a whole RMS envelope, with no per-frame loops
+    Silent runs (below threshold_ratio x mean energy) become candidate cuts;
+    with `target_segments` exactly that many segments are returned, otherwise
+    min/max segment lengths are enforced
+    """
+    if len(energy) == 0 or duration <= 0:
+        return [_segment(0.0, max(duration, 0.0))]
+
+    threshold = float(np.mean(energy)) * threshold_ratio
+    starts, lengths = silent_runs(energy < threshold)
+    keep = lengths >= max(1, int(round(min_pause / frame_seconds)))
+    starts, lengths = starts[keep], lengths[keep]
+
+    pauses = (starts + lengths / 2.0) * frame_seconds
+    inside = (pauses > 0) & (pauses < duration)
+    pauses, strength = pauses[inside], lengths[inside].astype(np.float64)
+
+    if target_segments:
+        boundaries = _snap_to_pauses(pauses, duration, int(target_segments))
+    else:
+        boundaries = np.concatenate(([0.0], pauses, [duration]))
+        strength = np.concatenate(([np.inf], strength, [np.inf]))
+        boundaries = _enforce_min_length(boundaries, strength, min_segment)
+        boundaries = _split_long(boundaries, max_segment)
+
+    return [
+        _segment(float(start), float(end))
+        for start, end in zip(boundaries[:-1], boundaries[1:])
+    ]
+
+
+def open_pcm_stream(
+    audio_path: str,
+    sample_rate: int = CANONICAL_SAMPLE_RATE,
+    block_seconds: float = 30.0
+) -> Tuple[int, Iterator["np.ndarray"]]:
+    """
+    Read mono float32 PCM in fixed-size blocks without decoding the whole file
+    Returns (sample_rate, block iterator); uses an FFmpeg pipe, else librosa.stream
+    """
+    if shutil.which('ffmpeg'):
+        block_bytes = int(block_seconds * sample_rate) * 4
+
+        def blocks():
+            cmd = [
+                'ffmpeg', '-v', 'error',
+                '-i', str(audio_path),
+                '-ac', '1', '-ar', str(sample_rate),
+                '-f', 'f32le', 'pipe:1'
+            ]
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+            try:
+                while True:
+                    data = proc.stdout.read(block_bytes)
+                    if not data:
+                        break
+                    yield np.frombuffer(data[:len(data) // 4 * 4], dtype=np.float32)
+            finally:
+                proc.stdout.close()
+                if proc.poll() is None:
+                    proc.terminate()
+                proc.wait()
+
+        return sample_rate, blocks()
+
+    if LIBROSA_AVAILABLE:
+        import librosa
+        native_sr = librosa.get_samplerate(audio_path)
+        block_frames = max(1, int(block_seconds * native_sr) // HOP_LENGTH)
+        stream = librosa.stream(
+            audio_path, block_length=block_frames,
+            frame_length=HOP_LENGTH, hop_length=HOP_LENGTH, mono=True
+        )
+        return native_sr, stream
+
+    raise RuntimeError("FFmpeg or librosa required for streaming analysis")
+
+
+def stream_frame_rms(audio_path: str, block_seconds: float = 30.0) -> Tuple["np.ndarray", int]:
+    """
+    Whole RMS envelope from fixed-size blocks, without holding the PCM
+    Returns (energy, sample_rate); frames are HOP_LENGTH samples long
+    """
+    sample_rate, blocks = open_pcm_stream(audio_path, block_seconds=block_seconds)
+    parts = []
+    carry = np.zeros(0, dtype=np.float32)
+    for block in blocks:
+        buffer = np.concatenate((carry, block))
+        usable = len(buffer) // HOP_LENGTH * HOP_LENGTH
+        carry = buffer[usable:]
+        parts.append(frame_rms(buffer[:usable]))
+    energy = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+    return energy, sample_rate
+
+
+class StreamingSegmenter:
+    """
+    Incremental pause-based segmentation over a stream of RMS frames
+    Only the frames since the last cut are kept, so memory is bounded by
+    max_segment no matter how long the input is
+    """
+
+    def __init__(
+        self,
+        frame_seconds: float,
+        threshold_ratio: float = 0.5,
+        min_pause: float = 0.3,
+        min_segment: float = 3.0,
+        max_segment: float = 10.0
+    ):
+        self.frame_seconds = frame_seconds
+        self.threshold_ratio = threshold_ratio
+        self.min_pause_frames = max(1, int(round(min_pause / frame_seconds)))
+        self.min_frames = max(1, int(round(min_segment / frame_seconds)))
+        self.max_frames = max(self.min_frames + 1, int(round(max_segment / frame_seconds)))
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._start_frame = 0
+        self._energy_sum = 0.0
+        self._energy_count = 0
+
+    def feed(self, rms: "np.ndarray") -> List[Dict]:
+        """Add RMS frames; returns any segments that are now final"""
+        self._energy_sum += float(np.sum(rms, dtype=np.float64))
+        self._energy_count += len(rms)
+        self._pending = np.concatenate((self._pending, rms))
+
+        segments = []
+        cut = self._next_cut()
+        while cut is not None:
+            start = self._start_frame * self.frame_seconds
+            self._start_frame += cut
+            self._pending = self._pending[cut:]
+            segments.append(_segment(start, self._start_frame * self.frame_seconds))
+            cut = self._next_cut()
+        return segments
+
+    def finish(self, duration: float) -> List[Dict]:
+        """Flush the remaining frames as the final segment ending at `duration`"""
+        start = self._start_frame * self.frame_seconds
+        self._pending = np.zeros(0, dtype=np.float32)
+        if duration - start <= 0:
+            return []
+        return [_segment(start, duration)]
+
+    def _next_cut(self):
+        """Frame offset of the next boundary inside the pending window, if decided"""
+        n = len(self._pending)
+        if n < self.min_frames:
+            return None
+
+        threshold = self._energy_sum / max(1, self._energy_count) * self.threshold_ratio
+        starts, lengths = silent_runs(self._pending < threshold)
+        centres = starts + lengths // 2
+
+        # Pauses are judged whole: a run touching the end of the buffer may
+        # still be growing, so it is decided once more frames arrive
+        complete = starts + lengths < n
+        ok = (complete & (lengths >= self.min_pause_frames)
+              & (centres >= self.min_frames) & (centres <= self.max_frames))
+        if np.any(ok):
+            return int(centres[np.argmax(ok)])
+        growing = ~complete & (starts + (n - starts) // 2 <= self.max_frames)
+        if n < self.max_frames or np.any(growing):
+            return None
+
+        # No pause long enough: cut at the quietest sub-threshold frame, the
+        # latest of equals, else at max_segment like detect_segments
+        allowed = self._pending[self.min_frames:self.max_frames]
+        quiet = np.flatnonzero((allowed == allowed.min()) & (allowed < threshold))
+        if len(quiet):
+            return self.min_frames + int(quiet[-1])
+        return self.max_frames
+
+
+def stream_segments(
+    audio_path: str,
+    block_seconds: float = 30.0,
+    threshold_ratio: float = 0.5,
+    min_pause: float = 0.3,
+    min_segment: float = 3.0,
+    max_segment: float = 10.0
+) -> Iterator[Dict]:
+    """
+    Bounded-memory segmentation: decode fixed-size blocks, compute RMS
+    incrementally and yield segment dicts as soon as each one is final
+    """
+    sample_rate, blocks = open_pcm_stream(audio_path, block_seconds=block_seconds)
+    segmenter = StreamingSegmenter(
+        HOP_LENGTH / sample_rate, threshold_ratio,
+        min_pause, min_segment, max_segment
+    )
+
+    carry = np.zeros(0, dtype=np.float32)
+    total_samples = 0
+    for block in blocks:
+        total_samples += len(block)
+        buffer = np.concatenate((carry, block))
+        usable = len(buffer) // HOP_LENGTH * HOP_LENGTH
+        carry = buffer[usable:]
+        yield from segmenter.feed(frame_rms(buffer[:usable]))
+
+    yield from segmenter.finish(total_samples / float(sample_rate))
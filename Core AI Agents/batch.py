@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Batch processing of many NotebookLM exports
+Jobs from a manifest run on a set of worker processes; each job gets its
+own agent and temp dir, which is removed as soon as that job finishes.
+Workers are ordinary (non-daemonic) processes so a job can start its own
+render and transcription pools.
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from multi_output import parse_output_targets
+from podcast_video_creator import NotebookLMVideoAgent, VideoConfig
+from transcription import WhisperModelRegistry, limit_torch_threads, whisper_available
+
+
+@dataclass
+class BatchJob:
+    """One (audio, visuals, output) entry of a batch manifest"""
+    audio: str
+    visuals: str
+    output: str
+    style: str = "slides"
+
+
+def load_manifest(manifest_path: str) -> List[BatchJob]:
+    """
+    Read jobs from JSON: a list of {"audio", "visuals", "output"[, "style"]}
+    objects, or {"jobs": [...]}; relative paths resolve against the manifest
+    """
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    entries = data['jobs'] if isinstance(data, dict) else data
+
+    base = manifest_path.parent
+    jobs = []
+    for entry in entries:
+        jobs.append(BatchJob(
+            audio=str(base / entry['audio']),
+            visuals=str(base / entry['visuals']),
+            output=str(base / entry['output']),
+            style=entry.get('style', 'slides')
+        ))
+    return jobs
+
+
+# Share of each worker's cores given to Whisper; the encoder gets the rest
+DEFAULT_TRANSCRIPTION_SHARE = 0.5
+
+
+def split_cpu(
+    workers: int,
+    cores: Optional[int] = None,
+    transcription_share: float = DEFAULT_TRANSCRIPTION_SHARE
+) -> Tuple[int, int]:
+    """
+    (transcription threads, encoder threads) per worker: the cores are
+    divided between workers, then each worker's share between its stages,
+    so one worker transcribing while another encodes never oversubscribes
+    """
+    cores = cores or os.cpu_count() or 1
+    share = max(1, cores // max(1, workers))
+    transcription = min(share, max(1, int(round(share * transcription_share))))
+    return transcription, max(1, share - transcription)
+
+
+def _init_worker(whisper_model: str, transcription_threads: int):
+    """Keep each worker's Whisper share of the CPU fixed and the model warm"""
+    if whisper_available():
+        limit_torch_threads(transcription_threads)
+        WhisperModelRegistry.preload(whisper_model)
+
+
+def run_job(job: BatchJob, config: VideoConfig) -> Dict:
+    """Process one job in an isolated agent; never raises"""
+    started = time.time()
+    summary = {**asdict(job), 'status': 'ok', 'error': None}
+    agent = NotebookLMVideoAgent(config)
+    try:
+        Path(job.output).parent.mkdir(parents=True, exist_ok=True)
+        results = agent.process_notebooklm_export(
+            audio_path=job.audio,
+            visual_assets_dir=job.visuals,
+            output_path=job.output,
+            style=job.style
+        )
+        summary['segments'] = len(results['segments'])
+        summary['captions'] = len(results['captions'])
+    except Exception as e:
+        summary['status'] = 'failed'
+        summary['error'] = f"{type(e).__name__}: {e}"
+    finally:
+        # The job's temp dir (decoded PCM, chunks, captions) goes right away
+        agent.cleanup()
+    summary['seconds'] = round(time.time() - started, 2)
+    return summary
+
+
+def _job_worker(tasks, results, config: VideoConfig, transcription_threads: int):
+    """Worker process: warm up once, then run (index, job) items until None arrives"""
+    _init_worker(config.whisper_model, transcription_threads)
+    for index, job in iter(tasks.get, None):
+        results.put((index, run_job(job, config)))
+
+
+def run_batch(
+    jobs: List[BatchJob],
+    config: Optional[VideoConfig] = None,
+    workers: int = 1,
+    summary_path: Optional[str] = None,
+    transcription_share: float = DEFAULT_TRANSCRIPTION_SHARE
+) -> Dict:
+    """
+    Run `jobs` on `workers` processes and return (and optionally write) a
+    summary; each worker's share of the cores is split between its Whisper
+    and encoder threads (see split_cpu)
+    """
+    config = config or VideoConfig()
+    workers = max(1, min(workers, len(jobs) or 1))
+    transcription_threads, encode_threads = split_cpu(
+        workers, transcription_share=transcription_share
+    )
+    # A job's own transcription and render pools stay inside its stage budget
+    job_config = replace(
+        config,
+        encode_threads=config.encode_threads or encode_threads,
+        transcription_workers=config.transcription_workers or transcription_threads,
+        render_workers=config.render_workers or encode_threads
+    )
+
+    print(f"📦 Running {len(jobs)} jobs on {workers} workers "
+          f"({transcription_threads} Whisper + {encode_threads} encoder threads each)...")
+    started = time.time()
+    results: List[Optional[Dict]] = [None] * len(jobs)
+
+    context = multiprocessing.get_context()
+    tasks, finished = context.Queue(), context.Queue()
+    for item in enumerate(jobs):
+        tasks.put(item)
+    for _ in range(workers):
+        tasks.put(None)
+    procs = [
+        context.Process(
+            target=_job_worker,
+            args=(tasks, finished, job_config, transcription_threads),
+            daemon=False
+        )
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+
+    remaining = len(jobs)
+    while remaining:
+        try:
+            index, result = finished.get(timeout=1.0)
+        except queue.Empty:
+            if not any(proc.is_alive() for proc in procs):
+                break
+            continue
+        remaining -= 1
+        results[index] = result
+        icon = "✅" if result['status'] == 'ok' else "❌"
+        print(f"{icon} {result['output']} ({result['seconds']:.0f}s)")
+    for proc in procs:
+        proc.join()
+
+    # Jobs whose worker died (e.g. killed for memory) never reported back
+    for i, job in enumerate(jobs):
+        if results[i] is None:
+            results[i] = {**asdict(job), 'status': 'failed',
+                          'error': 'worker process exited', 'seconds': 0.0}
+    return summarize(results, started, summary_path, workers=workers)
+
+
+def summarize(
+    results: List[Dict],
+    started: float,
+    summary_path: Optional[str] = None,
+    **extra
+) -> Dict:
+    """Batch summary from per-job results, optionally written as JSON"""
+    summary = {
+        'jobs': results,
+        'succeeded': sum(1 for r in results if r['status'] == 'ok'),
+        'failed': sum(1 for r in results if r['status'] != 'ok'),
+        **extra,
+        'seconds': round(time.time() - started, 2)
+    }
+    if summary_path:
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"📄 Batch summary saved: {summary_path}")
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI: notebooklm-video batch manifest.json [-w N | --pipeline]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='notebooklm-video batch',
+        description='Process a manifest of NotebookLM exports in parallel'
+    )
+    parser.add_argument('manifest', help='JSON list of {audio, visuals, output[, style]}')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='Jobs run at once')
+    parser.add_argument('--summary', default=None,
+                        help='Results summary path (default: <manifest>.results.json)')
+    parser.add_argument('--resolution', default='1920x1080', help='Video resolution')
+    parser.add_argument('--fps', type=int, default=30, help='Frames per second')
+    parser.add_argument('--no-captions', action='store_true', help='Disable captions')
+    parser.add_argument('--renderer', default='moviepy', choices=['moviepy', 'ffmpeg', 'static'],
+                        help='Rendering backend for slide videos; static adds captions as '
+                             'a soft subtitle track (styled only in .mkv) instead of burning them in')
+    parser.add_argument('--outputs', type=parse_output_targets, default=(),
+                        help='Extra renditions rendered in the same pass, e.g. "720p,shorts,audiogram"')
+    parser.add_argument('--whisper-model', default='base',
+                        help='Whisper model size used for captions')
+    parser.add_argument('--transcription-share', type=float, default=DEFAULT_TRANSCRIPTION_SHARE,
+                        help="Share of each worker's cores for Whisper; the encoder gets the rest")
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Overlap stages across jobs instead of one job per worker')
+    parser.add_argument('--stage-workers', default='',
+                        help='Pipeline concurrency, e.g. "captions=2,encode=3" (captions>1 starts a Whisper worker pool)')
+
+    args = parser.parse_args(argv)
+    width, height = map(int, args.resolution.split('x'))
+    config = VideoConfig(
+        output_resolution=(width, height),
+        fps=args.fps,
+        caption_enabled=not args.no_captions,
+        renderer=args.renderer,
+        output_targets=args.outputs,
+        whisper_model=args.whisper_model
+    )
+
+    summary_path = args.summary or str(Path(args.manifest).with_suffix('.results.json'))
+    jobs = load_manifest(args.manifest)
+    if args.pipeline:
+        from pipeline import parse_stage_workers, run_pipeline
+        summary = run_pipeline(
+            jobs, config, parse_stage_workers(args.stage_workers), summary_path=summary_path
+        )
+    else:
+        summary = run_batch(
+            jobs, config, args.workers, summary_path, args.transcription_share
+        )
+    print(f"\n🏁 {summary['succeeded']} succeeded, {summary['failed']} failed "
+          f"in {summary['seconds']:.0f}s")
+    return 0 if summary['failed'] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
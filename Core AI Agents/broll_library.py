@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Indexed local B-roll library
+A directory of clips is scanned once (incrementally afterwards) into a
+SQLite index of duration, resolution and tags taken from file names,
+folder names and container metadata. Topic lookups are B-tree searches on
+the tag table, ranked by TF-IDF over a bounded set of candidates per
+term, so picking footage never walks the directory.
+"""
+
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+from media_info import MediaInfo, probe_media
+from result_cache import DEFAULT_CACHE_DIR
+
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.m4v', '.mkv', '.webm', '.avi'}
+
+# Bump when the schema or tagging rules change; the index is then rebuilt
+INDEX_VERSION = 1
+
+# How much a tag counts depending on where it came from
+TAG_WEIGHTS = {'filename': 1.0, 'metadata': 0.8, 'directory': 0.5}
+
+# Container metadata fields worth tagging from
+METADATA_FIELDS = ('title', 'comment', 'description', 'keywords', 'genre')
+
+# Most distinct terms a single query looks up
+MAX_QUERY_TERMS = 64
+
+# Clips each query term contributes as candidates (its highest-weighted
+# tags first); only candidates are scored, so a common tag cannot make a
+# search aggregate the whole library
+MAX_TERM_CANDIDATES = 256
+
+_STOPWORDS = {
+    'the', 'and', 'for', 'with', 'that', 'this', 'from', 'are', 'was', 'were', 'you',
+    'your', 'our', 'their', 'they', 'but', 'not', 'have', 'has', 'had', 'what', 'when',
+    'where', 'which', 'who', 'how', 'why', 'all', 'any', 'can', 'will', 'just', 'about',
+    'into', 'than', 'then', 'them', 'there', 'these', 'those', 'been', 'being', 'also',
+    'its', 'it', 'is', 'of', 'to', 'in', 'on', 'at', 'by', 'an', 'or', 'so', 'we',
+    'very', 'really', 'like', 'know', 'think', 'yeah', 'right', 'okay', 'mean', 'thing',
+    'stock', 'footage', 'clip', 'video', 'shot', 'final', 'copy', 'edit', 'hd', 'uhd',
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS clips (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    width INTEGER,
+    height INTEGER
+);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    clip_id INTEGER NOT NULL,
+    weight REAL NOT NULL,
+    PRIMARY KEY (tag, clip_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_by_clip ON tags (clip_id);
+CREATE INDEX IF NOT EXISTS tags_by_weight ON tags (tag, weight DESC);
+CREATE TABLE IF NOT EXISTS unreadable (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tag_stats (tag TEXT PRIMARY KEY, df INTEGER, idf REAL) WITHOUT ROWID;
+"""
+
+
+def _normalize(token: str) -> str:
+    """Crude singular form so 'cities'/'city' and 'computers'/'computer' match"""
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase content words of `text`, normalized the same way for tags and queries"""
+    words = re.findall(r"[a-z]+", text.lower())
+    return [_normalize(w) for w in words if len(w) >= 3 and w not in _STOPWORDS]
+
+
+def query_terms(text: str) -> Counter:
+    return Counter(tokenize(text))
+
+
+@dataclass
+class LibraryClip:
+    """A library clip matched by a search"""
+    path: str
+    duration: float
+    width: Optional[int]
+    height: Optional[int]
+    score: float
+
+
+class BrollLibrary:
+    """
+    SQLite index of one footage directory
+    The index lives in the cache dir (keyed by the directory) unless
+    `index_path` is given; `scan` brings it up to date with the directory
+    """
+
+    def __init__(self, root: str, index_path: Optional[str] = None):
+        self.root = Path(root).resolve()
+        if index_path:
+            self.index_path = Path(index_path)
+        else:
+            digest = hashlib.sha256(str(self.root).encode('utf-8')).hexdigest()[:16]
+            self.index_path = DEFAULT_CACHE_DIR / 'broll' / f"{digest}.sqlite3"
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._init_schema()
+
+    def _init_schema(self):
+        with self._lock, self._db:
+            self._db.executescript(_SCHEMA)
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or int(row[0]) != INDEX_VERSION:
+                self._db.execute("DELETE FROM tags")
+                self._db.execute("DELETE FROM clips")
+                self._db.execute("DELETE FROM unreadable")
+                self._db.execute("DELETE FROM tag_stats")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(INDEX_VERSION),)
+                )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM clips").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    # Indexing
+
+    def _walk(self) -> Dict[str, os.stat_result]:
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                if Path(name).suffix.lower() in VIDEO_EXTENSIONS:
+                    path = os.path.join(dirpath, name)
+                    try:
+                        files[path] = os.stat(path)
+                    except OSError:
+                        continue
+        return files
+
+    def _tags_for(self, path: str, info: MediaInfo) -> Dict[str, float]:
+        tags: Dict[str, float] = {}
+
+        def add(text: str, weight: float):
+            for token in tokenize(text):
+                tags[token] = max(tags.get(token, 0.0), weight)
+
+        relative = Path(path).relative_to(self.root)
+        for folder in relative.parts[:-1]:
+            add(folder, TAG_WEIGHTS['directory'])
+        for field in METADATA_FIELDS:
+            if field in info.tags:
+                add(info.tags[field], TAG_WEIGHTS['metadata'])
+        add(relative.stem, TAG_WEIGHTS['filename'])
+        return tags
+
+    @staticmethod
+    def _probe(path: str) -> Optional[MediaInfo]:
+        try:
+            info = probe_media(path)
+        except (OSError, RuntimeError, ValueError):
+            return None
+        return info if info.has_video and info.duration > 0 else None
+
+    def scan(self, workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date: probe new or changed clips (ffprobe runs
+        concurrently) and drop clips that disappeared. Files that fail to
+        probe are remembered by mtime and size and skipped until they change.
+        """
+        files = self._walk()
+        with self._lock:
+            known = {
+                path: (clip_id, mtime_ns, size)
+                for clip_id, path, mtime_ns, size in self._db.execute(
+                    "SELECT id, path, mtime_ns, size FROM clips"
+                )
+            }
+            failed = {
+                path: (mtime_ns, size)
+                for path, mtime_ns, size in self._db.execute(
+                    "SELECT path, mtime_ns, size FROM unreadable"
+                )
+            }
+
+        changed = [
+            path for path, stat in files.items()
+            if known.get(path, (None, None, None))[1:] != (stat.st_mtime_ns, stat.st_size)
+            and failed.get(path) != (stat.st_mtime_ns, stat.st_size)
+        ]
+        removed = [known[path][0] for path in known if path not in files]
+        gone = [path for path in failed if path not in files]
+
+        if changed:
+            print(f"🗂️  Indexing {len(changed)} clips in {self.root}...")
+        with ThreadPoolExecutor(max_workers=workers or min(16, (os.cpu_count() or 1) * 2)) as pool:
+            probes = list(pool.map(self._probe, changed))
+
+        added = updated = unreadable = 0
+        with self._lock, self._db:
+            for clip_id in removed:
+                self._db.execute("DELETE FROM tags WHERE clip_id = ?", (clip_id,))
+                self._db.execute("DELETE FROM clips WHERE id = ?", (clip_id,))
+            self._db.executemany("DELETE FROM unreadable WHERE path = ?", [(p,) for p in gone])
+            for path, info in zip(changed, probes):
+                stat = files[path]
+                self._db.execute("DELETE FROM unreadable WHERE path = ?", (path,))
+                if path in known:
+                    clip_id = known[path][0]
+                    self._db.execute("DELETE FROM tags WHERE clip_id = ?", (clip_id,))
+                    self._db.execute("DELETE FROM clips WHERE id = ?", (clip_id,))
+                if info is None:
+                    # No video stream or no duration: skip until the file changes
+                    self._db.execute(
+                        "INSERT INTO unreadable (path, mtime_ns, size) VALUES (?, ?, ?)",
+                        (path, stat.st_mtime_ns, stat.st_size)
+                    )
+                    unreadable += 1
+                    continue
+                if path in known:
+                    updated += 1
+                else:
+                    added += 1
+                cursor = self._db.execute(
+                    "INSERT INTO clips (path, mtime_ns, size, duration, width, height) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, stat.st_mtime_ns, stat.st_size, info.duration, info.width, info.height)
+                )
+                self._db.executemany(
+                    "INSERT INTO tags (tag, clip_id, weight) VALUES (?, ?, ?)",
+                    [(tag, cursor.lastrowid, weight)
+                     for tag, weight in self._tags_for(path, info).items()]
+                )
+            if changed or removed:
+                self._refresh_stats()
+
+        return {
+            'added': added,
+            'updated': updated,
+            'removed': len(removed),
+            'unreadable': unreadable,
+            'unchanged': len(files) - len(changed)
+        }
+
+    def _refresh_stats(self):
+        """Recompute document frequencies and IDF weights (caller holds the lock)"""
+        total = self._db.execute("SELECT COUNT(*) FROM clips").fetchone()[0]
+        rows = self._db.execute("SELECT tag, COUNT(*) FROM tags GROUP BY tag").fetchall()
+        self._db.execute("DELETE FROM tag_stats")
+        self._db.executemany(
+            "INSERT INTO tag_stats (tag, df, idf) VALUES (?, ?, ?)",
+            [(tag, df, math.log((total + 1) / (df + 0.5))) for tag, df in rows]
+        )
+
+    # Lookup
+
+    def search(
+        self,
+        query: Union[str, Mapping[str, float]],
+        min_duration: float = 0.0,
+        limit: int = 5,
+        exclude: Iterable[str] = ()
+    ) -> List[LibraryClip]:
+        """
+        Clips best matching `query` (text, or term -> weight), at least
+        `min_duration` long and not in `exclude`, best first
+        """
+        terms = query_terms(query) if isinstance(query, str) else Counter(query)
+        terms = dict(terms.most_common(MAX_QUERY_TERMS))
+        if not terms:
+            return []
+        exclude = set(exclude)
+
+        # Candidates: the best-tagged long-enough clips of each term, read
+        # from the (tag, weight) index; then only they are scored
+        per_term = max(MAX_TERM_CANDIDATES, limit + len(exclude))
+        candidates = " UNION ".join(
+            "SELECT * FROM (SELECT t.clip_id FROM tags t JOIN clips c ON c.id = t.clip_id "
+            "WHERE t.tag = ? AND c.duration >= ? ORDER BY t.weight DESC LIMIT ?)"
+            for _ in terms
+        )
+        values = ", ".join("(?, ?)" for _ in terms)
+        params: List = [x for term, weight in terms.items() for x in (term, weight)]
+        for term in terms:
+            params += [term, min_duration, per_term]
+        sql = (
+            f"WITH q(tag, w) AS (VALUES {values}), cand(clip_id) AS ({candidates}) "
+            "SELECT c.path, c.duration, c.width, c.height, SUM(q.w * t.weight * s.idf) AS score "
+            "FROM cand JOIN tags t ON t.clip_id = cand.clip_id "
+            "JOIN q ON q.tag = t.tag "
+            "JOIN tag_stats s ON s.tag = t.tag "
+            "JOIN clips c ON c.id = cand.clip_id "
+            "GROUP BY c.id ORDER BY score DESC, c.duration ASC LIMIT ?"
+        )
+        params.append(limit + len(exclude))
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        clips = [LibraryClip(*row) for row in rows if row[0] not in exclude]
+        return clips[:limit]
+
+    def rank_topics(self, text: str, limit: int = 8) -> List[str]:
+        """Words of `text` that are library tags, ranked by frequency x IDF"""
+        counts = query_terms(text)
+        if not counts:
+            return []
+        terms = list(counts)
+        idf: Dict[str, float] = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(terms), 500):
+                batch = terms[i:i + 500]
+                marks = ", ".join("?" for _ in batch)
+                idf.update(self._db.execute(
+                    f"SELECT tag, idf FROM tag_stats WHERE tag IN ({marks})", batch
+                ).fetchall())
+        ranked = sorted(idf, key=lambda tag: counts[tag] * idf[tag], reverse=True)
+        return ranked[:limit]
+
+
+def main():
+    """Build or query a B-roll library index"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local B-roll library index')
+    parser.add_argument('command', choices=['scan', 'search'])
+    parser.add_argument('library', help='Footage directory')
+    parser.add_argument('query', nargs='?', default='', help='Search text')
+    parser.add_argument('--index', default=None, help='Index file (default: in the cache dir)')
+    parser.add_argument('--min-duration', type=float, default=0.0)
+    parser.add_argument('--limit', type=int, default=10)
+
+    args = parser.parse_args()
+    library = BrollLibrary(args.library, args.index)
+
+    if args.command == 'scan':
+        stats = library.scan()
+        print(f"📚 {len(library)} clips indexed ({stats['added']} added, "
+              f"{stats['updated']} updated, {stats['removed']} removed, "
+              f"{stats['unreadable']} unreadable)")
+    else:
+        for clip in library.search(args.query, args.min_duration, args.limit):
+            print(f"{clip.score:7.2f}  {clip.duration:6.1f}s  {clip.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+B-roll scheduling over the whole audio
+Captions are grouped into windows that tile [0, duration] with cuts on
+caption boundaries; each window gets a topic and a source clip, and repeat
+uses of a source continue where the previous window left off so one
+decoded clip serves many windows without replaying the same frames
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+# Preferred window length and the longest a window may grow to
+TARGET_WINDOW_SECONDS = 5.0
+MAX_WINDOW_SECONDS = 8.0
+
+
+@dataclass
+class BrollWindow:
+    """A span of the audio covered by one piece of footage"""
+    start: float
+    end: float
+    text: str = ""
+    topic: Optional[str] = None
+    source: Optional[str] = None  # clip path
+    offset: float = 0.0  # where in `source` this window starts
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def plan_windows(
+    captions: Sequence[Dict],
+    duration: float,
+    target: float = TARGET_WINDOW_SECONDS,
+    max_length: float = MAX_WINDOW_SECONDS
+) -> List[BrollWindow]:
+    """
+    Windows covering [0, duration] without gaps: a window closes at the
+    first caption end past `target`, and long stretches (silence, long
+    captions) are split at `max_length`
+    """
+    cuts = sorted({round(c['end'], 3) for c in captions if 0 < c['end'] < duration})
+    edges = [0.0]
+    for cut in cuts + [duration]:
+        while cut - edges[-1] > max_length:
+            edges.append(round(edges[-1] + target, 3))
+        if cut - edges[-1] >= target or cut == duration:
+            edges.append(cut)
+    # A sliver at the end joins the previous window, or the two share the
+    # span evenly when together they would exceed max_length
+    if len(edges) > 2 and edges[-1] - edges[-2] < target / 2:
+        if edges[-1] - edges[-3] <= max_length:
+            del edges[-2]
+        else:
+            edges[-2] = round((edges[-3] + edges[-1]) / 2, 3)
+
+    windows = [BrollWindow(start, end) for start, end in zip(edges, edges[1:]) if end > start]
+    i = 0
+    ordered = sorted(captions, key=lambda c: c['start'])
+    for window in windows:
+        # Captions are sorted, so each window scans only its neighbourhood
+        while i < len(ordered) and ordered[i]['end'] <= window.start:
+            i += 1
+        j = i
+        words = []
+        while j < len(ordered) and ordered[j]['start'] < window.end:
+            words.append(ordered[j]['text'])
+            j += 1
+        window.text = " ".join(words)
+    return windows
+
+
+def assign_topics(windows: List[BrollWindow], topics: Sequence[str]):
+    """A topic mentioned in the window's captions, else the topics in rotation"""
+    if not topics:
+        return
+    rotation = 0
+    for window in windows:
+        text = window.text.lower()
+        mentioned = [t for t in topics if t.lower() in text]
+        if mentioned:
+            window.topic = mentioned[0]
+        else:
+            window.topic = topics[rotation % len(topics)]
+            rotation += 1
+
+
+def assign_offsets(windows: List[BrollWindow], source_durations: Dict[str, float]):
+    """
+    Continue each source where its previous window stopped, wrapping to
+    the start when the rest of the clip is too short
+    """
+    cursors: Dict[str, float] = {}
+    for window in windows:
+        if window.source is None:
+            continue
+        length = source_durations[window.source]
+        offset = cursors.get(window.source, 0.0)
+        if offset + window.duration > length:
+            offset = 0.0
+        window.offset = offset
+        cursors[window.source] = offset + window.duration
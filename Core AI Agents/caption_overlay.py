@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Time-indexed caption overlay for MoviePy renders
+Finds the active caption with a binary search over start times and blits
+one cached bitmap per frame, so per-frame cost does not depend on how
+many captions there are
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from subtitles import CaptionStyle, burn_in_params
+
+# Rasterized captions kept at once; renders move forward in time, so a
+# small window means each caption is drawn exactly once
+BITMAP_CACHE_SIZE = 16
+
+_FONT_CANDIDATES = {
+    True: ["Arial Bold.ttf", "arialbd.ttf", "Arial-Bold.ttf", "DejaVuSans-Bold.ttf"],
+    False: ["Arial.ttf", "arial.ttf", "DejaVuSans.ttf"],
+}
+
+
+def _load_font(style: CaptionStyle):
+    for name in [style.font] + _FONT_CANDIDATES[style.bold]:
+        try:
+            return ImageFont.truetype(name, style.fontsize)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=style.fontsize)
+    except TypeError:  # Pillow < 10.1 has a single fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def _wrap(draw, text: str, font, max_width: float) -> List[str]:
+    """Greedy word wrap to `max_width` pixels"""
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}".strip()
+            if line and draw.textlength(candidate, font=font) > max_width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+class CaptionOverlay:
+    """
+    Sorted interval index over captions plus a bounded bitmap cache
+    Overlapping captions resolve to the one that started last
+    """
+
+    def __init__(self, captions: List[Dict], frame_size: Tuple[int, int], style: CaptionStyle):
+        if not (NUMPY_AVAILABLE and PIL_AVAILABLE):
+            raise RuntimeError("NumPy and Pillow required for caption overlays")
+        ordered = sorted(
+            (c for c in captions if c['end'] > c['start']),
+            key=lambda c: c['start']
+        )
+        self.starts = [c['start'] for c in ordered]
+        self.ends = [c['end'] for c in ordered]
+        self.texts = [c['text'].upper() if style.uppercase else c['text'] for c in ordered]
+        self.frame_size = frame_size
+        self.style = style
+        self._font = _load_font(style)
+        self._bitmaps: "OrderedDict[int, Tuple]" = OrderedDict()
+
+    def active_index(self, t: float) -> Optional[int]:
+        """Index of the caption showing at time `t`, if any (O(log n))"""
+        i = bisect_right(self.starts, t) - 1
+        if i >= 0 and t < self.ends[i]:
+            return i
+        return None
+
+    def _bitmap(self, index: int) -> Tuple:
+        """(rgb, alpha, x, y) for one caption, rasterized on first use"""
+        cached = self._bitmaps.get(index)
+        if cached is not None:
+            self._bitmaps.move_to_end(index)
+            return cached
+
+        cached = self._rasterize(self.texts[index])
+        self._bitmaps[index] = cached
+        if len(self._bitmaps) > BITMAP_CACHE_SIZE:
+            self._bitmaps.popitem(last=False)
+        return cached
+
+    def _rasterize(self, text: str) -> Tuple:
+        style = self.style
+        width, height = self.frame_size
+        stroke = int(round(style.outline))
+        probe = ImageDraw.Draw(Image.new('L', (1, 1)))
+        max_width = width * style.width_ratio - 2 * stroke
+        wrapped = "\n".join(_wrap(probe, text, self._font, max_width))
+
+        left, top, right, bottom = probe.multiline_textbbox(
+            (0, 0), wrapped, font=self._font, stroke_width=stroke, align='center'
+        )
+        pad = style.box_padding if style.box_opacity > 0 else 0
+        box_w, box_h = right - left + 2 * pad, bottom - top + 2 * pad
+
+        image = Image.new('RGBA', (box_w, box_h), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        if style.box_opacity > 0:
+            draw.rectangle([0, 0, box_w, box_h], fill=(0, 0, 0, int(255 * style.box_opacity)))
+        draw.multiline_text(
+            (pad - left, pad - top), wrapped, font=self._font,
+            fill=style.color + (255,), stroke_width=stroke,
+            stroke_fill=style.outline_color + (255,), align='center'
+        )
+
+        pixels = np.asarray(image, dtype=np.float32)
+        rgb, alpha = pixels[..., :3], pixels[..., 3:] / 255.0
+        x = (width - box_w) // 2
+        y = style.margin_v if style.top_anchored else height - style.margin_v - box_h
+        return rgb, alpha, x, y
+
+    def blit(self, frame: "np.ndarray", t: float) -> "np.ndarray":
+        """Composite the active caption (if any) onto one frame"""
+        index = self.active_index(t)
+        if index is None:
+            return frame
+        rgb, alpha, x, y = self._bitmap(index)
+
+        frame_h, frame_w = frame.shape[:2]
+        h, w = rgb.shape[:2]
+        # Clip the bitmap to the frame
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, frame_w), min(y + h, frame_h)
+        if x0 >= x1 or y0 >= y1:
+            return frame
+        src = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+
+        out = frame.copy()
+        region = out[y0:y1, x0:x1, :3].astype(np.float32)
+        a = alpha[src]
+        out[y0:y1, x0:x1, :3] = (region + (rgb[src] - region) * a).astype(frame.dtype)
+        return out
+
+    def apply(self, clip):
+        """MoviePy clip with the captions drawn on every frame"""
+        return clip.fl(lambda get_frame, t: self.blit(get_frame(t), t))
+
+
+def apply_captions(
+    clip,
+    captions: Optional[List[Dict]],
+    style: CaptionStyle,
+    renderer: str,
+    ass_path: Path
+) -> Tuple[object, List[str]]:
+    """
+    Attach captions to a MoviePy clip before write_videofile
+    Returns (clip, extra ffmpeg_params): 'ass' burns a subtitle track in
+    during the encode, 'overlay' draws through a CaptionOverlay
+    """
+    if not captions:
+        return clip, []
+    if renderer == "overlay":
+        return CaptionOverlay(captions, (clip.w, clip.h), style).apply(clip), []
+    return clip, burn_in_params(captions, ass_path, (clip.w, clip.h), style)
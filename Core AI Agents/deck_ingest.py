@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Slide deck ingestion: .pptx/.ppt/.odp/.pdf straight to page images
+Pages are rasterized by a pool of pdftoppm processes and handed out in
+order as they finish; results are cached by the deck's content hash
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from result_cache import DEFAULT_CACHE_DIR, content_hash
+
+DECK_EXTENSIONS = {'.pdf', '.pptx', '.ppt', '.odp'}
+
+_MANIFEST = "pages.json"
+
+
+def is_deck(path: str) -> bool:
+    """True for a presentation or PDF file (as opposed to a directory of images)"""
+    path = Path(path)
+    return path.is_file() and path.suffix.lower() in DECK_EXTENSIONS
+
+
+def _office_binary() -> Optional[str]:
+    return shutil.which('soffice') or shutil.which('libreoffice')
+
+
+def convert_to_pdf(deck: Path, out_dir: Path) -> Path:
+    """Export a presentation to PDF with headless LibreOffice"""
+    binary = _office_binary()
+    if binary is None:
+        raise RuntimeError("LibreOffice (soffice) required to read presentation files")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # A private profile lets several conversions run at once
+    with tempfile.TemporaryDirectory(prefix="lo-profile-") as profile:
+        cmd = [
+            binary, f"-env:UserInstallation={Path(profile).as_uri()}",
+            '--headless', '--convert-to', 'pdf', '--outdir', str(out_dir), str(deck)
+        ]
+        subprocess.run(cmd, check=True, capture_output=True)
+    pdf = out_dir / f"{deck.stem}.pdf"
+    if not pdf.exists():
+        raise RuntimeError(f"LibreOffice did not produce {pdf.name}")
+    return pdf
+
+
+def pdf_page_count(pdf: Path) -> int:
+    result = subprocess.run(['pdfinfo', str(pdf)], capture_output=True, text=True, check=True)
+    for line in result.stdout.splitlines():
+        if line.startswith('Pages:'):
+            return int(line.split(':', 1)[1])
+    raise RuntimeError(f"Could not read page count of {pdf}")
+
+
+def rasterize_page(pdf: Path, page: int, out_dir: Path, longest_side: int) -> Path:
+    """Render one PDF page to PNG, its longest side scaled to `longest_side`"""
+    prefix = out_dir / f"page_{page:04d}"
+    cmd = [
+        'pdftoppm', '-png', '-singlefile',
+        '-f', str(page), '-l', str(page),
+        '-scale-to', str(longest_side),
+        str(pdf), str(prefix)
+    ]
+    subprocess.run(cmd, check=True, capture_output=True)
+    return prefix.with_suffix('.png')
+
+
+class DeckPages:
+    """
+    Page images of one deck, possibly still being rasterized
+    Iterating yields pages in order as soon as each one is ready
+    """
+
+    def __init__(self, out_dir: Path, futures: List[Future]):
+        self.out_dir = out_dir
+        self._futures = futures
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+    def __iter__(self) -> Iterator[Path]:
+        for future in self._futures:
+            yield future.result()
+        self._write_manifest()
+
+    def wait(self) -> List[Path]:
+        return list(self)
+
+    def _write_manifest(self):
+        manifest = self.out_dir / _MANIFEST
+        if not manifest.exists():
+            pages = [future.result().name for future in self._futures]
+            manifest.write_text(json.dumps(pages), encoding='utf-8')
+
+
+class DeckRasterizer:
+    """Starts (or reuses) rasterization of decks into a cache directory"""
+
+    def __init__(self, root: Optional[str] = None, workers: Optional[int] = None):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR / 'decks'
+        self.workers = workers or (os.cpu_count() or 1)
+
+    def open(self, deck: str, size: Tuple[int, int]) -> DeckPages:
+        """Begin rasterizing `deck` for output `size`; returns immediately after PDF export"""
+        deck = Path(deck).resolve()
+        # Pages depend only on the longest side (pdftoppm -scale-to), so
+        # e.g. 1920x1080 and 1080x1920 outputs share one rasterization
+        longest_side = max(size)
+        out_dir = self.root / f"{content_hash(str(deck))[:24]}_{longest_side}"
+
+        manifest = out_dir / _MANIFEST
+        if manifest.exists():
+            futures = []
+            for name in json.loads(manifest.read_text(encoding='utf-8')):
+                future = Future()
+                future.set_result(out_dir / name)
+                futures.append(future)
+            print(f"⚡ Using cached pages for {deck.name}")
+            return DeckPages(out_dir, futures)
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if deck.suffix.lower() == '.pdf':
+            pdf = deck
+        else:
+            print(f"📑 Converting {deck.name} to PDF...")
+            pdf = convert_to_pdf(deck, out_dir)
+
+        page_count = pdf_page_count(pdf)
+        print(f"🖨️  Rasterizing {page_count} pages on {self.workers} workers...")
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        futures = [
+            executor.submit(rasterize_page, pdf, page, out_dir, longest_side)
+            for page in range(1, page_count + 1)
+        ]
+        # Workers keep running; the pool closes once the last page is done
+        executor.shutdown(wait=False)
+        return DeckPages(out_dir, futures)
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Native FFmpeg rendering of slide videos
+Scaling, transitions, captions and audio are done by FFmpeg, either in one
+filter_complex pass or as stream-copied static pieces, instead of
+compositing every frame in Python
+"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from media_info import COPYABLE_AUDIO, probe_media
+
+# Length of the reusable still clip each static slide is built from
+STILL_CLIP_SECONDS = 2.0
+
+# Soft subtitle codec each container takes; ASS keeps the caption styling
+SUBTITLE_CODECS = {
+    '.mp4': 'mov_text',
+    '.m4v': 'mov_text',
+    '.mov': 'mov_text',
+    '.mkv': 'ass',
+    '.webm': 'webvtt',
+}
+
+# Encoder settings for audio that cannot be stream-copied, by codec name
+AUDIO_ENCODERS = {
+    'aac': ['-c:a', 'aac', '-b:a', '192k'],
+    'opus': ['-c:a', 'libopus', '-b:a', '128k'],
+}
+
+
+def probe_audio_codec(audio_path: str) -> Optional[str]:
+    """Codec name of the first audio stream, or None when it cannot be probed"""
+    try:
+        return probe_media(audio_path).audio_codec
+    except (OSError, RuntimeError):
+        return None
+
+
+def can_copy_audio(audio_path: str, output_path: str) -> bool:
+    """True when the source audio can be stream-copied into the output container"""
+    try:
+        return probe_media(audio_path).can_copy_audio_to(output_path)
+    except (OSError, RuntimeError):
+        return False
+
+
+def audio_codec_for(output_path: str) -> Optional[str]:
+    """Codec to encode audio to once so it can be stream-copied into `output_path`"""
+    allowed = COPYABLE_AUDIO.get(Path(output_path).suffix.lower(), set())
+    return next((codec for codec in AUDIO_ENCODERS if codec in allowed), None)
+
+
+def audio_args(output_path: str, copy_audio: bool) -> List[str]:
+    """FFmpeg audio output arguments: stream copy, else an encoder `output_path` accepts"""
+    if copy_audio:
+        return ['-c:a', 'copy']
+    return AUDIO_ENCODERS[audio_codec_for(output_path) or 'aac']
+
+
+def encode_audio(audio_path: str, out_path: Path, codec: str = 'aac') -> Path:
+    """Encode the first audio stream once; an existing `out_path` is reused"""
+    out_path = Path(out_path)
+    if out_path.exists():
+        return out_path
+    tmp_path = out_path.with_name(f"{out_path.stem}.part{out_path.suffix}")
+    cmd = [
+        'ffmpeg', '-y', '-v', 'error', '-i', str(audio_path),
+        '-map', '0:a:0', *AUDIO_ENCODERS[codec], str(tmp_path)
+    ]
+    subprocess.run(cmd, check=True)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def cut_audio(audio_path: str, start: float, end: float, out_path: Path) -> Path:
+    """
+    Stream-copy [start, end] of the first audio stream into `out_path`
+    Nothing is decoded; every audio packet is a keyframe, so the cut lands
+    within one packet (~20 ms) of `start`. `out_path` needs a container
+    that can hold the source codec, e.g. the source's own suffix.
+    """
+    out_path = Path(out_path)
+    tmp_path = out_path.with_name(f"{out_path.stem}.part{out_path.suffix}")
+    cmd = [
+        'ffmpeg', '-y', '-v', 'error',
+        '-ss', f"{start:.3f}", '-i', str(audio_path), '-t', f"{end - start:.3f}",
+        '-map', '0:a:0', '-c:a', 'copy', str(tmp_path)
+    ]
+    subprocess.run(cmd, check=True)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+def mux_audio(
+    video_path: str,
+    audio_path: str,
+    output_path: str,
+    copy_audio: bool,
+    duration: Optional[float] = None
+) -> str:
+    """Combine a video-only file with an audio track; video is always stream-copied"""
+    cmd = [
+        'ffmpeg', '-y', '-v', 'error',
+        '-i', str(video_path), '-i', str(audio_path),
+        '-map', '0:v:0', '-map', '1:a:0',
+        '-c:v', 'copy', *audio_args(output_path, copy_audio)
+    ]
+    if duration is not None:
+        cmd += ['-t', f"{duration:.6f}"]
+    cmd += ['-movflags', '+faststart', str(output_path)]
+    subprocess.run(cmd, check=True)
+    return output_path
+
+
+def fit_filter(resolution: Tuple[int, int]) -> str:
+    """Aspect-preserving scale into `resolution`, letterboxed with black bars"""
+    width, height = resolution
+    return (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+    )
+
+
+def _transition_length(durations: Sequence[float], transition: float) -> float:
+    """
+    Length of each crossfade; MoviePy fades out and in over `transition`
+    each, so the matching fade-through-black lasts twice that, capped so
+    no slide is shorter than its transitions
+    """
+    if len(durations) < 2 or transition <= 0:
+        return 0.0
+    return max(0.0, min(2 * transition, 0.5 * min(durations)))
+
+
+def build_slide_filtergraph(
+    durations: Sequence[float],
+    resolution: Tuple[int, int],
+    fps: int,
+    transition: float,
+    subtitles_file: Optional[str] = None
+) -> Tuple[str, List[float]]:
+    """
+    filter_complex for slide inputs 0..n-1, labelled output [vout]
+    Returns (graph, per-input lengths); every input but the last is
+    extended by the crossfade so the total stays sum(durations)
+    """
+    fade = _transition_length(durations, transition)
+    lengths = [d + fade for d in durations[:-1]] + [durations[-1]]
+
+    chains = [
+        f"[{i}:v]{fit_filter(resolution)},fps={fps},format=yuv420p[s{i}]"
+        for i in range(len(durations))
+    ]
+
+    label = "s0"
+    offset = 0.0
+    for i in range(1, len(durations)):
+        offset += durations[i - 1]
+        if fade > 0:
+            chains.append(
+                f"[{label}][s{i}]xfade=transition=fadeblack:"
+                f"duration={fade:.3f}:offset={offset:.3f}[x{i}]"
+            )
+        else:
+            chains.append(f"[{label}][s{i}]concat=n=2:v=1:a=0[x{i}]")
+        label = f"x{i}"
+
+    if subtitles_file:
+        chains.append(f"[{label}]subtitles={subtitles_file}[vout]")
+    else:
+        chains.append(f"[{label}]null[vout]")
+    return ";\n".join(chains), lengths
+
+
+def render_slides(
+    slides: Sequence[Path],
+    durations: Sequence[float],
+    audio_path: str,
+    output_path: str,
+    work_dir: Path,
+    resolution: Tuple[int, int] = (1920, 1080),
+    fps: int = 30,
+    transition: float = 0.5,
+    subtitles_file: Optional[Path] = None,
+    copy_audio: Optional[bool] = None,
+    preset: str = 'medium',
+    crf: int = 23,
+    threads: Optional[int] = None
+) -> str:
+    """
+    Render slides + audio (+ burned-in ASS captions) with a single FFmpeg run
+    FFmpeg runs inside `work_dir` so the subtitles filter can name its file
+    without filtergraph escaping
+    """
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    output_path = str(Path(output_path).resolve())
+    audio_path = str(Path(audio_path).resolve())
+    total = float(sum(durations))
+
+    subtitles_name = None
+    if subtitles_file is not None:
+        subtitles_file = Path(subtitles_file).resolve()
+        if subtitles_file.parent != work_dir.resolve():
+            raise ValueError("subtitles_file must live in work_dir")
+        subtitles_name = subtitles_file.name
+
+    graph, lengths = build_slide_filtergraph(
+        durations, resolution, fps, transition, subtitles_name
+    )
+    graph_file = work_dir / "slides.filtergraph"
+    graph_file.write_text(graph, encoding='utf-8')
+
+    cmd = ['ffmpeg', '-y', '-v', 'error', '-stats']
+    for slide, length in zip(slides, lengths):
+        cmd += ['-loop', '1', '-framerate', str(fps), '-t', f"{length:.3f}",
+                '-i', str(Path(slide).resolve())]
+    cmd += ['-i', audio_path]
+
+    if copy_audio is None:
+        copy_audio = can_copy_audio(audio_path, output_path)
+
+    if threads:
+        cmd += ['-threads', str(threads)]
+    cmd += [
+        '-filter_complex_script', graph_file.name,
+        '-map', '[vout]', '-map', f"{len(slides)}:a:0",
+        '-c:v', 'libx264', '-preset', preset, '-crf', str(crf),
+        '-pix_fmt', 'yuv420p', '-r', str(fps),
+        *audio_args(output_path, copy_audio),
+        '-t', f"{total:.3f}",
+        '-movflags', '+faststart',
+        output_path
+    ]
+
+    print(f"🚀 Running FFmpeg filter graph ({len(slides)} slides)...")
+    subprocess.run(cmd, check=True, cwd=work_dir)
+    return output_path
+
+
+def _x264_args(fps: int, preset: str, crf: int, gop: int, threads: Optional[int]) -> List[str]:
+    """
+    Encoder settings shared by every static-path piece, so the pieces can
+    be stream-copied together; closed GOPs without B-frames let any piece
+    be cut after any frame
+    """
+    args = [
+        '-c:v', 'libx264', '-preset', preset, '-crf', str(crf),
+        '-pix_fmt', 'yuv420p', '-r', str(fps),
+        '-g', str(gop), '-keyint_min', str(gop), '-sc_threshold', '0',
+        '-bf', '0', '-flags', '+cgop', '-an'
+    ]
+    if threads:
+        args += ['-threads', str(threads)]
+    return args
+
+
+def _encode_still(slide: Path, output: Path, frames: int, resolution, fps, x264) -> Path:
+    cmd = [
+        'ffmpeg', '-y', '-v', 'error',
+        '-loop', '1', '-framerate', str(fps), '-i', str(slide),
+        '-vf', f"{fit_filter(resolution)},format=yuv420p",
+        '-frames:v', str(frames), *x264, str(output)
+    ]
+    subprocess.run(cmd, check=True)
+    return output
+
+
+def _encode_transition(
+    before: Path, after: Path, output: Path, frames: int, resolution, fps, x264
+) -> Path:
+    seconds = frames / float(fps)
+    graph = (
+        f"[0:v]{fit_filter(resolution)},fps={fps},format=yuv420p[a];"
+        f"[1:v]{fit_filter(resolution)},fps={fps},format=yuv420p[b];"
+        f"[a][b]xfade=transition=fadeblack:duration={seconds:.6f}:offset=0[v]"
+    )
+    cmd = [
+        'ffmpeg', '-y', '-v', 'error',
+        '-loop', '1', '-framerate', str(fps), '-t', f"{seconds:.6f}", '-i', str(before),
+        '-loop', '1', '-framerate', str(fps), '-t', f"{seconds:.6f}", '-i', str(after),
+        '-filter_complex', graph, '-map', '[v]',
+        '-frames:v', str(frames), *x264, str(output)
+    ]
+    subprocess.run(cmd, check=True)
+    return output
+
+
+def _concat_entries(piece: Path, frames: int, piece_frames: int, fps: int) -> List[str]:
+    """Concat-list lines repeating `piece` to cover exactly `frames` frames"""
+    full, rest = divmod(frames, piece_frames)
+    lines = [f"file '{piece.name}'"] * full
+    if rest:
+        lines += [f"file '{piece.name}'", f"outpoint {rest / float(fps):.6f}"]
+    return lines
+
+
+def render_static_slides(
+    slides: Sequence[Path],
+    durations: Sequence[float],
+    audio_path: str,
+    output_path: str,
+    work_dir: Path,
+    resolution: Tuple[int, int] = (1920, 1080),
+    fps: int = 30,
+    transition: float = 0.5,
+    subtitles_file: Optional[Path] = None,
+    copy_audio: Optional[bool] = None,
+    preset: str = 'medium',
+    crf: int = 23,
+    threads: Optional[int] = None
+) -> str:
+    """
+    Slide video whose encode cost scales with the number of slides, not the runtime
+    Each slide is encoded once as a short still clip that the concat list
+    repeats; only the fade-through-black windows around slide changes are
+    rendered frame by frame. Everything is stream-copied into the output.
+    Burned-in captions would change every frame, so `subtitles_file` is
+    muxed as a soft subtitle track instead (see SUBTITLE_CODECS; only .mkv
+    keeps the ASS styling, and containers without a codec get no track).
+    """
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    output_path = str(Path(output_path).resolve())
+    audio_path = str(Path(audio_path).resolve())
+    slides = [Path(slide).resolve() for slide in slides]
+
+    # Work in whole frames so repeated pieces never drift from the audio
+    bounds = [0]
+    for duration in durations:
+        bounds.append(bounds[-1] + int(round(duration * fps)))
+    frames = [b - a for a, b in zip(bounds[:-1], bounds[1:])]
+    half = 0
+    if len(slides) > 1 and transition > 0:
+        half = max(0, min(int(round(transition * fps)), min(frames) // 4))
+
+    still_frames = max(1, int(STILL_CLIP_SECONDS * fps))
+    x264 = _x264_args(fps, preset, crf, still_frames, threads)
+
+    print(f"🧊 Encoding {len(slides)} still slides and {len(slides) - 1} transitions...")
+    entries: List[str] = []
+    for i, slide in enumerate(slides):
+        body = frames[i] - (half if i > 0 else 0) - (half if i < len(slides) - 1 else 0)
+        if body > 0:
+            still = _encode_still(
+                slide, work_dir / f"still_{i:04d}.ts",
+                min(body, still_frames), resolution, fps, x264
+            )
+            entries += _concat_entries(still, body, min(body, still_frames), fps)
+        if i < len(slides) - 1 and half:
+            fade = _encode_transition(
+                slide, slides[i + 1], work_dir / f"fade_{i:04d}.ts",
+                2 * half, resolution, fps, x264
+            )
+            entries.append(f"file '{fade.name}'")
+
+    concat_file = work_dir / "static_concat.txt"
+    concat_file.write_text("\n".join(entries) + "\n", encoding='utf-8')
+
+    if copy_audio is None:
+        copy_audio = can_copy_audio(audio_path, output_path)
+
+    cmd = [
+        'ffmpeg', '-y', '-v', 'error',
+        '-f', 'concat', '-safe', '0', '-i', concat_file.name,
+        '-i', audio_path
+    ]
+    maps = ['-map', '0:v:0', '-map', '1:a:0']
+    subtitle_codec = SUBTITLE_CODECS.get(Path(output_path).suffix.lower())
+    if subtitles_file is not None and subtitle_codec is None:
+        print(f"⚠️  {Path(output_path).suffix} cannot hold a subtitle track; captions skipped")
+    elif subtitles_file is not None:
+        cmd += ['-i', str(Path(subtitles_file).resolve())]
+        maps += ['-map', '2:s:0', '-c:s', subtitle_codec]
+    cmd += [
+        *maps, '-c:v', 'copy', *audio_args(output_path, copy_audio),
+        '-t', f"{bounds[-1] / float(fps):.6f}",
+        '-movflags', '+faststart',
+        output_path
+    ]
+    subprocess.run(cmd, check=True, cwd=work_dir)
+    return output_path
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of prepared B-roll clips
+Clips are keyed by (topic, duration bucket, resolution, fps) and rendered
+once at the bucket's length; shorter requests trim the cached clip instead
+of encoding a new one. Least recently used clips are evicted past a size
+limit, except those a job has pinned until it releases them.
+"""
+
+import math
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from result_cache import DEFAULT_CACHE_DIR
+
+DEFAULT_FOOTAGE_MAX_BYTES = 1024 * 1024 * 1024
+
+# Requested durations are rounded up to a multiple of this
+DURATION_BUCKET_SECONDS = 5.0
+
+# Renders one clip: (topic, duration, resolution, fps, output path)
+ClipRenderer = Callable[[str, float, Tuple[int, int], int, Path], None]
+
+
+def duration_bucket(duration: float) -> float:
+    """Clip length that serves `duration` (the next multiple of the bucket size)"""
+    return max(1, math.ceil(duration / DURATION_BUCKET_SECONDS)) * DURATION_BUCKET_SECONDS
+
+
+def _slug(topic: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', topic.lower()).strip('-') or 'topic'
+
+
+class FootageCache:
+    """
+    Directory of rendered clips named after their key
+    Concurrent requests for the same key render it only once. Pins are
+    counted per path and only protect clips from eviction in this process.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = DEFAULT_FOOTAGE_MAX_BYTES):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR / 'footage'
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._pins: Dict[Path, int] = {}
+
+    def path_for(self, topic: str, duration: float, resolution: Tuple[int, int], fps: int) -> Path:
+        bucket = duration_bucket(duration)
+        return self.root / (
+            f"{_slug(topic)}_{bucket:g}s_{resolution[0]}x{resolution[1]}_{fps}fps.mp4"
+        )
+
+    def get(
+        self,
+        topic: str,
+        duration: float,
+        resolution: Tuple[int, int],
+        fps: int,
+        render: ClipRenderer,
+        pin: bool = False
+    ) -> Path:
+        """
+        Cached clip at least `duration` long for this key, rendered with
+        `render` on a miss; callers trim it to `duration`. With `pin` the
+        clip is not evicted until release() is called for it.
+        """
+        path = self.path_for(topic, duration, resolution, fps)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(path.name, threading.Lock())
+
+        with key_lock:
+            if pin:
+                self._pin(path)
+            if path.exists():
+                # Touch the clip so eviction treats it as recently used
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.part.mp4")
+            render(topic, duration_bucket(duration), resolution, fps, tmp_path)
+            # Atomic rename so other processes never pick up a partial clip
+            os.replace(tmp_path, path)
+
+        self.evict(keep=path)
+        return path
+
+    def prefetch(
+        self,
+        requests: Iterable[Tuple[str, float]],
+        resolution: Tuple[int, int],
+        fps: int,
+        render: ClipRenderer,
+        workers: Optional[int] = None,
+        pin: bool = False
+    ) -> List[Path]:
+        """
+        Ensure every (topic, duration) clip exists, rendering misses
+        concurrently; with `pin` each clip stays until it is released, so
+        a later miss in the same prefetch cannot evict an earlier hit
+        """
+        requests = list(requests)
+        if not requests:
+            return []
+        workers = workers or min(len(requests), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                lambda request: self.get(request[0], request[1], resolution, fps, render, pin),
+                requests
+            ))
+
+    def _pin(self, path: Path):
+        with self._lock:
+            self._pins[path] = self._pins.get(path, 0) + 1
+
+    def release(self, paths: Iterable[Path]):
+        """Drop one pin from each of `paths` (as returned by a pinned get/prefetch)"""
+        with self._lock:
+            for path in paths:
+                path = Path(path)
+                count = self._pins.get(path, 0) - 1
+                if count > 0:
+                    self._pins[path] = count
+                else:
+                    self._pins.pop(path, None)
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        if not self.root.exists():
+            return entries
+        for path in self.root.glob('*.mp4'):
+            if path.name.endswith('.part.mp4'):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, max_bytes: Optional[int] = None, keep: Optional[Path] = None):
+        """Delete least recently used clips until the cache fits `max_bytes`"""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= limit:
+                    break
+                if path == keep or path in self._pins:
+                    continue
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    continue
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Highlight extraction for Shorts
+Every caption-aligned span of 15-60 s is scored at once from prefix sums of
+a per-frame score (loudness relative to the episode plus speech density
+from the captions); the best non-overlapping spans become the clips
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Length limits of a Short
+MIN_HIGHLIGHT_SECONDS = 15.0
+MAX_HIGHLIGHT_SECONDS = 60.0
+
+# How much each signal contributes to a frame's score
+ENERGY_WEIGHT = 0.5
+SPEECH_WEIGHT = 0.5
+
+# Both signals are relative to their episode mean and capped at this, so a
+# single bang or a burst of crosstalk cannot carry a whole window
+SCORE_CAP = 3.0
+
+# Spacing of candidate starts when there are no captions to align to
+GRID_STEP_SECONDS = 1.0
+
+
+@dataclass
+class Highlight:
+    """A span of the episode worth a Short"""
+    start: float
+    end: float
+    score: float
+    text: str = ""
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def _relative(values: "np.ndarray") -> "np.ndarray":
+    mean = float(values.mean()) if len(values) else 0.0
+    if mean <= 0:
+        return np.zeros_like(values)
+    return np.minimum(values / mean, SCORE_CAP)
+
+
+def frame_scores(
+    energy: "np.ndarray",
+    frame_seconds: float,
+    captions: Sequence[Dict]
+) -> "np.ndarray":
+    """
+    Per-frame score: relative RMS loudness plus relative speech density
+    (each caption's words spread evenly over its frames)
+    """
+    n_frames = len(energy)
+    scores = ENERGY_WEIGHT * _relative(np.asarray(energy, dtype=np.float64))
+    if not captions or not n_frames:
+        return scores
+
+    starts = np.array([c['start'] for c in captions]) / frame_seconds
+    ends = np.array([c['end'] for c in captions]) / frame_seconds
+    words = np.array([len(c['text'].split()) for c in captions], dtype=np.float64)
+    first = np.clip(starts.astype(int), 0, n_frames)
+    last = np.clip(np.ceil(ends).astype(int), 0, n_frames)
+    rate = words / np.maximum(last - first, 1)
+
+    # Difference array: +rate where a caption starts, -rate where it ends
+    delta = np.zeros(n_frames + 1)
+    np.add.at(delta, first, rate)
+    np.add.at(delta, last, -rate)
+    speech = np.cumsum(delta)[:n_frames]
+    return scores + SPEECH_WEIGHT * _relative(speech)
+
+
+def candidate_spans(
+    captions: Sequence[Dict],
+    duration: float,
+    min_seconds: float = MIN_HIGHLIGHT_SECONDS,
+    max_seconds: float = MAX_HIGHLIGHT_SECONDS
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    (starts, ends) of every span between a caption start and a later caption
+    end that is `min_seconds`..`max_seconds` long, so no Short cuts into a
+    sentence; a regular grid when there are no captions
+    """
+    if duration <= min_seconds:
+        return np.array([0.0]), np.array([float(duration)])
+
+    if captions:
+        starts = np.unique([c['start'] for c in captions])
+        ends = np.unique([c['end'] for c in captions])
+        lo = np.searchsorted(ends, starts + min_seconds, side='left')
+        hi = np.searchsorted(ends, starts + max_seconds, side='right')
+        counts = np.maximum(hi - lo, 0)
+        if counts.sum():
+            # Expand each start's range of valid ends without a Python loop
+            owner = np.repeat(np.arange(len(starts)), counts)
+            step = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            return starts[owner], ends[np.repeat(lo, counts) + step]
+
+    grid = np.arange(0.0, duration - min_seconds + 1e-9, GRID_STEP_SECONDS)
+    lengths = np.arange(min_seconds, max_seconds + 1e-9, 5.0)
+    starts = np.repeat(grid, len(lengths))
+    ends = starts + np.tile(lengths, len(grid))
+    keep = ends <= duration
+    return starts[keep], ends[keep]
+
+
+def score_spans(
+    scores: "np.ndarray",
+    frame_seconds: float,
+    starts: "np.ndarray",
+    ends: "np.ndarray"
+) -> "np.ndarray":
+    """Mean frame score of every span, from one prefix sum"""
+    prefix = np.concatenate(([0.0], np.cumsum(scores)))
+    first = np.clip((starts / frame_seconds).astype(int), 0, len(scores))
+    last = np.clip(np.ceil(ends / frame_seconds).astype(int), 0, len(scores))
+    return (prefix[last] - prefix[first]) / np.maximum(last - first, 1)
+
+
+def select_highlights(
+    starts: "np.ndarray",
+    ends: "np.ndarray",
+    span_scores: "np.ndarray",
+    count: int
+) -> List[Tuple[float, float, float]]:
+    """Best-scoring spans, skipping any that overlap one already chosen"""
+    chosen: List[Tuple[float, float, float]] = []
+    for i in np.argsort(-span_scores, kind='stable'):
+        start, end = float(starts[i]), float(ends[i])
+        if all(end <= s or start >= e for s, e, _ in chosen):
+            chosen.append((start, end, float(span_scores[i])))
+            if len(chosen) == count:
+                break
+    return chosen
+
+
+def clip_captions(captions: Sequence[Dict], start: float, end: float) -> List[Dict]:
+    """Captions overlapping [start, end], shifted so the span starts at 0"""
+    clipped = []
+    for cap in captions:
+        if cap['end'] <= start or cap['start'] >= end:
+            continue
+        clipped.append({
+            **cap,
+            'start': max(cap['start'], start) - start,
+            'end': min(cap['end'], end) - start
+        })
+    return clipped
+
+
+def find_highlights(
+    energy: "np.ndarray",
+    frame_seconds: float,
+    duration: float,
+    captions: Sequence[Dict],
+    count: int = 3,
+    min_seconds: float = MIN_HIGHLIGHT_SECONDS,
+    max_seconds: float = MAX_HIGHLIGHT_SECONDS
+) -> List[Highlight]:
+    """Top `count` non-overlapping highlights, in episode order"""
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy required for highlight extraction")
+
+    scores = frame_scores(energy, frame_seconds, captions)
+    starts, ends = candidate_spans(captions, duration, min_seconds, max_seconds)
+    span_scores = score_spans(scores, frame_seconds, starts, ends)
+    chosen = select_highlights(starts, ends, span_scores, count)
+
+    highlights = []
+    for start, end, score in sorted(chosen):
+        text = " ".join(c['text'] for c in clip_captions(captions, start, end))
+        highlights.append(Highlight(start, end, round(score, 4), text))
+    return highlights
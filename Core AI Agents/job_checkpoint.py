@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Resumable jobs: each stage's artifact is checkpointed in a job directory
+A job is identified by its inputs and output-affecting settings, so an
+interrupted run (crash, preempted worker) picks up after the last
+completed stage, and a finished render is not redone
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from result_cache import DEFAULT_CACHE_DIR
+
+_MANIFEST = "job.json"
+
+
+class JobCheckpoint:
+    """
+    <root>/<job key>/job.json records completed stages and their JSON
+    artifacts; bulky artifacts (prepared slides, rendered chunks) live in
+    subdirectories next to it
+    """
+
+    def __init__(self, root: Optional[str], identity: Dict):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR / 'jobs'
+        self.identity = identity
+        payload = json.dumps(identity, sort_keys=True, default=str)
+        self.key = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+        self.path = self.root / self.key
+        self._lock = threading.Lock()
+        self._stages = self._read()
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path / _MANIFEST, 'r', encoding='utf-8') as f:
+                return json.load(f)['stages']
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def _write(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest = self.path / _MANIFEST
+        tmp_path = manifest.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'identity': self.identity, 'stages': self._stages}, f, default=str)
+        # Atomic rename: a crash mid-write leaves the previous checkpoint intact
+        os.replace(tmp_path, manifest)
+
+    def done(self, stage: str) -> bool:
+        return stage in self._stages
+
+    def load(self, stage: str):
+        return self._stages.get(stage)
+
+    def save(self, stage: str, value):
+        """Record `stage` as completed with a JSON-serialisable artifact"""
+        with self._lock:
+            self._stages[stage] = value
+            self._write()
+
+    def dir(self, name: str) -> Path:
+        """Subdirectory for a stage's file artifacts"""
+        path = self.path / name
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def rendered(self, output_paths: Sequence[str]) -> bool:
+        """
+        True if the render stage finished, recorded all of `output_paths`,
+        and every file it recorded is unchanged since
+        """
+        recorded = (self._stages.get('render') or {}).get('outputs')
+        if not recorded or any(str(p) not in recorded for p in output_paths):
+            return False
+        for path, signature in recorded.items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if [stat.st_size, stat.st_mtime_ns] != signature:
+                return False
+        return True
+
+    def finish(self, output_paths: Sequence[str], **extra):
+        """Mark the job rendered, recording every output, and drop its bulky intermediates"""
+        outputs = {}
+        for path in output_paths:
+            stat = os.stat(path)
+            outputs[str(path)] = [stat.st_size, stat.st_mtime_ns]
+        self.save('render', {'outputs': outputs, **extra})
+        for child in self.path.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+
+    def discard(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._stages = {}
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Media information from a single ffprobe pass
+Duration, audio/video format and codec come from one JSON probe per input,
+memoized per process on (path, size, mtime) so every stage that asks
+shares it
+"""
+
+import json
+import os
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Audio codecs each output container can carry without re-encoding
+COPYABLE_AUDIO = {
+    '.mp4': {'aac', 'mp3', 'alac'},
+    '.m4v': {'aac'},
+    '.mov': {'aac', 'mp3', 'alac', 'pcm_s16le'},
+    '.mkv': {'aac', 'mp3', 'opus', 'vorbis', 'flac', 'alac', 'pcm_s16le'},
+    '.webm': {'opus', 'vorbis'},
+}
+
+_probes: Dict[Tuple[str, int, int], "MediaInfo"] = {}
+_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class MediaInfo:
+    """What the pipeline needs to know about an input file"""
+    path: str
+    duration: float
+    format_name: str
+    audio_codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    bit_rate: Optional[int] = None
+    has_video: bool = False
+    width: Optional[int] = None
+    height: Optional[int] = None
+    tags: Dict[str, str] = field(default_factory=dict, compare=False)  # container metadata
+
+    def can_copy_audio_to(self, output_path: str) -> bool:
+        """True when the audio stream can be stream-copied into `output_path`'s container"""
+        allowed = COPYABLE_AUDIO.get(Path(output_path).suffix.lower(), set())
+        return self.audio_codec in allowed
+
+    @classmethod
+    def from_ffprobe(cls, path: str, data: Dict) -> "MediaInfo":
+        fmt = data.get('format', {})
+        streams = data.get('streams', [])
+        audio = next((s for s in streams if s.get('codec_type') == 'audio'), {})
+        # Cover art in MP3/M4A shows up as a single-frame video stream
+        video = next((
+            s for s in streams
+            if s.get('codec_type') == 'video'
+            and not s.get('disposition', {}).get('attached_pic')
+        ), None)
+
+        duration = (fmt.get('duration') or audio.get('duration')
+                    or (video or {}).get('duration') or 0.0)
+        bit_rate = audio.get('bit_rate') or fmt.get('bit_rate')
+        return cls(
+            path=path,
+            duration=float(duration),
+            format_name=fmt.get('format_name', ''),
+            audio_codec=audio.get('codec_name'),
+            sample_rate=int(audio['sample_rate']) if audio.get('sample_rate') else None,
+            channels=audio.get('channels'),
+            bit_rate=int(bit_rate) if bit_rate else None,
+            has_video=video is not None,
+            width=video.get('width') if video else None,
+            height=video.get('height') if video else None,
+            tags={k.lower(): str(v) for k, v in fmt.get('tags', {}).items()}
+        )
+
+
+def probe_media(path: str) -> MediaInfo:
+    """
+    MediaInfo for `path` from one `ffprobe -of json` call
+    Raises RuntimeError when ffprobe is missing or cannot read the file
+    """
+    stat = os.stat(path)
+    key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+    with _lock:
+        info = _probes.get(key)
+    if info is not None:
+        return info
+
+    cmd = [
+        'ffprobe', '-v', 'error',
+        '-show_format', '-show_streams',
+        '-of', 'json',
+        str(path)
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(f"ffprobe could not read {path}: {e}") from e
+
+    info = MediaInfo.from_ffprobe(str(path), json.loads(result.stdout or '{}'))
+    with _lock:
+        _probes[key] = info
+    return info
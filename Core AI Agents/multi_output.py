@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Several renditions of one episode from a single FFmpeg run
+Slides, transitions and audio are decoded and composed once; the composed
+timeline is split and each output gets its own scale/crop, caption track
+and encoder, so a landscape video, a 720p copy, a 9:16 Short and an
+audiogram cost one decode instead of one each
+"""
+
+import subprocess
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ffmpeg_render import audio_args, build_slide_filtergraph, can_copy_audio, fit_filter
+from subtitles import CaptionStyle
+
+# Background behind letterboxed content, matching the MoviePy renders
+BACKGROUND_COLOR = "0x14141E"
+
+
+@dataclass(frozen=True)
+class OutputTarget:
+    """One rendition of the episode"""
+    name: str
+    resolution: Tuple[int, int]
+    layout: str = "fit"  # fit (letterboxed), vertical (blurred fill) or audiogram
+    caption_style: Optional[str] = None  # None: the job's style, scaled to the height
+
+
+OUTPUT_TARGETS: Dict[str, OutputTarget] = {
+    '1080p': OutputTarget('1080p', (1920, 1080)),
+    '720p': OutputTarget('720p', (1280, 720)),
+    # 9:16 with the landscape frame centred over a blurred copy of itself
+    'shorts': OutputTarget('shorts', (1080, 1920), 'vertical', 'mobile'),
+    # Square: slide on top, waveform of the audio along the bottom
+    'audiogram': OutputTarget('audiogram', (1080, 1080), 'audiogram', 'audiogram'),
+}
+
+
+def get_output_target(name: str) -> OutputTarget:
+    """Named target; raises ValueError for unknown names"""
+    try:
+        return OUTPUT_TARGETS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown output target {name!r} (choose from {', '.join(OUTPUT_TARGETS)})"
+        ) from None
+
+
+def parse_output_targets(value: str) -> Tuple[str, ...]:
+    """Comma-separated target names, e.g. "720p,shorts", validated"""
+    names = tuple(name.strip() for name in value.split(',') if name.strip())
+    for name in names:
+        get_output_target(name)
+    return names
+
+
+def scale_caption_style(style: CaptionStyle, factor: float) -> CaptionStyle:
+    """`style` for a frame `factor` times the height it was designed for"""
+    if factor == 1:
+        return style
+    return replace(
+        style,
+        fontsize=max(1, int(round(style.fontsize * factor))),
+        outline=style.outline * factor,
+        margin_v=int(round(style.margin_v * factor)),
+        box_padding=int(round(style.box_padding * factor))
+    )
+
+
+def _even(value: float) -> int:
+    """yuv420p needs even frame sizes"""
+    return max(2, int(value) // 2 * 2)
+
+
+def _layout_chain(
+    target: OutputTarget,
+    source: str,
+    out: str,
+    base_resolution: Tuple[int, int],
+    fps: int,
+    waves: Optional[str],
+    index: int
+) -> List[str]:
+    """Filters turning the composed timeline `source` into `target`'s frame"""
+    width, height = target.resolution
+    if target.layout == "fit":
+        if tuple(target.resolution) == tuple(base_resolution):
+            return [f"[{source}]null[{out}]"]
+        return [f"[{source}]{fit_filter(target.resolution)},format=yuv420p[{out}]"]
+
+    if target.layout == "vertical":
+        # Blur a small copy and scale it back up: far cheaper than a
+        # full-resolution blur and indistinguishable once blurred
+        small_w, small_h = _even(width / 8), _even(height / 8)
+        return [
+            f"[{source}]split[fg{index}][bg{index}]",
+            f"[bg{index}]scale={small_w}:{small_h}:force_original_aspect_ratio=increase,"
+            f"crop={small_w}:{small_h},boxblur=4:2,scale={width}:{height},setsar=1[bb{index}]",
+            f"[fg{index}]scale={width}:-2,setsar=1[ff{index}]",
+            f"[bb{index}][ff{index}]overlay=(main_w-overlay_w)/2:(main_h-overlay_h)/2,"
+            f"format=yuv420p[{out}]",
+        ]
+
+    if target.layout == "audiogram":
+        wave_height = _even(height / 5)
+        return [
+            f"[{source}]scale={width}:-2,"
+            f"pad={width}:{height}:0:(oh-ih)/4:color={BACKGROUND_COLOR},setsar=1[ag{index}]",
+            f"[{waves}]showwaves=s={width}x{wave_height}:mode=cline:rate={fps}:"
+            f"colors=white,format=rgba[wv{index}]",
+            f"[ag{index}][wv{index}]overlay=0:{height - wave_height - _even(height / 25)},"
+            f"format=yuv420p[{out}]",
+        ]
+
+    raise ValueError(f"Unknown layout: {target.layout}")
+
+
+def build_multi_output_filtergraph(
+    durations: Sequence[float],
+    base_resolution: Tuple[int, int],
+    fps: int,
+    transition: float,
+    targets: Sequence[OutputTarget],
+    subtitles_files: Sequence[Optional[str]],
+    audio_input: int
+) -> Tuple[str, List[float]]:
+    """
+    filter_complex composing slide inputs 0..n-1 once at `base_resolution`
+    and splitting the result into one [v<i>] output per target, each with
+    its own layout and (optional) burned-in ASS file
+    Returns (graph, per-input lengths) like build_slide_filtergraph
+    """
+    graph, lengths = build_slide_filtergraph(durations, base_resolution, fps, transition)
+    chains = [graph]
+
+    count = len(targets)
+    if count == 1:
+        chains.append("[vout]null[b0]")
+    else:
+        chains.append("[vout]split=" + str(count) + "".join(f"[b{i}]" for i in range(count)))
+
+    # Audiograms draw the audio; split it when more than one does
+    wave_targets = [i for i, t in enumerate(targets) if t.layout == "audiogram"]
+    waves: Dict[int, str] = {}
+    if len(wave_targets) == 1:
+        waves[wave_targets[0]] = f"{audio_input}:a"
+    elif wave_targets:
+        chains.append(
+            f"[{audio_input}:a]asplit={len(wave_targets)}"
+            + "".join(f"[a{i}]" for i in wave_targets)
+        )
+        waves = {i: f"a{i}" for i in wave_targets}
+
+    for i, (target, subtitles_file) in enumerate(zip(targets, subtitles_files)):
+        laid_out = f"l{i}" if subtitles_file else f"v{i}"
+        chains += _layout_chain(target, f"b{i}", laid_out, base_resolution, fps, waves.get(i), i)
+        if subtitles_file:
+            chains.append(f"[{laid_out}]subtitles={subtitles_file}[v{i}]")
+    return ";\n".join(chains), lengths
+
+
+def render_multi_output(
+    slides: Sequence[Path],
+    durations: Sequence[float],
+    audio_path: str,
+    outputs: Sequence[Tuple[OutputTarget, str, Optional[Path]]],
+    work_dir: Path,
+    base_resolution: Tuple[int, int],
+    fps: int = 30,
+    transition: float = 0.5,
+    preset: str = 'medium',
+    crf: int = 23,
+    threads: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Render every (target, output path, ASS file or None) in one FFmpeg run
+    Audio is stream-copied into each output whose container accepts it.
+    Like render_slides, FFmpeg runs inside `work_dir`, where the ASS files
+    must live. Returns {target name: output path}.
+    """
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    audio_path = str(Path(audio_path).resolve())
+    total = float(sum(durations))
+
+    subtitles_names = []
+    for _, _, subtitles_file in outputs:
+        if subtitles_file is None:
+            subtitles_names.append(None)
+            continue
+        subtitles_file = Path(subtitles_file).resolve()
+        if subtitles_file.parent != work_dir.resolve():
+            raise ValueError("subtitles files must live in work_dir")
+        subtitles_names.append(subtitles_file.name)
+
+    targets = [target for target, _, _ in outputs]
+    graph, lengths = build_multi_output_filtergraph(
+        durations, base_resolution, fps, transition, targets, subtitles_names, len(slides)
+    )
+    graph_file = work_dir / "multi_output.filtergraph"
+    graph_file.write_text(graph, encoding='utf-8')
+
+    cmd = ['ffmpeg', '-y', '-v', 'error', '-stats']
+    for slide, length in zip(slides, lengths):
+        cmd += ['-loop', '1', '-framerate', str(fps), '-t', f"{length:.3f}",
+                '-i', str(Path(slide).resolve())]
+    cmd += ['-i', audio_path, '-filter_complex_script', graph_file.name]
+
+    results = {}
+    for i, (target, output_path, _) in enumerate(outputs):
+        output_path = str(Path(output_path).resolve())
+        audio = audio_args(output_path, can_copy_audio(audio_path, output_path))
+        cmd += [
+            '-map', f"[v{i}]", '-map', f"{len(slides)}:a:0",
+            '-c:v', 'libx264', '-preset', preset, '-crf', str(crf),
+            '-pix_fmt', 'yuv420p', '-r', str(fps)
+        ]
+        if threads:
+            cmd += ['-threads', str(threads)]
+        cmd += [*audio, '-t', f"{total:.3f}", '-movflags', '+faststart', output_path]
+        results[target.name] = output_path
+
+    print(f"🚀 Rendering {len(outputs)} outputs from one decode "
+          f"({', '.join(t.name for t in targets)})...")
+    subprocess.run(cmd, check=True, cwd=work_dir)
+    return results
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Parallel chunked rendering of MoviePy timelines
+The timeline is cut at slide/segment boundaries into chunks that are
+encoded concurrently, each starting on a closed GOP, then joined with the
+concat demuxer (-c copy) and muxed with the audio once. Chunks are named
+by their frame range and written atomically, so a rerun in the same
+work_dir only renders the chunks that are missing
+"""
+
+import functools
+import inspect
+import math
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from ffmpeg_render import audio_args, audio_codec_for, can_copy_audio, mux_audio
+
+# Chunks shorter than this are not worth a process of their own
+MIN_CHUNK_SECONDS = 10.0
+
+# Timeline of this worker process, set by the pool initializer. Fork passes
+# initializer arguments by memory copy, so MoviePy clips (which hold
+# readers and lambdas) are never pickled and each pool gets its own clip.
+_TIMELINE = None
+
+
+def parallel_render_available() -> bool:
+    """Workers inherit the timeline by forking, which not every platform offers"""
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def fork_safe() -> bool:
+    """
+    True when this is the only thread: a forked child gets just the calling
+    thread, so a lock another thread (a pipeline stage, a server pool,
+    torch) happens to hold would stay locked in it forever
+    """
+    return threading.active_count() == 1
+
+
+def default_render_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def plan_render_chunks(
+    duration: float,
+    fps: int,
+    workers: int,
+    boundaries: Optional[Sequence[float]] = None,
+    max_chunk_seconds: Optional[float] = None
+) -> List[float]:
+    """
+    Chunk edges (seconds, from 0 to duration) for about `workers` chunks,
+    or more when chunks must stay under `max_chunk_seconds`
+    Cuts prefer the nearest slide/segment boundary and always land on a frame
+    """
+    count = workers
+    if max_chunk_seconds:
+        count = max(count, math.ceil(duration / max_chunk_seconds))
+    count = max(1, min(count, int(duration // MIN_CHUNK_SECONDS)))
+    ideal = [duration * i / count for i in range(1, count)]
+    candidates = sorted(b for b in (boundaries or []) if 0 < b < duration)
+
+    cuts = []
+    for target in ideal:
+        cut = target
+        if candidates:
+            i = bisect_left(candidates, target)
+            nearby = candidates[max(0, i - 1):i + 1]
+            best = min(nearby, key=lambda b: abs(b - target))
+            if abs(best - target) <= 0.5 * duration / count:
+                cut = best
+        cuts.append(round(cut * fps) / float(fps))
+
+    edges = [0.0] + sorted(set(cuts)) + [duration]
+    return [e for i, e in enumerate(edges) if i == 0 or e > edges[i - 1]]
+
+
+def _shift_filters(ffmpeg_params: List[str], start: float) -> List[str]:
+    """
+    Run time-based filters (e.g. burned-in subtitles) on the global
+    timeline: shift PTS to the chunk's start, filter, shift back
+    """
+    params = list(ffmpeg_params)
+    if '-vf' in params and start > 0:
+        i = params.index('-vf') + 1
+        params[i] = f"setpts=PTS+{start:.6f}/TB,{params[i]},setpts=PTS-STARTPTS"
+    return params
+
+
+def _chunk_name(start: float, end: float, fps: int) -> str:
+    return f"chunk_{round(start * fps):08d}_{round(end * fps):08d}.mp4"
+
+
+def timeline_readers(clip) -> list:
+    """
+    FFmpeg video readers the timeline decodes from, found through clip
+    attributes and the closures of the frame functions MoviePy's effects
+    wrap around their source clips
+    """
+    from moviepy.video.io.ffmpeg_reader import FFMPEG_VideoReader
+
+    readers, seen, stack = [], set(), [clip]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, FFMPEG_VideoReader):
+            readers.append(obj)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, functools.partial):
+            stack += [obj.func, *obj.args, *obj.keywords.values()]
+        elif inspect.ismethod(obj):
+            stack += [obj.__self__, obj.__func__]
+        elif inspect.isfunction(obj):
+            for cell in obj.__closure__ or ():
+                try:
+                    stack.append(cell.cell_contents)
+                except ValueError:  # empty cell
+                    pass
+        elif type(obj).__module__.startswith('moviepy') and hasattr(obj, '__dict__'):
+            stack.extend(vars(obj).values())
+    return readers
+
+
+def _init_chunk_worker(timeline, readers):
+    """
+    Pool initializer: keep the timeline and give this worker its own
+    decoders for it; the inherited ones share the parent's pipes (and
+    terminating them would kill the parent's decoder)
+    """
+    global _TIMELINE
+    _TIMELINE = timeline
+    for reader in readers:
+        reader.proc = None
+        reader.initialize()
+
+
+def _render_chunk(start: float, end: float, path: str, options: dict) -> str:
+    if os.path.exists(path):
+        # Finished by an earlier, interrupted run
+        return path
+    part_path = f"{path[:-len('.mp4')]}.part.mp4"
+    chunk = _TIMELINE.subclip(start, end)
+    chunk.write_videofile(
+        part_path,
+        fps=options['fps'],
+        codec='libx264',
+        preset=options['preset'],
+        audio=False,
+        threads=options['threads'],
+        ffmpeg_params=_shift_filters(options['ffmpeg_params'], start) + [
+            '-crf', str(options['crf']), '-pix_fmt', 'yuv420p', '-flags', '+cgop'
+        ],
+        verbose=False,
+        logger=None
+    )
+    os.replace(part_path, path)
+    return path
+
+
+def write_videofile_parallel(
+    clip,
+    output_path: str,
+    work_dir: Path,
+    fps: int = 30,
+    workers: Optional[int] = None,
+    boundaries: Optional[Sequence[float]] = None,
+    audio_path: Optional[str] = None,
+    preset: str = 'medium',
+    crf: int = 23,
+    ffmpeg_params: Optional[List[str]] = None,
+    threads: Optional[int] = None,
+    max_chunk_seconds: Optional[float] = None,
+    copy_audio: Optional[bool] = None
+) -> str:
+    """
+    Drop-in replacement for `clip.write_videofile` that encodes chunks on
+    a process pool; `audio_path` (the untouched source file) lets the
+    audio be stream-copied when compatible (`copy_audio`, probed when None),
+    otherwise the clip's audio is encoded once. Chunks already present in
+    `work_dir` are reused. Must be called with no other threads running
+    (see fork_safe); write_video falls back to the serial writer otherwise.
+    """
+    if not fork_safe():
+        raise RuntimeError("Parallel rendering forks; other threads are running")
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or default_render_workers()
+    edges = plan_render_chunks(clip.duration, fps, workers, boundaries, max_chunk_seconds)
+    cores = threads or default_render_workers()
+    chunk_count = len(edges) - 1
+
+    options = {
+        'fps': fps,
+        'preset': preset,
+        'crf': crf,
+        'threads': max(1, cores // min(workers, chunk_count)),
+        'ffmpeg_params': list(ffmpeg_params or [])
+    }
+    chunk_paths = [
+        str(work_dir / _chunk_name(edges[i], edges[i + 1], fps)) for i in range(chunk_count)
+    ]
+    done = sum(1 for p in chunk_paths if os.path.exists(p))
+
+    print(f"⚡ Rendering {chunk_count} chunks on {min(workers, chunk_count)} workers...")
+    if done:
+        print(f"♻️  Resuming: {done}/{chunk_count} chunks already rendered")
+    timeline = clip.without_audio()
+    pending = [i for i in range(chunk_count) if not os.path.exists(chunk_paths[i])]
+    if pending:
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(pending)),
+            mp_context=context,
+            initializer=_init_chunk_worker,
+            initargs=(timeline, timeline_readers(timeline))
+        ) as pool:
+            futures = [
+                pool.submit(_render_chunk, edges[i], edges[i + 1], chunk_paths[i], options)
+                for i in pending
+            ]
+            for future in futures:
+                future.result()
+
+    concat_file = work_dir / "chunks.txt"
+    concat_file.write_text(
+        "".join(f"file '{Path(p).name}'\n" for p in chunk_paths), encoding='utf-8'
+    )
+
+    if audio_path is not None:
+        audio_path = str(Path(audio_path).resolve())
+        if copy_audio is None:
+            copy_audio = can_copy_audio(audio_path, output_path)
+    elif clip.audio is not None:
+        # Encode the composed audio once; the mux below copies it into
+        # containers that take AAC and converts it for the rest (.webm)
+        audio_path = str((work_dir / "audio.m4a").resolve())
+        clip.audio.write_audiofile(
+            audio_path, fps=44100, codec='aac', bitrate='192k', logger=None
+        )
+        copy_audio = audio_codec_for(output_path) == 'aac'
+
+    cmd = ['ffmpeg', '-y', '-v', 'error', '-f', 'concat', '-safe', '0', '-i', concat_file.name]
+    if audio_path is not None:
+        cmd += ['-i', audio_path, '-map', '0:v:0', '-map', '1:a:0']
+        cmd += audio_args(output_path, copy_audio)
+    cmd += ['-c:v', 'copy', '-t', f"{clip.duration:.6f}",
+            '-movflags', '+faststart', str(Path(output_path).resolve())]
+    subprocess.run(cmd, check=True, cwd=work_dir)
+
+    for path in chunk_paths:
+        Path(path).unlink(missing_ok=True)
+    return output_path
+
+
+def write_video(
+    clip,
+    output_path: str,
+    work_dir: Path,
+    workers: int = 1,
+    fps: int = 30,
+    boundaries: Optional[Sequence[float]] = None,
+    audio_path: Optional[str] = None,
+    preset: str = 'medium',
+    crf: int = 23,
+    ffmpeg_params: Optional[List[str]] = None,
+    threads: Optional[int] = None,
+    max_chunk_seconds: Optional[float] = None,
+    copy_audio: Optional[bool] = None,
+    **write_kwargs
+) -> str:
+    """
+    Encode `clip` serially (workers == 1) or in parallel chunks (workers > 1,
+    or 0 for one per core); `threads` caps the encoder threads in total and
+    `write_kwargs` only apply to the serial path. `max_chunk_seconds` makes
+    even a single worker render in resumable chunks. Given `audio_path` (the
+    clip's audio, from t=0), both paths mux that file in instead of encoding
+    the clip's audio; `copy_audio` skips the codec probe when the caller
+    already knows the answer. Chunked renders need fork and a process with
+    no other threads (see fork_safe); otherwise the clip is encoded serially.
+    """
+    chunked = (workers != 1 or max_chunk_seconds) and parallel_render_available()
+    if chunked and not fork_safe():
+        print("⚠️  Other threads are running; rendering serially instead of forking")
+        chunked = False
+    if chunked:
+        return write_videofile_parallel(
+            clip, output_path, work_dir, fps=fps, workers=workers or None,
+            boundaries=boundaries, audio_path=audio_path,
+            preset=preset, crf=crf, ffmpeg_params=ffmpeg_params, threads=threads,
+            max_chunk_seconds=max_chunk_seconds, copy_audio=copy_audio
+        )
+    # Same quality as the chunked path
+    quality_params = list(ffmpeg_params or []) + ['-crf', str(crf)]
+    if audio_path is not None and shutil.which('ffmpeg'):
+        # Encode the picture only, then mux the source (or job) audio in,
+        # stream-copied when compatible instead of MoviePy's AAC re-encode
+        work_dir = Path(work_dir)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        video_only = work_dir / f"video_only{Path(output_path).suffix}"
+        clip.without_audio().write_videofile(
+            str(video_only), fps=fps, codec='libx264', preset=preset, audio=False,
+            ffmpeg_params=quality_params, threads=threads, **write_kwargs
+        )
+        if copy_audio is None:
+            copy_audio = can_copy_audio(audio_path, output_path)
+        mux_audio(str(video_only), audio_path, output_path, copy_audio, clip.duration)
+        video_only.unlink(missing_ok=True)
+        return output_path
+    clip.write_videofile(
+        output_path, fps=fps, codec='libx264', preset=preset,
+        ffmpeg_params=quality_params, threads=threads, **write_kwargs
+    )
+    return output_path
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Pipelined stage scheduler for streams of jobs
+Segmentation, captioning, slide preparation and encoding each run on their
+own workers with bounded queues in between, so job N+1 is transcribed while
+job N is encoding and throughput approaches that of the slowest stage
+"""
+
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from batch import BatchJob, summarize
+from podcast_video_creator import NotebookLMVideoAgent, VideoConfig
+from transcription import TranscriptionWorkerPool, default_worker_count, whisper_available
+
+STAGES = ("analyze", "captions", "slides", "encode")
+
+DEFAULT_STAGE_WORKERS = {"analyze": 1, "captions": 1, "slides": 1, "encode": 1}
+
+_DONE = object()
+
+
+@dataclass
+class JobState:
+    """A job travelling through the pipeline with its per-stage outputs"""
+    index: int
+    job: BatchJob
+    agent: Optional[NotebookLMVideoAgent]  # None when the agent could not be created
+    segments: List[Dict] = field(default_factory=list)
+    captions: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+    started: float = field(default_factory=time.time)
+    stage_seconds: Dict[str, float] = field(default_factory=dict)
+
+
+def new_job_state(
+    index: int,
+    job: BatchJob,
+    config: VideoConfig,
+    transcriber: Optional[TranscriptionWorkerPool] = None
+) -> JobState:
+    """
+    JobState with a fresh agent; when the agent cannot be created the state
+    carries the error instead, so it skips every stage and finish_job
+    reports it
+    """
+    try:
+        agent = NotebookLMVideoAgent(config, transcriber=transcriber)
+    except Exception as e:
+        state = JobState(index, job, None)
+        state.error = f"setup: {type(e).__name__}: {e}"
+        return state
+    return JobState(index, job, agent)
+
+
+def transcription_pool(
+    config: VideoConfig,
+    captions_workers: int
+) -> Optional[TranscriptionWorkerPool]:
+    """
+    Whisper worker pool for more than one captions worker, or None; without
+    one every captions worker shares the process's model, whose calls
+    WhisperModelRegistry serializes
+    """
+    if captions_workers <= 1 or not config.caption_enabled or not whisper_available():
+        return None
+    cores = default_worker_count()
+    return TranscriptionWorkerPool(
+        config.whisper_model, captions_workers,
+        threads_per_worker=max(1, cores // captions_workers)
+    )
+
+
+def _analyze(state: JobState):
+    state.agent.begin_job(state.job.audio, state.job.visuals, state.job.output, state.job.style)
+    state.segments = state.agent.analyze_job_audio(
+        state.job.audio, state.job.visuals, state.job.style
+    )
+
+
+def _captions(state: JobState):
+    state.captions = state.agent.caption_job_audio(state.job.audio)
+
+
+def _slides(state: JobState):
+    if state.job.style == "slides":
+        state.agent.prepare_job_slides(state.job.visuals)
+
+
+def _encode(state: JobState):
+    Path(state.job.output).parent.mkdir(parents=True, exist_ok=True)
+    state.agent.render_job(
+        state.job.audio, state.job.visuals, state.job.output,
+        state.job.style, state.captions, state.segments
+    )
+
+
+_STAGE_FUNCS: Dict[str, Callable[[JobState], None]] = {
+    "analyze": _analyze,
+    "captions": _captions,
+    "slides": _slides,
+    "encode": _encode,
+}
+
+
+def run_stage(stage: str, state: JobState):
+    """Run one stage on `state` unless an earlier one failed; records timing and errors"""
+    if state.error is not None:
+        return
+    started = time.time()
+    try:
+        _STAGE_FUNCS[stage](state)
+    except Exception as e:
+        state.error = f"{stage}: {type(e).__name__}: {e}"
+    state.stage_seconds[stage] = round(time.time() - started, 2)
+
+
+def finish_job(state: JobState) -> Dict:
+    """Release the job's agent and return its summary"""
+    if state.agent is not None:
+        try:
+            state.agent.release_job(state.job.audio, state.job.visuals)
+        finally:
+            state.agent.cleanup()
+    summary = {
+        **asdict(state.job),
+        'status': 'ok' if state.error is None else 'failed',
+        'error': state.error,
+        'segments': len(state.segments),
+        'captions': len(state.captions),
+        'stage_seconds': state.stage_seconds,
+        'seconds': round(time.time() - state.started, 2)
+    }
+    icon = "✅" if state.error is None else "❌"
+    print(f"{icon} {state.job.output} ({summary['seconds']:.0f}s)")
+    return summary
+
+
+class StagePipeline:
+    """
+    Runs every job through STAGES in order; each stage has its own worker
+    threads and a bounded input queue, so a slow stage applies backpressure
+    instead of letting decoded audio pile up. The heavy work in every stage
+    (Whisper, NumPy, FFmpeg subprocesses) releases the GIL.
+
+    Without a `transcriber`, every captions worker shares the process's one
+    Whisper model, whose calls WhisperModelRegistry serializes, so extra
+    captions workers only help with a TranscriptionWorkerPool (run_pipeline
+    starts one when captions has more than one worker).
+    """
+
+    def __init__(
+        self,
+        config: Optional[VideoConfig] = None,
+        stage_workers: Optional[Dict[str, int]] = None,
+        queue_size: int = 2,
+        transcriber: Optional[TranscriptionWorkerPool] = None
+    ):
+        self.config = config or VideoConfig()
+        self.stage_workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+        self.queue_size = queue_size
+        self.transcriber = transcriber
+
+    def run(self, jobs: List[BatchJob]) -> List[Dict]:
+        """Process `jobs` and return one summary per job, in input order"""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in STAGES]
+        finished: "queue.Queue" = queue.Queue()
+
+        threads = []
+        for i, stage in enumerate(STAGES):
+            out = queues[i + 1] if i + 1 < len(STAGES) else finished
+            for _ in range(self._workers(stage)):
+                worker = threading.Thread(
+                    target=self._stage_worker, args=(stage, queues[i], out),
+                    name=f"pipeline-{stage}", daemon=True
+                )
+                worker.start()
+                threads.append(worker)
+
+        feeder = threading.Thread(target=self._feed, args=(jobs, queues[0]), daemon=True)
+        feeder.start()
+
+        results: List[Optional[Dict]] = [None] * len(jobs)
+        for _ in range(len(jobs)):
+            state = finished.get()
+            results[state.index] = finish_job(state)
+
+        # Every job is through, so the queues are empty: stop the workers
+        for i, stage in enumerate(STAGES):
+            for _ in range(self._workers(stage)):
+                queues[i].put(_DONE)
+        for worker in threads:
+            worker.join()
+        return results
+
+    def _workers(self, stage: str) -> int:
+        return max(1, self.stage_workers[stage])
+
+    def _feed(self, jobs: List[BatchJob], first: "queue.Queue"):
+        # A job whose agent fails to start still reaches finish_job, so
+        # run() gets one state per job
+        for index, job in enumerate(jobs):
+            first.put(new_job_state(index, job, self.config, self.transcriber))
+
+    def _stage_worker(self, stage: str, inbox: "queue.Queue", outbox: "queue.Queue"):
+        while True:
+            state = inbox.get()
+            if state is _DONE:
+                return
+            run_stage(stage, state)
+            outbox.put(state)
+
+
+def parse_stage_workers(spec: str) -> Dict[str, int]:
+    """'captions=2,encode=3' -> {'captions': 2, 'encode': 3}"""
+    workers = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        stage, _, count = item.partition('=')
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}' (expected one of {', '.join(STAGES)})")
+        workers[stage] = int(count)
+    return workers
+
+
+def run_pipeline(
+    jobs: List[BatchJob],
+    config: Optional[VideoConfig] = None,
+    stage_workers: Optional[Dict[str, int]] = None,
+    queue_size: int = 2,
+    summary_path: Optional[str] = None,
+    transcriber: Optional[TranscriptionWorkerPool] = None
+) -> Dict:
+    """
+    Run `jobs` through a StagePipeline and summarise them like run_batch
+    Several captions workers get a TranscriptionWorkerPool of the same size
+    unless `transcriber` is given, so they transcribe in parallel
+    """
+    pipeline = StagePipeline(config, stage_workers, queue_size, transcriber)
+    print(f"🏭 Pipelining {len(jobs)} jobs: "
+          + ", ".join(f"{stage}×{pipeline._workers(stage)}" for stage in STAGES))
+    started = time.time()
+    own_pool = None
+    if transcriber is None:
+        own_pool = transcription_pool(pipeline.config, pipeline._workers("captions"))
+        pipeline.transcriber = own_pool
+    try:
+        results = pipeline.run(jobs)
+    finally:
+        if own_pool is not None:
+            own_pool.close()
+    return summarize(results, started, summary_path, stage_workers=pipeline.stage_workers)
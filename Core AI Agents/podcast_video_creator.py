@@ -5,42 +5,50 @@ NotebookLM to YouTube Video AI Agent
 Automates conversion of NotebookLM audio into YouTube-ready videos
 """
 
-import os
 import sys
 import json
-import subprocess
+import importlib.util
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from dataclasses import asdict, dataclass
 import tempfile
 import shutil
 
-# Core video processing
-try:
-    from moviepy.editor import (
-        AudioFileClip, ImageClip, CompositeVideoClip, 
-        concatenate_videoclips, TextClip, ColorClip
-    )
-    from moviepy.video.fx.all import fadein, fadeout
-    MOVIEPY_AVAILABLE = True
-except ImportError:
-    MOVIEPY_AVAILABLE = False
+# Core video processing (MoviePy is imported by the code paths that use it;
+# loading it costs seconds that --help or FFmpeg-only runs shouldn't pay)
+MOVIEPY_AVAILABLE = importlib.util.find_spec('moviepy') is not None
+if not MOVIEPY_AVAILABLE:
     print("⚠️  MoviePy not installed. Will use FFmpeg fallback.")
 
 # Audio analysis
-try:
-    import librosa
-    import numpy as np
-    LIBROSA_AVAILABLE = True
-except ImportError:
-    LIBROSA_AVAILABLE = False
+from audio_analysis import (
+    NUMPY_AVAILABLE, DecodedAudio, HOP_LENGTH, align_slides, can_decode, detect_segments, frame_rms, stream_frame_rms,
+    stream_segments
+)
+from deck_ingest import DeckPages, DeckRasterizer, is_deck
+from ffmpeg_render import audio_codec_for, encode_audio, render_slides, render_static_slides
+from highlights import (
+    MAX_HIGHLIGHT_SECONDS, MIN_HIGHLIGHT_SECONDS, Highlight, find_highlights
+)
+from job_checkpoint import JobCheckpoint
+from media_info import MediaInfo, probe_media
+from multi_output import (
+    OutputTarget, get_output_target, parse_output_targets, render_multi_output,
+    scale_caption_style
+)
+from parallel_render import write_video
+from result_cache import DEFAULT_MAX_BYTES, ResultCache, content_hash
+from slide_cache import PIL_AVAILABLE, SlideCache
+from caption_overlay import apply_captions
+from subtitles import get_caption_style, write_ass
+from transcription import (
+    WHISPER_SAMPLE_RATE, TranscriptionWorkerPool, WhisperModelRegistry,
+    default_worker_count, plan_chunks, result_to_captions, transcribe_chunked,
+    whisper_available
+)
 
 # For AI-generated visuals (optional)
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+REQUESTS_AVAILABLE = importlib.util.find_spec('requests') is not None
 
 
 @dataclass
@@ -51,9 +59,58 @@ class VideoConfig:
     transition_duration: float = 0.5
     default_slide_duration: float = 5.0
     caption_enabled: bool = True
-    caption_style: str = "modern"  # modern, minimal, bold
+    caption_style: str = "modern"  # modern, youtube, mobile (see subtitles.CAPTION_STYLES)
+    caption_renderer: str = "ass"  # MoviePy path: ass (burned in by FFmpeg) or overlay
     background_music_volume: float = 0.1
     output_format: str = "mp4"
+    output_targets: Tuple[str, ...] = ()  # extra renditions: 1080p, 720p, shorts, audiogram
+    # Rendering
+    renderer: str = "moviepy"  # moviepy, ffmpeg (single filter_complex pass) or static
+    video_preset: str = "medium"
+    video_crf: int = 23
+    render_workers: int = 1  # >1 encodes MoviePy timelines in parallel chunks (0 = one per core)
+    encode_threads: Optional[int] = None  # encoder threads per render (None = encoder default)
+    # Audio segmentation
+    streaming_analysis: bool = False  # bounded-memory analysis for multi-hour audio
+    analysis_block_seconds: float = 30.0
+    silence_threshold_ratio: float = 0.5  # fraction of mean RMS treated as a pause
+    min_pause_duration: float = 0.3
+    min_segment_duration: float = 3.0
+    max_segment_duration: float = 10.0
+    target_segment_count: Optional[int] = None  # fixed segment count, e.g. one per slide
+    align_slides_to_pauses: bool = True  # change slides on natural pauses
+    # Transcription
+    whisper_model: str = "base"
+    parallel_transcription: bool = False  # transcribe pause-aligned chunks on a process pool
+    transcription_chunk_seconds: float = 120.0
+    transcription_chunk_overlap: float = 2.0
+    transcription_workers: Optional[int] = None  # default: one per core
+    # Result cache (segments and captions keyed by audio content + parameters)
+    cache_enabled: bool = True
+    cache_dir: Optional[str] = None  # default: ~/.cache/notebooklm-video-agent
+    cache_max_bytes: int = DEFAULT_MAX_BYTES
+    slide_workers: Optional[int] = None  # threads for slide preprocessing
+    deck_workers: Optional[int] = None  # pdftoppm processes for .pptx/.pdf decks
+    # Resumable jobs (stage artifacts checkpointed per job)
+    resume_jobs: bool = True
+    checkpoint_dir: Optional[str] = None  # default: <cache dir>/jobs (needs caching or a dir)
+    resume_renders: bool = False  # also checkpoint single-worker MoviePy renders in chunks
+    checkpoint_chunk_seconds: float = 60.0  # chunked MoviePy renders resume at this granularity
+    # Highlight Shorts (see highlights.py)
+    shorts_count: int = 0  # best-scoring spans cut into 9:16 Shorts (0 = none)
+    shorts_min_seconds: float = MIN_HIGHLIGHT_SECONDS
+    shorts_max_seconds: float = MAX_HIGHLIGHT_SECONDS
+
+
+# Settings that change how fast a job runs but not what it produces
+_NON_OUTPUT_SETTINGS = {
+    'cache_enabled', 'cache_dir', 'cache_max_bytes', 'slide_workers', 'deck_workers',
+    'transcription_workers', 'render_workers', 'encode_threads',
+    'resume_jobs', 'resume_renders', 'checkpoint_dir', 'checkpoint_chunk_seconds'
+}
+
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}
 
 
 class NotebookLMVideoAgent:
@@ -62,62 +119,254 @@ class NotebookLMVideoAgent:
     Supports multiple visual styles: slides, B-roll, talking head, captions
     """
 
-    def __init__(self, config: VideoConfig = None):
+    def __init__(
+        self,
+        config: VideoConfig = None,
+        transcriber: Optional[TranscriptionWorkerPool] = None
+    ):
         self.config = config or VideoConfig()
+        # Optional warm worker pool; otherwise the process-wide model cache is used
+        self.transcriber = transcriber
         self.temp_dir = Path(tempfile.mkdtemp())
         self.segments = []
+        self._decoded_audio: Dict[str, DecodedAudio] = {}
+        self._energy: Dict[str, Tuple[object, float]] = {}
+        self.shorts: List[str] = []
+        self.cache = (
+            ResultCache(self.config.cache_dir, self.config.cache_max_bytes)
+            if self.config.cache_enabled else None
+        )
+        # Fitted slides and deck pages persist next to the result cache, else only for this run
+        if self.config.cache_enabled:
+            cache_root = Path(self.config.cache_dir) if self.config.cache_dir else None
+        else:
+            cache_root = self.temp_dir
+        self.slide_cache = SlideCache(
+            cache_root / "slides" if cache_root else None, self.config.slide_workers
+        )
+        self.deck_rasterizer = DeckRasterizer(
+            cache_root / "decks" if cache_root else None, self.config.deck_workers
+        )
+        self._decks: Dict[str, DeckPages] = {}
+        self._prepared_slides: Dict[str, List[Path]] = {}
+        self._media_info: Dict[str, MediaInfo] = {}
+        self._encoded_audio: Dict[Tuple[str, str], str] = {}
+        # Stage checkpoints of the current job (see begin_job)
+        self.checkpoint: Optional[JobCheckpoint] = None
+
+    def load_audio(self, audio_path: str) -> DecodedAudio:
+        """
+        Decode audio once per job; segmentation, captioning and highlight
+        scoring share the returned PCM instead of decoding the file again
+        (the soundtrack itself comes from the source file, see audio_clip)
+        """
+        key = self._path_key(audio_path)
+        if key not in self._decoded_audio:
+            print("🎧 Decoding audio...")
+            self._decoded_audio[key] = DecodedAudio.load(audio_path, self.temp_dir / "pcm")
+        return self._decoded_audio[key]
+
+    def release_audio(self, audio_path: str):
+        """Drop the decoded PCM for a finished job"""
+        decoded = self._decoded_audio.pop(self._path_key(audio_path), None)
+        if decoded is not None:
+            decoded.close()
+
+    @staticmethod
+    def _path_key(path: str) -> str:
+        return str(Path(path).resolve())
+
+    def _audio_clip(self, audio_path: str):
+        """The job's one AudioFileClip of the source (not built from the decoded PCM)"""
+        decoded = self._decoded_audio.get(self._path_key(audio_path))
+        if decoded is not None:
+            return decoded.audio_clip()
+        from moviepy.editor import AudioFileClip
+        return AudioFileClip(audio_path)
+
+    def media_info(self, audio_path: str) -> MediaInfo:
+        """Duration, codec and format of an input, probed once per job"""
+        key = self._path_key(audio_path)
+        if key not in self._media_info:
+            self._media_info[key] = probe_media(audio_path)
+        return self._media_info[key]
+
+    def _audio_duration(self, audio_path: str) -> float:
+        """Duration from already-decoded PCM, falling back to the media probe"""
+        decoded = self._decoded_audio.get(self._path_key(audio_path))
+        if decoded is not None:
+            return decoded.duration
+        return self.media_info(audio_path).duration
+
+    def _can_copy_audio(self, audio_path: str, output_path: str) -> bool:
+        """Whether the source audio can go into `output_path` without re-encoding"""
+        try:
+            return self.media_info(audio_path).can_copy_audio_to(output_path)
+        except (OSError, RuntimeError):
+            return False
+
+    def job_audio(self, audio_path: str, output_path: str) -> Tuple[str, bool]:
+        """
+        Audio track to mux into `output_path` and whether it can be stream-copied:
+        the source itself when compatible, else a single encode per job and codec
+        that every output of the job shares
+        """
+        if self._can_copy_audio(audio_path, output_path):
+            return audio_path, True
+        codec = audio_codec_for(output_path)
+        if codec is None or shutil.which('ffmpeg') is None:
+            return audio_path, False
+
+        key = (self._path_key(audio_path), codec)
+        if key not in self._encoded_audio:
+            # Under a checkpoint the encode survives an interrupted render too
+            work_dir = self.checkpoint.dir("audio") if self.checkpoint else self.temp_dir
+            print(f"🔊 Encoding audio to {codec} (once per job)...")
+            encoded = encode_audio(
+                audio_path, work_dir / f"audio_{content_hash(audio_path)[:16]}_{codec}.mka", codec
+            )
+            self._encoded_audio[key] = str(encoded)
+        return self._encoded_audio[key], True
 
-    def analyze_audio(self, audio_path: str) -> List[Dict]:
+    def analyze_audio(self, audio_path: str, target_segments: Optional[int] = None) -> List[Dict]:
         """
         Analyze audio to detect segments, pauses, and energy levels
-        Returns list of segments with timestamps for visual switching
+        Returns list of segments with timestamps for visual switching;
+        `target_segments` (e.g. the slide count) fixes how many are returned
         """
-        if not LIBROSA_AVAILABLE:
-            print("📊 Librosa not available. Using equal duration segments.")
+        target_segments = target_segments or self.config.target_segment_count
+
+        if not can_decode():
+            print("📊 Audio decoding not available. Using equal duration segments.")
             return self._equal_segments(audio_path)
 
-        print("🔍 Analyzing audio structure...")
-        y, sr = librosa.load(audio_path, sr=None)
-        duration = librosa.get_duration(y=y, sr=sr)
+        cache_params = self._analysis_params(target_segments)
+        segments = self._cache_get(audio_path, cache_params)
+        if segments is not None:
+            print(f"⚡ Using cached analysis ({len(segments)} segments)")
+            self.segments = segments
+            return segments
+
+        if self.config.streaming_analysis:
+            # Streaming cannot look ahead, so target_segments is not applied here
+            print("🔍 Analyzing audio structure (streaming)...")
+            segments = list(self.iter_segments(audio_path))
+        else:
+            print("🔍 Analyzing audio structure...")
+            audio = self.load_audio(audio_path)
+
+            # Detect segment boundaries on pauses in the RMS envelope
+            energy, frame_seconds = self.audio_energy(audio_path)
+            segments = detect_segments(
+                energy,
+                frame_seconds,
+                audio.duration,
+                threshold_ratio=self.config.silence_threshold_ratio,
+                min_pause=self.config.min_pause_duration,
+                min_segment=self.config.min_segment_duration,
+                max_segment=self.config.max_segment_duration,
+                target_segments=target_segments
+            )
 
-        # Detect speech segments using energy thresholds
-        hop_length = 512
-        frame_length = 2048
-        energy = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length)[0]
+        print(f"✅ Detected {len(segments)} segments")
+        self._cache_put(audio_path, cache_params, segments)
+        self.segments = segments
+        return segments
 
-        # Find segments (simplified - detects changes in energy)
-        threshold = np.mean(energy) * 0.5
-        segments = []
-        start_time = 0
+    def audio_energy(self, audio_path: str) -> Tuple[object, float]:
+        """
+        RMS envelope of the audio and its frame length in seconds, computed
+        once per job for segmentation and highlight scoring
+        """
+        key = self._path_key(audio_path)
+        if key not in self._energy:
+            if self.config.streaming_analysis:
+                energy, sample_rate = stream_frame_rms(
+                    audio_path, self.config.analysis_block_seconds
+                )
+            else:
+                audio = self.load_audio(audio_path)
+                energy, sample_rate = frame_rms(audio.samples, HOP_LENGTH), audio.sample_rate
+            self._energy[key] = (energy, HOP_LENGTH / sample_rate)
+        return self._energy[key]
+
+    def extract_highlights(
+        self,
+        audio_path: str,
+        captions: List[Dict],
+        count: Optional[int] = None
+    ) -> List[Highlight]:
+        """The `count` (default shorts_count) best non-overlapping spans for Shorts"""
+        if not can_decode():
+            raise RuntimeError("Audio decoding (FFmpeg or librosa + NumPy) required for highlights")
+        energy, frame_seconds = self.audio_energy(audio_path)
+        return find_highlights(
+            energy,
+            frame_seconds,
+            self._audio_duration(audio_path),
+            captions,
+            count or self.config.shorts_count,
+            self.config.shorts_min_seconds,
+            self.config.shorts_max_seconds
+        )
 
-        # Create segments every 5-10 seconds or on energy changes
-        segment_duration = min(8, duration / 10)  # Adaptive segment length
+    def _analysis_params(self, target_segments: Optional[int]) -> Dict:
+        """Everything that changes the output of analyze_audio"""
+        params = {
+            'stage': 'segments',
+            'streaming': self.config.streaming_analysis,
+            'threshold_ratio': self.config.silence_threshold_ratio,
+            'min_pause': self.config.min_pause_duration,
+            'min_segment': self.config.min_segment_duration,
+            'max_segment': self.config.max_segment_duration
+        }
+        if not self.config.streaming_analysis:
+            params['target_segments'] = target_segments
+        return params
+
+    def _caption_params(self) -> Dict:
+        """Everything that changes the Whisper captions"""
+        params = {
+            'stage': 'captions',
+            'model': self.config.whisper_model,
+            'parallel': self.config.parallel_transcription
+        }
+        if self.config.parallel_transcription:
+            params.update(
+                chunk_seconds=self.config.transcription_chunk_seconds,
+                chunk_overlap=self.config.transcription_chunk_overlap,
+                threshold_ratio=self.config.silence_threshold_ratio,
+                min_pause=self.config.min_pause_duration
+            )
+        return params
 
-        current_time = 0
-        while current_time < duration:
-            end_time = min(current_time + segment_duration, duration)
-            segments.append({
-                'start': current_time,
-                'end': end_time,
-                'duration': end_time - current_time,
-                'type': 'content'
-            })
-            current_time = end_time
+    def _cache_get(self, audio_path: str, params: Dict):
+        if self.cache is None:
+            return None
+        return self.cache.get(audio_path, params)
 
-        print(f"✅ Detected {len(segments)} segments")
-        return segments
+    def _cache_put(self, audio_path: str, params: Dict, value):
+        if self.cache is not None:
+            self.cache.put(audio_path, params, value)
+
+    def iter_segments(self, audio_path: str) -> Iterator[Dict]:
+        """
+        Streaming segmentation: yields segments as they are detected while
+        reading fixed-size blocks, so peak memory is constant in input length
+        """
+        return stream_segments(
+            audio_path,
+            block_seconds=self.config.analysis_block_seconds,
+            threshold_ratio=self.config.silence_threshold_ratio,
+            min_pause=self.config.min_pause_duration,
+            min_segment=self.config.min_segment_duration,
+            max_segment=self.config.max_segment_duration
+        )
 
     def _equal_segments(self, audio_path: str) -> List[Dict]:
         """Fallback: create equal duration segments"""
-        # Get duration using ffprobe
-        cmd = [
-            'ffprobe', '-v', 'error', '-show_entries', 
-            'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1',
-            audio_path
-        ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            duration = float(result.stdout.strip())
+            duration = self._audio_duration(audio_path)
         except:
             duration = 300  # Default 5 minutes
 
@@ -135,34 +384,98 @@ class NotebookLMVideoAgent:
             current = end
         return segments
 
+    def _list_slides(self, slides_dir: str) -> List[Path]:
+        """Slide images in a directory (filename order), or the pages of a deck file"""
+        return list(self._slide_source(slides_dir))
+
+    def _slide_source(self, visual_assets: str) -> Iterable[Path]:
+        """
+        Like _list_slides, but deck pages are yielded as they are rasterized
+        instead of after the whole deck is done
+        """
+        if is_deck(visual_assets):
+            return self._open_deck(visual_assets)
+        return sorted([
+            f for f in Path(visual_assets).iterdir()
+            if f.suffix.lower() in IMAGE_EXTENSIONS
+        ])
+
+    def _open_deck(self, deck_path: str) -> DeckPages:
+        """Start rasterizing a .pptx/.pdf once per job; later calls share it"""
+        key = self._path_key(deck_path)
+        if key not in self._decks:
+            self._decks[key] = self.deck_rasterizer.open(deck_path, self.config.output_resolution)
+        return self._decks[key]
+
+    def _prepare_slides(self, slides: Iterable[Path]) -> List[Path]:
+        """Slides resized and letterboxed to output_resolution (cached)"""
+        if not PIL_AVAILABLE:
+            return list(slides)
+        print(f"🖼️  Preparing {len(slides)} slides at "
+              f"{self.config.output_resolution[0]}x{self.config.output_resolution[1]}...")
+        return self.slide_cache.prepare(slides, self.config.output_resolution)
+
+    def _slide_durations(
+        self,
+        slide_count: int,
+        audio_duration: float,
+        segments: Optional[List[Dict]] = None
+    ) -> List[float]:
+        """
+        Per-slide durations: one segment per slide when a fixed segment count
+        matches the deck, else an even split whose changes are snapped to
+        segment boundaries (pauses) when align_slides_to_pauses is on
+        """
+        if segments and len(segments) == slide_count:
+            durations = [s['end'] - s['start'] for s in segments]
+            durations[-1] += audio_duration - segments[-1]['end']
+            return durations
+        if segments and self.config.align_slides_to_pauses and NUMPY_AVAILABLE:
+            return align_slides(segments, audio_duration, slide_count)
+        return [audio_duration / slide_count] * slide_count
+
     def generate_captions(self, audio_path: str) -> List[Dict]:
         """
         Generate captions using Whisper (if available) or create placeholder
         """
-        # Check for Whisper
-        whisper_available = shutil.which('whisper') is not None
+        cache_params = self._caption_params()
+        captions = self._cache_get(audio_path, cache_params)
+        if captions is not None:
+            print(f"⚡ Using cached captions ({len(captions)} segments)")
+            return captions
 
-        if whisper_available:
+        if whisper_available():
             print("🎯 Generating captions with Whisper...")
             try:
-                import whisper
-                model = whisper.load_model("base")
-                result = model.transcribe(audio_path, word_timestamps=True)
-
-                captions = []
-                for segment in result["segments"]:
-                    captions.append({
-                        'text': segment["text"].strip(),
-                        'start': segment["start"],
-                        'end': segment["end"]
-                    })
+                # Whisper takes 16 kHz mono float32 directly, so reuse the job's PCM
+                # (in streaming mode Whisper decodes the file itself instead)
+                reuse_pcm = can_decode() and not self.config.streaming_analysis
+                audio = self.load_audio(audio_path) if reuse_pcm else None
+                if audio is not None and audio.sample_rate != WHISPER_SAMPLE_RATE:
+                    audio = None
+
+                if self.config.parallel_transcription and audio is not None:
+                    captions = self._transcribe_parallel(audio)
+                elif self.transcriber is not None:
+                    # Worker processes map the PCM file rather than receiving a copy
+                    source = audio.pcm_file if audio is not None else audio_path
+                    result = self.transcriber.transcribe(source, word_timestamps=True)
+                    captions = result_to_captions(result)
+                else:
+                    source = audio.samples if audio is not None else audio_path
+                    result = WhisperModelRegistry.transcribe(
+                        self.config.whisper_model, source, word_timestamps=True
+                    )
+                    captions = result_to_captions(result)
+
+                self._cache_put(audio_path, cache_params, captions)
                 return captions
             except Exception as e:
                 print(f"⚠️  Whisper failed: {e}")
 
         # Fallback: segment-based placeholder captions
         print("📝 Creating segment-based captions...")
-        segments = self.analyze_audio(audio_path)
+        segments = self.segments or self.analyze_audio(audio_path)
         return [
             {
                 'text': f'Segment {i+1}',
@@ -171,48 +484,85 @@ class NotebookLMVideoAgent:
             } for i, s in enumerate(segments)
         ]
 
+    def _transcribe_parallel(self, audio: DecodedAudio) -> List[Dict]:
+        """
+        Split the job's PCM at pauses into overlapping chunks, transcribe them
+        concurrently and stitch the captions back onto one timeline
+        """
+        boundaries = plan_chunks(
+            audio.samples,
+            audio.sample_rate,
+            chunk_seconds=self.config.transcription_chunk_seconds,
+            threshold_ratio=self.config.silence_threshold_ratio,
+            min_pause=self.config.min_pause_duration
+        )
+        chunk_count = len(boundaries) - 1
+
+        pool = self.transcriber
+        owns_pool = pool is None
+        if owns_pool:
+            cores = default_worker_count()
+            workers = min(chunk_count, self.config.transcription_workers or cores)
+            pool = TranscriptionWorkerPool(
+                self.config.whisper_model, workers,
+                threads_per_worker=max(1, cores // workers)
+            )
+        print(f"🧩 Transcribing {chunk_count} chunks on {pool.workers} workers...")
+
+        try:
+            return transcribe_chunked(
+                pool, audio.pcm_file, boundaries,
+                overlap=self.config.transcription_chunk_overlap,
+                word_timestamps=True
+            )
+        finally:
+            if owns_pool:
+                pool.close()
+
     def create_slide_video(
         self, 
         audio_path: str, 
         slides_dir: str,
         output_path: str,
-        captions: Optional[List[Dict]] = None
+        captions: Optional[List[Dict]] = None,
+        segments: Optional[List[Dict]] = None
     ) -> str:
         """
         Create video from slides/images + audio
+        Slides change on the boundaries of `segments` when there is one per slide
         """
-        if not MOVIEPY_AVAILABLE:
-            return self._create_video_ffmpeg(audio_path, slides_dir, output_path)
+        if self.config.output_targets:
+            self.create_multi_output_video(
+                audio_path, slides_dir, output_path, captions, segments
+            )
+            return output_path
+        if self.config.renderer in ("ffmpeg", "static") or not MOVIEPY_AVAILABLE:
+            return self._create_video_ffmpeg(
+                audio_path, slides_dir, output_path, segments, captions
+            )
 
         print("🎬 Creating slide-based video with MoviePy...")
+        from moviepy.editor import ImageClip, concatenate_videoclips
+        from moviepy.video.fx.all import fadein, fadeout
 
-        # Load audio
-        audio = AudioFileClip(audio_path)
-        audio_duration = audio.duration
-
-        # Get slides
-        slides_dir = Path(slides_dir)
-        image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff'}
-        slides = sorted([
-            f for f in slides_dir.iterdir() 
-            if f.suffix.lower() in image_extensions
-        ])
-
-        if not slides:
-            raise ValueError(f"No images found in {slides_dir}")
+        # Load audio (the duration comes from the job's probe or decoded PCM)
+        audio = self._audio_clip(audio_path)
+        audio_duration = self._audio_duration(audio_path)
 
-        print(f"🖼️  Found {len(slides)} slides")
+        # Get slides (deck pages stream in while earlier ones are prepared)
+        slides = self.prepare_job_slides(slides_dir)
 
         # Calculate duration per slide
-        slide_duration = audio_duration / len(slides)
+        slide_durations = self._slide_durations(len(slides), audio_duration, segments)
 
         # Create video clips for each slide
         video_clips = []
         for i, slide_path in enumerate(slides):
             # Create image clip
             img_clip = ImageClip(str(slide_path))
-            img_clip = img_clip.set_duration(slide_duration)
-            img_clip = img_clip.resize(self.config.output_resolution)
+            img_clip = img_clip.set_duration(slide_durations[i])
+            if tuple(img_clip.size) != tuple(self.config.output_resolution):
+                img_clip = img_clip.resize(self.config.output_resolution)
 
             # Add fade transitions
             if i > 0:
@@ -227,15 +577,19 @@ class NotebookLMVideoAgent:
         final_video = final_video.set_audio(audio)
 
         # Add captions if enabled and provided
+        caption_params = []
         if self.config.caption_enabled and captions:
-            final_video = self._add_captions_to_video(final_video, captions)
+            final_video, caption_params = self._add_captions_to_video(final_video, captions)
 
         # Write output
         print(f"💾 Rendering video to {output_path}...")
-        final_video.write_videofile(
+        slide_bounds = [sum(slide_durations[:i + 1]) for i in range(len(slide_durations) - 1)]
+        self._write_video(
+            final_video,
             output_path,
-            fps=self.config.fps,
-            codec='libx264',
+            audio_path=audio_path,
+            boundaries=slide_bounds,
+            ffmpeg_params=caption_params,
             audio_codec='aac',
             temp_audiofile=str(self.temp_dir / "temp_audio.m4a"),
             remove_temp=True
@@ -244,83 +598,198 @@ class NotebookLMVideoAgent:
         return output_path
 
     def _add_captions_to_video(self, video_clip, captions: List[Dict]):
-        """Add caption overlays to video"""
-        caption_clips = []
-
-        for cap in captions:
-            txt_clip = TextClip(
-                cap['text'],
-                fontsize=48,
-                color='white',
-                stroke_color='black',
-                stroke_width=2,
-                font='Arial-Bold',
-                method='caption',
-                size=(video_clip.w * 0.8, None),
-                align='center'
-            )
-            txt_clip = txt_clip.set_start(cap['start']).set_duration(
-                cap['end'] - cap['start']
-            )
-            txt_clip = txt_clip.set_position(('center', 'bottom')).margin(bottom=50, opacity=0)
-            caption_clips.append(txt_clip)
-
-        return CompositeVideoClip([video_clip] + caption_clips)
+        """
+        Add captions as one ASS track or one time-indexed overlay
+        Returns (clip, ffmpeg_params for write_videofile)
+        """
+        return apply_captions(
+            video_clip,
+            captions,
+            get_caption_style(self.config.caption_style),
+            self.config.caption_renderer,
+            self.temp_dir / "captions.ass"
+        )
 
     def _create_video_ffmpeg(
         self, 
         audio_path: str, 
         slides_dir: str, 
-        output_path: str
+        output_path: str,
+        segments: Optional[List[Dict]] = None,
+        captions: Optional[List[Dict]] = None
     ) -> str:
         """
-        Fallback: Create video using FFmpeg directly (no MoviePy)
-        Faster but fewer features
+        Create video using FFmpeg directly (no MoviePy)
+        One filter_complex pass: scale/pad, crossfades and burned-in captions;
+        the 'static' renderer encodes each slide once and stream-copies it
         """
         print("🎬 Creating video with FFmpeg...")
 
-        slides_dir = Path(slides_dir)
-        slides = sorted([
-            f for f in slides_dir.iterdir() 
-            if f.suffix.lower() in {'.jpg', '.jpeg', '.png', '.bmp'}
-        ])
-
-        # Create concat file for FFmpeg
-        concat_file = self.temp_dir / "concat.txt"
+        slides = self.prepare_job_slides(slides_dir)
 
         # Get audio duration
-        cmd = ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
-               '-of', 'default=noprint_wrappers=1:nokey=1', audio_path]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        duration = float(result.stdout.strip())
-        slide_duration = duration / len(slides)
-
-        with open(concat_file, 'w') as f:
-            for slide in slides:
-                f.write(f"file '{slide.absolute()}'\n")
-                f.write(f"duration {slide_duration}\n")
-            # Last frame needs to be duplicated for duration
-            f.write(f"file '{slides[-1].absolute()}'\n")
-
-        # Build FFmpeg command
-        cmd = [
-            'ffmpeg', '-y',
-            '-f', 'concat', '-safe', '0',
-            '-i', str(concat_file),
-            '-i', audio_path,
-            '-vsync', 'vfr',
-            '-pix_fmt', 'yuv420p',
-            '-c:v', 'libx264', '-preset', 'medium', '-crf', '23',
-            '-c:a', 'aac', '-b:a', '192k',
-            '-shortest',
-            '-r', str(self.config.fps),
-            output_path
-        ]
+        duration = self._audio_duration(audio_path)
+        slide_durations = self._slide_durations(len(slides), duration, segments)
 
-        print(f"🚀 Running: {' '.join(cmd)}")
-        subprocess.run(cmd, check=True)
+        render_dir = self.temp_dir / "ffmpeg"
+        render_dir.mkdir(parents=True, exist_ok=True)
 
-        return output_path
+        subtitles_file = None
+        if self.config.caption_enabled and captions:
+            subtitles_file = write_ass(
+                captions,
+                render_dir / "captions.ass",
+                self.config.output_resolution,
+                get_caption_style(self.config.caption_style)
+            )
+
+        render = render_slides
+        if self.config.renderer == "static":
+            if subtitles_file is not None:
+                print("ℹ️  Static renderer: captions are added as a soft subtitle track, "
+                      "not burned in")
+            render = render_static_slides
+
+        audio_track, copy_audio = self.job_audio(audio_path, output_path)
+        return render(
+            slides,
+            slide_durations,
+            audio_track,
+            output_path,
+            render_dir,
+            resolution=self.config.output_resolution,
+            fps=self.config.fps,
+            transition=self.config.transition_duration,
+            subtitles_file=subtitles_file,
+            copy_audio=copy_audio,
+            preset=self.config.video_preset,
+            crf=self.config.video_crf,
+            threads=self.config.encode_threads
+        )
+
+    def output_targets(self) -> List[OutputTarget]:
+        """The main video's target followed by the configured extra renditions"""
+        main = OutputTarget('main', tuple(self.config.output_resolution))
+        targets = [main]
+        for name in self.config.output_targets:
+            target = get_output_target(name)
+            if target.layout == "fit" and target.resolution == main.resolution:
+                # Same frame as the main video
+                continue
+            targets.append(target)
+        return targets
+
+    def output_paths(self, output_path: str) -> Dict[str, str]:
+        """
+        Every rendition of a job: the main video at `output_path` plus
+        `<stem>_<target><suffix>` for each extra output target
+        """
+        path = Path(output_path)
+        return {
+            target.name: output_path if target.name == 'main'
+            else str(path.with_name(f"{path.stem}_{target.name}{path.suffix}"))
+            for target in self.output_targets()
+        }
+
+    def create_multi_output_video(
+        self,
+        audio_path: str,
+        slides_dir: str,
+        output_path: str,
+        captions: Optional[List[Dict]] = None,
+        segments: Optional[List[Dict]] = None
+    ) -> Dict[str, str]:
+        """
+        Main slide video plus the configured output targets from one FFmpeg
+        run: slides and audio are decoded and composed once, then each
+        rendition is scaled/cropped and captioned in its own layout
+        """
+        print("🎬 Creating all renditions with FFmpeg in one pass...")
+
+        slides = self.prepare_job_slides(slides_dir)
+        duration = self._audio_duration(audio_path)
+        slide_durations = self._slide_durations(len(slides), duration, segments)
+
+        targets = self.output_targets()
+        main = targets[0]
+
+        # Compose at the largest landscape size; the others scale down from it
+        base = max(
+            (t.resolution for t in targets if t.layout == "fit"),
+            key=lambda size: size[0] * size[1]
+        )
+
+        render_dir = self.temp_dir / "multi_output"
+        render_dir.mkdir(parents=True, exist_ok=True)
+        paths = self.output_paths(output_path)
+        outputs = []
+        for target in targets:
+            subtitles_file = None
+            if self.config.caption_enabled and captions:
+                if target.caption_style:
+                    style = get_caption_style(target.caption_style)
+                else:
+                    style = scale_caption_style(
+                        get_caption_style(self.config.caption_style),
+                        target.resolution[1] / main.resolution[1]
+                    )
+                subtitles_file = write_ass(
+                    captions, render_dir / f"captions_{target.name}.ass",
+                    target.resolution, style
+                )
+            outputs.append((target, paths[target.name], subtitles_file))
+
+        # Encoded once for the main output; the other .mp4s copy the same track
+        audio_track, _ = self.job_audio(audio_path, output_path)
+        return render_multi_output(
+            slides,
+            slide_durations,
+            audio_track,
+            outputs,
+            render_dir,
+            base,
+            fps=self.config.fps,
+            transition=self.config.transition_duration,
+            preset=self.config.video_preset,
+            crf=self.config.video_crf,
+            threads=self.config.encode_threads
+        )
+
+    def create_highlight_shorts(
+        self,
+        audio_path: str,
+        captions: List[Dict],
+        output_path: str
+    ) -> List[str]:
+        """
+        Cut the episode's best spans into Shorts in `<stem>_highlights/`
+        next to `output_path`; only the highlighted seconds are rendered
+        """
+        highlights = self.extract_highlights(audio_path, captions)
+        if not highlights:
+            return []
+        print("🌟 Highlights: " + ", ".join(
+            f"{h.start:.0f}-{h.end:.0f}s ({h.score:.2f})" for h in highlights
+        ))
+
+        from advanced_podcast_creator import AdvancedVideoAgent
+        if self.config.cache_enabled:
+            footage_dir = Path(self.config.cache_dir) / "footage" if self.config.cache_dir else None
+        else:
+            footage_dir = self.temp_dir / "footage"
+        shorts_agent = AdvancedVideoAgent(
+            caption_renderer=self.config.caption_renderer,
+            render_workers=self.config.render_workers,
+            footage_cache_dir=str(footage_dir) if footage_dir else None
+        )
+        path = Path(output_path)
+        try:
+            return shorts_agent.create_highlight_shorts(
+                audio_path, captions, highlights,
+                str(path.with_name(f"{path.stem}_highlights"))
+            )
+        finally:
+            shorts_agent.cleanup()
 
     def create_b_roll_video(
         self,
@@ -339,12 +808,13 @@ class NotebookLMVideoAgent:
 
         if not MOVIEPY_AVAILABLE:
             raise RuntimeError("MoviePy required for B-roll generation")
+        from moviepy.editor import ColorClip, CompositeVideoClip, TextClip
 
-        audio = AudioFileClip(audio_path)
+        audio = self._audio_clip(audio_path)
 
         # Create waveform visualization as placeholder
         # In production, this would fetch relevant stock footage
-        duration = audio.duration
+        duration = self._audio_duration(audio_path)
 
         # Create color background with audio waveform overlay
         bg = ColorClip(size=self.config.output_resolution, color=(20, 20, 30))
@@ -363,15 +833,53 @@ class NotebookLMVideoAgent:
         final = CompositeVideoClip([bg, title])
         final = final.set_audio(audio)
 
-        final.write_videofile(
+        self._write_video(final, output_path, audio_path=audio_path, audio_codec='aac')
+
+        return output_path
+
+    def _write_video(
+        self,
+        clip,
+        output_path: str,
+        audio_path: Optional[str] = None,
+        boundaries: Optional[List[float]] = None,
+        ffmpeg_params: Optional[List[str]] = None,
+        **write_kwargs
+    ) -> str:
+        """
+        Encode a MoviePy timeline, in parallel chunks cut at `boundaries`
+        when render_workers allows it; `write_kwargs` go to write_videofile.
+        Under a checkpoint, chunked renders keep their chunks in the job dir
+        so a rerun resumes; a single-worker render is one write_videofile
+        call (resumed per stage) unless resume_renders asks for chunks.
+        """
+        copy_audio = None
+        if audio_path is not None:
+            audio_path, copy_audio = self.job_audio(audio_path, output_path)
+        chunked = self.config.render_workers != 1 or self.config.resume_renders
+        if self.checkpoint is not None and chunked:
+            work_dir = self.checkpoint.dir("chunks")
+            max_chunk_seconds = self.config.checkpoint_chunk_seconds
+        else:
+            work_dir = self.temp_dir / "chunks"
+            max_chunk_seconds = None
+        return write_video(
+            clip,
             output_path,
+            work_dir,
+            workers=self.config.render_workers,
             fps=self.config.fps,
-            codec='libx264',
-            audio_codec='aac'
+            boundaries=boundaries,
+            audio_path=audio_path,
+            preset=self.config.video_preset,
+            crf=self.config.video_crf,
+            ffmpeg_params=ffmpeg_params,
+            threads=self.config.encode_threads,
+            max_chunk_seconds=max_chunk_seconds,
+            copy_audio=copy_audio,
+            **write_kwargs
         )
 
-        return output_path
-
     def process_notebooklm_export(
         self,
         audio_path: str,
@@ -384,7 +892,7 @@ class NotebookLMVideoAgent:
 
         Args:
             audio_path: Path to NotebookLM audio file
-            visual_assets_dir: Directory containing slides/images
+            visual_assets_dir: Directory containing slides/images, or a .pptx/.pdf deck
             output_path: Where to save final video
             style: 'slides', 'broll', or 'captions_only'
         """
@@ -400,31 +908,184 @@ class NotebookLMVideoAgent:
             'captions': []
         }
 
-        # Step 1: Analyze audio
-        segments = self.analyze_audio(audio_path)
-        results['segments'] = segments
+        self.begin_job(audio_path, visual_assets_dir, output_path, style)
+        try:
+            # Step 1: Analyze audio (one segment per slide so changes land on pauses)
+            segments = self.analyze_job_audio(audio_path, visual_assets_dir, style)
+            results['segments'] = segments
+
+            # Step 2: Generate captions
+            captions = self.caption_job_audio(audio_path)
+            results['captions'] = captions
+
+            # Step 3: Generate video based on style
+            self.render_job(audio_path, visual_assets_dir, output_path, style, captions, segments)
+        finally:
+            self.release_job(audio_path, visual_assets_dir)
+
+        if style == "slides" and self.config.output_targets:
+            results['outputs'] = self.output_paths(output_path)
+        if self.shorts:
+            results['shorts'] = self.shorts
+
+        print(f"\n✅ Video created successfully: {output_path}")
+        print(f"📊 Duration: {segments[-1]['end']:.1f}s")
+        print(f"📝 Captions: {len(captions)} segments")
+
+        return results
+
+    # Job stages, shared by process_notebooklm_export and the pipeline scheduler.
+    # With a checkpoint, each stage saves its artifact and is skipped on rerun.
+
+    def begin_job(
+        self,
+        audio_path: str,
+        visual_assets_dir: str,
+        output_path: str,
+        style: str
+    ) -> Optional[JobCheckpoint]:
+        """Open the job's checkpoint, resuming whatever an earlier run completed"""
+        self.checkpoint = None
+        if not self.config.resume_jobs:
+            return None
+        if self.config.checkpoint_dir:
+            root = self.config.checkpoint_dir
+        elif self.config.cache_enabled:
+            root = Path(self.config.cache_dir) / "jobs" if self.config.cache_dir else None
+        else:
+            # Nowhere persistent to keep artifacts
+            return None
+
+        identity = {
+            'audio': content_hash(audio_path),
+            'visuals': self._visuals_signature(visual_assets_dir, style),
+            'output': self._path_key(output_path),
+            'style': style,
+            'settings': {
+                k: v for k, v in asdict(self.config).items() if k not in _NON_OUTPUT_SETTINGS
+            }
+        }
+        self.checkpoint = JobCheckpoint(root, identity)
+        completed = [s for s in ('segments', 'captions', 'slides') if self.checkpoint.done(s)]
+        if completed:
+            print(f"♻️  Resuming job: {', '.join(completed)} already done")
+        if not self.config.cache_enabled:
+            # Fitted slides would otherwise be lost with the temp dir
+            self.slide_cache = SlideCache(
+                self.checkpoint.path / "slides", self.config.slide_workers
+            )
+        return self.checkpoint
+
+    def _visuals_signature(self, visual_assets_dir: str, style: str):
+        if style != "slides":
+            return None
+        if is_deck(visual_assets_dir):
+            return content_hash(visual_assets_dir)
+        return [
+            [f.name, f.stat().st_size, f.stat().st_mtime_ns]
+            for f in self._slide_source(visual_assets_dir)
+        ]
+
+    def _checkpointed(self, stage: str, compute):
+        """Stage result from the checkpoint, else computed and checkpointed"""
+        if self.checkpoint is not None and self.checkpoint.done(stage):
+            return self.checkpoint.load(stage)
+        value = compute()
+        if self.checkpoint is not None:
+            self.checkpoint.save(stage, value)
+        return value
+
+    def analyze_job_audio(self, audio_path: str, visual_assets_dir: str, style: str) -> List[Dict]:
+        """Segment the job's audio (slide changes are snapped to it when rendering)"""
+        def analyze():
+            if style == "slides":
+                # Opening a deck here lets its pages rasterize during analysis
+                self._slide_source(visual_assets_dir)
+            return self.analyze_audio(audio_path)
 
-        # Step 2: Generate captions
-        captions = self.generate_captions(audio_path)
-        results['captions'] = captions
+        self.segments = []
+        self.segments = self._checkpointed('segments', analyze)
+        return self.segments
+
+    def caption_job_audio(self, audio_path: str) -> List[Dict]:
+        """Captions for the job's audio"""
+        return self._checkpointed('captions', lambda: self.generate_captions(audio_path))
+
+    def prepare_job_slides(self, visual_assets_dir: str) -> List[Path]:
+        """Fit the job's slides to the output size ahead of rendering (cached)"""
+        key = self._path_key(visual_assets_dir)
+        if key in self._prepared_slides:
+            return self._prepared_slides[key]
+
+        slides = None
+        if self.checkpoint is not None and self.checkpoint.done('slides'):
+            slides = [Path(p) for p in self.checkpoint.load('slides')]
+            if not all(p.exists() for p in slides):
+                slides = None
+        if slides is None:
+            source = self._slide_source(visual_assets_dir)
+            if not len(source):
+                raise ValueError(f"No images found in {visual_assets_dir}")
+            print(f"🖼️  Found {len(source)} slides")
+            slides = self._prepare_slides(source)
+            if self.checkpoint is not None:
+                self.checkpoint.save('slides', [str(p) for p in slides])
+
+        self._prepared_slides[key] = slides
+        return slides
+
+    def render_job(
+        self,
+        audio_path: str,
+        visual_assets_dir: str,
+        output_path: str,
+        style: str,
+        captions: List[Dict],
+        segments: List[Dict]
+    ) -> str:
+        """Render the final video for `style`"""
+        self.shorts = []
+        outputs = [output_path]
+        if style == "slides":
+            outputs = list(self.output_paths(output_path).values())
+        if self.checkpoint is not None and self.checkpoint.rendered(outputs):
+            self.shorts = self.checkpoint.load('render').get('shorts', [])
+            print(f"⏭️  Already rendered: {output_path}")
+            return output_path
 
-        # Step 3: Generate video based on style
         if style == "slides":
-            self.create_slide_video(audio_path, visual_assets_dir, output_path, captions)
+            self.create_slide_video(
+                audio_path, visual_assets_dir, output_path, captions, segments
+            )
         elif style == "broll":
             # Would need search terms from content analysis
             self.create_b_roll_video(audio_path, [], output_path)
         else:
             raise ValueError(f"Unknown style: {style}")
 
-        print(f"\n✅ Video created successfully: {output_path}")
-        print(f"📊 Duration: {segments[-1]['end']:.1f}s")
-        print(f"📝 Captions: {len(captions)} segments")
+        if self.config.shorts_count:
+            self.shorts = self.create_highlight_shorts(audio_path, captions, output_path)
 
-        return results
+        if self.checkpoint is not None:
+            self.checkpoint.finish(outputs + self.shorts, shorts=self.shorts)
+        return output_path
+
+    def release_job(self, audio_path: str, visual_assets_dir: str):
+        """Decoded PCM and deck handles are per job; free them before the next one"""
+        self.release_audio(audio_path)
+        self._energy.pop(self._path_key(audio_path), None)
+        self._decks.pop(self._path_key(visual_assets_dir), None)
+        self._prepared_slides.pop(self._path_key(visual_assets_dir), None)
+        self._media_info.pop(self._path_key(audio_path), None)
+        for key in [k for k in self._encoded_audio if k[0] == self._path_key(audio_path)]:
+            Path(self._encoded_audio.pop(key)).unlink(missing_ok=True)
+        self.checkpoint = None
 
     def cleanup(self):
         """Remove temporary files"""
+        for decoded in self._decoded_audio.values():
+            decoded.close()
+        self._decoded_audio.clear()
         if self.temp_dir.exists():
             shutil.rmtree(self.temp_dir)
             print(f"🧹 Cleaned up temp directory")
@@ -435,16 +1096,55 @@ def main():
     """Command-line interface for the agent"""
     import argparse
 
+    # `batch manifest.json` runs many jobs on a worker pool
+    if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+        from batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+    # `serve` keeps libraries and models warm behind a local HTTP API
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from server import main as serve_main
+        sys.exit(serve_main(sys.argv[2:]))
+
     parser = argparse.ArgumentParser(
-        description='NotebookLM to YouTube Video AI Agent'
+        description='NotebookLM to YouTube Video AI Agent',
+        epilog="Batch mode: %(prog)s batch manifest.json --workers N; "
+               "job server: %(prog)s serve --port 8765"
     )
     parser.add_argument('audio', help='Path to audio file')
-    parser.add_argument('visuals', help='Directory with slides/images')
+    parser.add_argument('visuals', help='Directory with slides/images, or a .pptx/.pdf deck')
     parser.add_argument('-o', '--output', default='output.mp4', help='Output video path')
     parser.add_argument('-s', '--style', default='slides', choices=['slides', 'broll'])
     parser.add_argument('--resolution', default='1920x1080', help='Video resolution')
     parser.add_argument('--fps', type=int, default=30, help='Frames per second')
     parser.add_argument('--no-captions', action='store_true', help='Disable captions')
+    parser.add_argument('--renderer', default='moviepy', choices=['moviepy', 'ffmpeg', 'static'],
+                        help='Rendering backend for slide videos; static adds captions as '
+                             'a soft subtitle track (styled only in .mkv) instead of burning them in')
+    parser.add_argument('--outputs', type=parse_output_targets, default=(),
+                        help='Extra renditions rendered in the same pass, e.g. "720p,shorts,audiogram"')
+    parser.add_argument('--shorts', type=int, default=0,
+                        help='Also cut the N best 15-60 s highlights into 9:16 Shorts')
+    parser.add_argument('--render-workers', type=int, default=1,
+                        help='Parallel MoviePy render chunks (0 = one per core; serial when other threads run)')
+    parser.add_argument('--caption-renderer', default='ass', choices=['ass', 'overlay'],
+                        help='How the MoviePy renderer draws captions')
+    parser.add_argument('--streaming-analysis', action='store_true',
+                        help='Bounded-memory audio analysis for very long recordings')
+    parser.add_argument('--whisper-model', default='base',
+                        help='Whisper model size used for captions')
+    parser.add_argument('--parallel-transcription', action='store_true',
+                        help='Transcribe audio chunks in parallel on all cores')
+    parser.add_argument('--transcription-workers', type=int, default=None,
+                        help='Worker processes for parallel transcription')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write cached analysis/captions')
+    parser.add_argument('--cache-dir', default=None, help='Result cache directory')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='Start over instead of resuming an interrupted job')
+    parser.add_argument('--checkpoint-dir', default=None,
+                        help='Job checkpoint directory (default: <cache dir>/jobs)')
+    parser.add_argument('--resume-renders', action='store_true',
+                        help='Render MoviePy videos in resumable chunks even with one worker')
 
     args = parser.parse_args()
 
@@ -455,7 +1155,21 @@ def main():
     config = VideoConfig(
         output_resolution=(width, height),
         fps=args.fps,
-        caption_enabled=not args.no_captions
+        caption_enabled=not args.no_captions,
+        renderer=args.renderer,
+        output_targets=args.outputs,
+        shorts_count=args.shorts,
+        caption_renderer=args.caption_renderer,
+        render_workers=args.render_workers,
+        streaming_analysis=args.streaming_analysis,
+        whisper_model=args.whisper_model,
+        parallel_transcription=args.parallel_transcription,
+        transcription_workers=args.transcription_workers,
+        cache_enabled=not args.no_cache,
+        cache_dir=args.cache_dir,
+        resume_jobs=not args.no_resume,
+        resume_renders=args.resume_renders,
+        checkpoint_dir=args.checkpoint_dir
     )
 
     # Run agent
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache for analysis and transcription results
+Entries are keyed by the audio's content hash plus a fingerprint of the
+parameters that produced them, so reruns on the same audio skip straight
+to rendering
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get('NOTEBOOKLM_VIDEO_CACHE',
+                   Path.home() / '.cache' / 'notebooklm-video-agent')
+)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Bump when the stored format of an entry changes
+CACHE_VERSION = 1
+
+_HASH_BLOCK = 4 * 1024 * 1024
+
+_hashes: Dict[Tuple[str, int, int], str] = {}
+
+
+def content_hash(path: str) -> str:
+    """SHA-256 of a file's contents, memoized per process on (path, size, mtime)"""
+    stat = os.stat(path)
+    key = (str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns)
+    digest = _hashes.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+        _hashes[key] = digest
+    return digest
+
+
+class ResultCache:
+    """
+    On-disk JSON cache laid out as <cache dir>/results/<audio hash>/<fingerprint>.json
+    The cache dir is shared with slides/, decks/, jobs/ and footage/, so
+    eviction and clearing only ever touch results/. Reads refresh an
+    entry's mtime; writes evict the least recently used entries once the
+    cache grows past `max_bytes`
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = (Path(root) if root else DEFAULT_CACHE_DIR) / 'results'
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def audio_hash(audio_path: str) -> str:
+        return content_hash(audio_path)
+
+    @staticmethod
+    def fingerprint(params: Dict) -> str:
+        """Stable hash of the parameters that determine a result"""
+        payload = json.dumps({'version': CACHE_VERSION, **params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    def _entry_path(self, audio_path: str, params: Dict) -> Path:
+        return self.root / self.audio_hash(audio_path) / f"{self.fingerprint(params)}.json"
+
+    def get(self, audio_path: str, params: Dict) -> Optional[object]:
+        """Cached value for this audio and parameter set, or None"""
+        path = self._entry_path(audio_path, params)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)['value']
+        except (OSError, ValueError, KeyError):
+            return None
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, audio_path: str, params: Dict, value: object):
+        """Store a JSON-serialisable value, then evict down to max_bytes"""
+        path = self._entry_path(audio_path, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'params': params, 'value': value}, f)
+        # Atomic rename so concurrent readers never see a partial entry
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        if not self.root.exists():
+            return entries
+        for path in self.root.glob('*/*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, max_bytes: Optional[int] = None):
+        """Delete least recently used entries until the cache fits `max_bytes`"""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= limit:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    continue
+                if not any(path.parent.iterdir()):
+                    path.parent.rmdir()
+
+    def invalidate(self, audio_path: Optional[str] = None):
+        """Drop every entry for one audio file, or every result (other caches are kept)"""
+        target = self.root / self.audio_hash(audio_path) if audio_path else self.root
+        if target.exists():
+            shutil.rmtree(target)
+
+
+def main():
+    """Inspect or clear the result cache"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='NotebookLM video agent result cache (slides, decks, jobs and '
+                    'footage in the same cache directory are left alone)'
+    )
+    parser.add_argument('command', choices=['info', 'clear'])
+    parser.add_argument('audio', nargs='*', help='Only clear entries for these audio files')
+    parser.add_argument('--cache-dir', default=None, help='Cache directory')
+
+    args = parser.parse_args()
+    cache = ResultCache(args.cache_dir)
+
+    if args.command == 'info':
+        entries = cache._entries()
+        print(f"📦 {cache.root}: {len(entries)} entries, "
+              f"{sum(size for _, size, _ in entries) / 1e6:.1f} MB")
+    elif args.audio:
+        for audio_path in args.audio:
+            cache.invalidate(audio_path)
+            print(f"🧹 Cleared cache for {audio_path}")
+    else:
+        cache.invalidate()
+        print(f"🧹 Cleared {cache.root}")
+
+
+if __name__ == "__main__":
+    main()
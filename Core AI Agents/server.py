@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Long-running job server with a local HTTP API
+Libraries and the Whisper model are loaded once per server instead of once
+per video. Jobs run through the pipeline stages on per-stage thread pools
+and report progress as server-sent events or through a poll endpoint.
+
+    POST /jobs               {"audio", "visuals", "output"[, "style"]} -> 202 {"id", ...}
+    GET  /jobs               all jobs
+    GET  /jobs/<id>          one job's status (poll)
+    GET  /jobs/<id>/events   text/event-stream of stage progress
+    GET  /health
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+from batch import BatchJob
+from pipeline import (
+    DEFAULT_STAGE_WORKERS, STAGES, finish_job, new_job_state, run_stage, transcription_pool
+)
+from podcast_video_creator import VideoConfig
+from transcription import TranscriptionWorkerPool, WhisperModelRegistry, whisper_available
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+@dataclass
+class ServerJob:
+    """A submitted job, its progress so far and its event subscribers"""
+    id: str
+    job: BatchJob
+    status: str = "queued"  # queued, running, ok, failed
+    stage: Optional[str] = None
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.time)
+    result: Optional[Dict] = None
+    events: List[Dict] = field(default_factory=list)
+    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("ok", "failed")
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            **asdict(self.job),
+            'status': self.status,
+            'stage': self.stage,
+            'error': self.error,
+            'submitted': self.submitted,
+            'result': self.result
+        }
+
+
+class JobServer:
+    """
+    Accepts jobs over HTTP and runs them on warm, shared resources
+    Each stage has its own thread pool, so one job's transcription overlaps
+    another's encoding; `max_active` bounds how many jobs hold decoded
+    audio at once. More than one captions worker gets a Whisper worker
+    pool (see pipeline.transcription_pool).
+    """
+
+    def __init__(
+        self,
+        config: Optional[VideoConfig] = None,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        stage_workers: Optional[Dict[str, int]] = None,
+        max_active: int = 3
+    ):
+        self.config = config or VideoConfig()
+        self.host = host
+        self.port = port
+        self.stage_workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+        self.executors = {
+            stage: ThreadPoolExecutor(max_workers=max(1, self.stage_workers[stage]),
+                                      thread_name_prefix=f"server-{stage}")
+            for stage in STAGES
+        }
+        self.transcriber: Optional[TranscriptionWorkerPool] = None
+        self.jobs: Dict[str, ServerJob] = {}
+        self._active: Optional[asyncio.Semaphore] = None
+        self._max_active = max_active
+
+    # Job execution
+
+    def submit(self, job: BatchJob) -> ServerJob:
+        server_job = ServerJob(uuid.uuid4().hex[:12], job)
+        self.jobs[server_job.id] = server_job
+        self._publish(server_job, {'event': 'queued'})
+        asyncio.get_running_loop().create_task(self._run(server_job))
+        return server_job
+
+    async def _run(self, server_job: ServerJob):
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._active:
+                server_job.status = "running"
+                state = new_job_state(0, server_job.job, self.config, self.transcriber)
+                for stage in STAGES:
+                    if state.error is not None:
+                        break
+                    server_job.stage = stage
+                    self._publish(server_job, {'event': 'stage', 'stage': stage, 'status': 'running'})
+                    await loop.run_in_executor(self.executors[stage], run_stage, stage, state)
+                    if state.error is not None:
+                        break
+                    self._publish(server_job, {
+                        'event': 'stage', 'stage': stage, 'status': 'done',
+                        'seconds': state.stage_seconds[stage]
+                    })
+                # Releasing the agent removes its temp dir; keep that off the loop too
+                summary = await loop.run_in_executor(self.executors["encode"], finish_job, state)
+        except Exception as e:
+            # Clients must still see the job end, whatever went wrong
+            summary = {
+                'status': 'failed',
+                'error': f"{type(e).__name__}: {e}",
+                'seconds': round(time.time() - server_job.submitted, 2)
+            }
+
+        server_job.result = summary
+        server_job.error = summary['error']
+        server_job.status = summary['status']
+        server_job.stage = None
+        self._publish(server_job, {
+            'event': 'finished', 'status': summary['status'],
+            'error': summary['error'], 'seconds': summary['seconds']
+        })
+
+    def _publish(self, server_job: ServerJob, event: Dict):
+        event = {'job': server_job.id, 'time': round(time.time(), 3), **event}
+        server_job.events.append(event)
+        for subscriber in server_job.subscribers:
+            subscriber.put_nowait(event)
+
+    # HTTP
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get('content-length') or 0)
+            body = await reader.readexactly(length) if length else b''
+
+            path = urlsplit(target).path.rstrip('/') or '/'
+            await self._route(method.upper(), path, body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            self._send_json(writer, 500, {'error': f"{type(e).__name__}: {e}"})
+        finally:
+            try:
+                await writer.drain()
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter):
+        parts = path.strip('/').split('/')
+
+        if parts == ['health']:
+            return self._send_json(writer, 200, {
+                'status': 'ok',
+                'jobs': len(self.jobs),
+                'running': sum(1 for j in self.jobs.values() if j.status == "running"),
+                'models': WhisperModelRegistry.loaded()
+            })
+
+        if parts == ['jobs']:
+            if method == 'GET':
+                return self._send_json(writer, 200, [j.to_dict() for j in self.jobs.values()])
+            if method == 'POST':
+                try:
+                    entry = json.loads(body or b'{}')
+                    job = BatchJob(
+                        audio=entry['audio'],
+                        visuals=entry.get('visuals', ''),
+                        output=entry['output'],
+                        style=entry.get('style', 'slides')
+                    )
+                except (ValueError, KeyError, TypeError) as e:
+                    return self._send_json(writer, 400, {'error': f"Invalid job: {e}"})
+                return self._send_json(writer, 202, self.submit(job).to_dict())
+            return self._send_json(writer, 405, {'error': f"{method} not allowed"})
+
+        if len(parts) in (2, 3) and parts[0] == 'jobs' and method == 'GET':
+            server_job = self.jobs.get(parts[1])
+            if server_job is None:
+                return self._send_json(writer, 404, {'error': f"No job {parts[1]}"})
+            if len(parts) == 2:
+                return self._send_json(writer, 200, server_job.to_dict())
+            if parts[2] == 'events':
+                return await self._stream_events(server_job, writer)
+
+        return self._send_json(writer, 404, {'error': f"No route for {method} {path}"})
+
+    async def _stream_events(self, server_job: ServerJob, writer: asyncio.StreamWriter):
+        """Replay the job's events so far, then follow it until it finishes"""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        subscriber: asyncio.Queue = asyncio.Queue()
+        backlog = list(server_job.events)
+        server_job.subscribers.add(subscriber)
+        try:
+            for event in backlog:
+                await self._write_event(writer, event)
+            while not server_job.finished:
+                await self._write_event(writer, await subscriber.get())
+        finally:
+            server_job.subscribers.discard(subscriber)
+
+    @staticmethod
+    async def _write_event(writer: asyncio.StreamWriter, event: Dict):
+        writer.write(f"event: {event['event']}\ndata: {json.dumps(event)}\n\n".encode('utf-8'))
+        await writer.drain()
+
+    @staticmethod
+    def _send_json(writer: asyncio.StreamWriter, status: int, payload):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n".encode('latin-1') + body
+        )
+
+    # Lifecycle
+
+    async def serve(self):
+        self._active = asyncio.Semaphore(max(1, self._max_active))
+        loop = asyncio.get_running_loop()
+        if whisper_available() and self.config.caption_enabled:
+            print(f"🔥 Loading Whisper '{self.config.whisper_model}'...")
+            self.transcriber = await loop.run_in_executor(
+                self.executors["captions"], transcription_pool,
+                self.config, self.stage_workers["captions"]
+            )
+            if self.transcriber is None:
+                await loop.run_in_executor(
+                    self.executors["captions"], WhisperModelRegistry.preload,
+                    self.config.whisper_model
+                )
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        print(f"🌐 Job server listening on http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for executor in self.executors.values():
+                executor.shutdown(wait=False)
+            if self.transcriber is not None:
+                self.transcriber.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """CLI: notebooklm-video serve [--port N]"""
+    import argparse
+    from pipeline import parse_stage_workers
+
+    parser = argparse.ArgumentParser(
+        prog='notebooklm-video serve',
+        description='Run a local HTTP job server with warm models'
+    )
+    parser.add_argument('--host', default=DEFAULT_HOST, help='Interface to bind')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port to listen on')
+    parser.add_argument('--stage-workers', default='',
+                        help='Threads per stage, e.g. "captions=2,encode=3"')
+    parser.add_argument('--max-active', type=int, default=3,
+                        help='Jobs in progress at once; the rest wait in line')
+    parser.add_argument('--resolution', default='1920x1080', help='Video resolution')
+    parser.add_argument('--fps', type=int, default=30, help='Frames per second')
+    parser.add_argument('--no-captions', action='store_true', help='Disable captions')
+    parser.add_argument('--renderer', default='moviepy', choices=['moviepy', 'ffmpeg', 'static'],
+                        help='Rendering backend for slide videos')
+    parser.add_argument('--whisper-model', default='base',
+                        help='Whisper model size kept loaded for captions')
+
+    args = parser.parse_args(argv)
+    width, height = map(int, args.resolution.split('x'))
+    config = VideoConfig(
+        output_resolution=(width, height),
+        fps=args.fps,
+        caption_enabled=not args.no_captions,
+        renderer=args.renderer,
+        whisper_model=args.whisper_model
+    )
+
+    server = JobServer(
+        config, args.host, args.port,
+        stage_workers=parse_stage_workers(args.stage_workers),
+        max_active=args.max_active
+    )
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\n👋 Job server stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Slide preprocessing: decode, resize and letterbox each slide once
+Prepared frames are cached on disk by (content hash, mtime, target size),
+so later renders at the same size reuse them
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+from result_cache import DEFAULT_CACHE_DIR, content_hash
+
+
+def letterbox(image: "Image.Image", size: Tuple[int, int]) -> "Image.Image":
+    """Aspect-preserving resize into `size`, centred on black"""
+    image = ImageOps.exif_transpose(image).convert('RGB')
+    fitted = ImageOps.contain(image, size, Image.LANCZOS)
+    canvas = Image.new('RGB', size, (0, 0, 0))
+    canvas.paste(fitted, ((size[0] - fitted.width) // 2, (size[1] - fitted.height) // 2))
+    return canvas
+
+
+class SlideCache:
+    """
+    Directory of slides already fitted to a target resolution
+    Preparation runs on a thread pool; Pillow releases the GIL while
+    decoding and resampling, so threads scale across cores
+    """
+
+    def __init__(self, root: Optional[str] = None, workers: Optional[int] = None):
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR / 'slides'
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+    def key(self, slide: Path, size: Tuple[int, int]) -> str:
+        stat = os.stat(slide)
+        return f"{content_hash(str(slide))[:24]}_{stat.st_mtime_ns}_{size[0]}x{size[1]}"
+
+    def prepare_one(self, slide: Path, size: Tuple[int, int]) -> Path:
+        """Path of `slide` fitted to `size`, rendering it on a cache miss"""
+        target = self.root / f"{self.key(slide, size)}.png"
+        if target.exists():
+            return target
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        with Image.open(slide) as image:
+            # JPEG can decode straight at a reduced scale
+            image.draft('RGB', size)
+            prepared = letterbox(image, size)
+
+        tmp_path = target.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        prepared.save(tmp_path, format='PNG', compress_level=1)
+        os.replace(tmp_path, target)
+        return target
+
+    def prepare(self, slides: Iterable[Path], size: Tuple[int, int]) -> List[Path]:
+        """
+        Fit every slide to `size` in parallel, keeping their order
+        `slides` may be a stream (e.g. deck pages still being rasterized);
+        each slide is submitted as soon as it arrives
+        """
+        if not PIL_AVAILABLE:
+            raise RuntimeError("Pillow required for slide preprocessing")
+        size = (int(size[0]), int(size[1]))
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(lambda slide: self.prepare_one(Path(slide), size), slides))
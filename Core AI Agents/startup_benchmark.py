@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: how long the agent's modules and CLI take to load
+Each measurement runs in a fresh interpreter. Also reports the slowest
+imports (python -X importtime) and fails if a heavy dependency is
+imported eagerly or the CLI exceeds its time budget.
+
+    python startup_benchmark.py [--runs 5] [--budget 1.0]
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+HERE = Path(__file__).resolve().parent
+
+# Modules whose import alone must not pull these in
+MODULES = [
+    "podcast_video_creator",
+    "advanced_podcast_creator",
+    "batch",
+    "pipeline",
+    "server",
+]
+
+# Loaded only on the code paths that need them
+HEAVY_DEPENDENCIES = ["moviepy", "librosa", "whisper", "torch", "requests"]
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=HERE, capture_output=True, text=True
+    )
+
+
+def time_command(args: List[str], runs: int) -> float:
+    """Median wall time of `python <args>` over `runs` fresh interpreters"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        _run(args)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def eager_heavy_imports(module: str) -> List[str]:
+    """Heavy dependencies present in sys.modules right after importing `module`"""
+    probe = (
+        f"import sys, {module}; "
+        f"print('EAGER:', *(m for m in {HEAVY_DEPENDENCIES!r} if m in sys.modules))"
+    )
+    # Modules may print warnings of their own; only the marked line counts
+    for line in _run(["-c", probe]).stdout.splitlines():
+        if line.startswith('EAGER:'):
+            return line.split()[1:]
+    return []
+
+
+def slowest_imports(module: str, count: int = 10) -> List[Tuple[int, str]]:
+    """(cumulative microseconds, name) of the slowest top-level imports"""
+    result = _run(["-X", "importtime", "-c", f"import {module}"])
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.rstrip()
+        # Depth is the indentation; keep direct imports of the module only
+        if len(name) - len(name.lstrip()) <= 3:
+            timings.append((int(cumulative), name.strip()))
+    return sorted(timings, reverse=True)[:count]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Measure import and CLI startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per measurement')
+    parser.add_argument('--budget', type=float, default=None,
+                        help='Fail if `--help` takes longer than this many seconds')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list')
+    args = parser.parse_args(argv)
+
+    baseline = time_command(["-c", "pass"], args.runs)
+    print(f"🐍 Interpreter startup: {baseline * 1000:.0f} ms")
+
+    results: Dict[str, float] = {}
+    failures = []
+    for module in MODULES:
+        results[module] = time_command(["-c", f"import {module}"], args.runs) - baseline
+        eager = eager_heavy_imports(module)
+        flag = f"  ⚠️  eagerly imports {', '.join(eager)}" if eager else ""
+        print(f"📦 import {module}: {results[module] * 1000:.0f} ms{flag}")
+        if eager:
+            failures.append(f"{module} imports {', '.join(eager)}")
+
+    cli = time_command(["podcast_video_creator.py", "--help"], args.runs)
+    print(f"⌨️  podcast_video_creator.py --help: {cli * 1000:.0f} ms")
+    if args.budget is not None and cli > args.budget:
+        failures.append(f"--help took {cli:.2f}s (budget {args.budget:.2f}s)")
+
+    print("\n🐢 Slowest imports under podcast_video_creator:")
+    for cumulative, name in slowest_imports("podcast_video_creator", args.top):
+        print(f"   {cumulative / 1000:8.1f} ms  {name}")
+
+    if failures:
+        print("\n❌ " + "\n❌ ".join(failures))
+        return 1
+    print("\n✅ Startup within limits")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
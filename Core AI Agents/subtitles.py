@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Caption export as ASS subtitle tracks
+One file per render, burned in by FFmpeg's subtitles filter in a single pass
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class CaptionStyle:
+    """Look of one caption style, in output pixels"""
+    fontsize: int = 48
+    font: str = "Arial"
+    bold: bool = True
+    color: Tuple[int, int, int] = (255, 255, 255)
+    outline_color: Tuple[int, int, int] = (0, 0, 0)
+    outline: float = 2.0
+    width_ratio: float = 0.8  # share of the frame width text may wrap into
+    margin_v: int = 50  # from the bottom, or from the top when top_anchored
+    top_anchored: bool = False
+    uppercase: bool = False
+    box_opacity: float = 0.0  # translucent black box behind the text when > 0
+    box_padding: int = 20
+
+
+CAPTION_STYLES: Dict[str, CaptionStyle] = {
+    # NotebookLMVideoAgent slide videos
+    'modern': CaptionStyle(),
+    # AdvancedVideoAgent B-roll: yellow upper-case text on a dark box
+    'youtube': CaptionStyle(
+        fontsize=60, color=(255, 255, 0), outline=3.0, width_ratio=0.9,
+        margin_v=80, uppercase=True, box_opacity=0.6
+    ),
+    # AdvancedVideoAgent Shorts: large text in the lower third of 1080x1920
+    'mobile': CaptionStyle(
+        fontsize=80, outline=4.0, width_ratio=0.95,
+        margin_v=1400, top_anchored=True
+    ),
+    # multi_output audiograms: between the slide and the waveform of 1080x1080
+    'audiogram': CaptionStyle(
+        fontsize=52, outline=3.0, width_ratio=0.9, margin_v=270
+    ),
+}
+
+
+def get_caption_style(name: str) -> CaptionStyle:
+    """Named style, falling back to 'modern'"""
+    return CAPTION_STYLES.get(name, CAPTION_STYLES['modern'])
+
+
+def _ass_color(rgb: Tuple[int, int, int], alpha: int = 0) -> str:
+    """ASS colours are &HAABBGGRR with 00 meaning opaque"""
+    r, g, b = rgb
+    return f"&H{alpha:02X}{b:02X}{g:02X}{r:02X}"
+
+
+def _ass_time(seconds: float) -> str:
+    centis = max(0, int(round(seconds * 100)))
+    hours, centis = divmod(centis, 360000)
+    minutes, centis = divmod(centis, 6000)
+    secs, centis = divmod(centis, 100)
+    return f"{hours}:{minutes:02d}:{secs:02d}.{centis:02d}"
+
+
+def _ass_text(text: str, uppercase: bool) -> str:
+    # Braces open override blocks in ASS, and newlines must be hard breaks
+    text = text.replace('{', '(').replace('}', ')')
+    text = text.replace('\r', '').replace('\n', r'\N')
+    return text.upper() if uppercase else text
+
+
+def _style_line(
+    name: str,
+    style: CaptionStyle,
+    resolution: Tuple[int, int],
+    box: bool = False
+) -> str:
+    width, _ = resolution
+    margin_h = int(width * (1 - style.width_ratio) / 2)
+    alignment = 8 if style.top_anchored else 2  # top / bottom centre
+    if box:
+        # Opaque-box border style: the "outline" becomes a padded box and the
+        # glyphs themselves are fully transparent
+        alpha = int(round((1 - style.box_opacity) * 255))
+        primary = _ass_color(style.color, 0xFF)
+        outline_color = _ass_color((0, 0, 0), alpha)
+        border_style, outline = '3', f"{style.box_padding / 2:g}"
+    else:
+        primary = _ass_color(style.color)
+        outline_color = _ass_color(style.outline_color)
+        border_style, outline = '1', f"{style.outline:g}"
+    fields = [
+        name, style.font, str(style.fontsize),
+        primary, primary,
+        outline_color, _ass_color((0, 0, 0), 0xFF),
+        '-1' if style.bold else '0', '0', '0', '0',
+        '100', '100', '0', '0',
+        border_style, outline, '0',
+        str(alignment), str(margin_h), str(margin_h), str(style.margin_v), '1'
+    ]
+    return "Style: " + ",".join(fields)
+
+
+def build_ass(
+    captions: List[Dict],
+    resolution: Tuple[int, int],
+    style: CaptionStyle
+) -> str:
+    """Full ASS document for `captions` rendered in `style`"""
+    width, height = resolution
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {width}",
+        f"PlayResY: {height}",
+        "WrapStyle: 0",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, "
+        "OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, "
+        "ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+        "Alignment, MarginL, MarginR, MarginV, Encoding",
+        _style_line("Caption", style, resolution),
+        _style_line("CaptionBox", style, resolution, box=True),
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    # The box (when enabled) sits on layer 0 underneath the outlined text
+    layers = [(0, "CaptionBox"), (1, "Caption")] if style.box_opacity > 0 else [(0, "Caption")]
+    for cap in captions:
+        if cap['end'] <= cap['start']:
+            continue
+        start, end = _ass_time(cap['start']), _ass_time(cap['end'])
+        text = _ass_text(cap['text'], style.uppercase)
+        for layer, style_name in layers:
+            lines.append(f"Dialogue: {layer},{start},{end},{style_name},,0,0,0,,{text}")
+    return "\n".join(lines) + "\n"
+
+
+def write_ass(
+    captions: List[Dict],
+    path: Path,
+    resolution: Tuple[int, int],
+    style: CaptionStyle
+) -> Path:
+    """Write the ASS track for `captions` to `path`"""
+    path = Path(path)
+    path.write_text(build_ass(captions, resolution, style), encoding='utf-8')
+    return path
+
+
+def subtitles_filter(path: Path) -> str:
+    """subtitles filter for an absolute path, escaped for an FFmpeg filtergraph"""
+    escaped = str(Path(path).resolve()).replace('\\', '/')
+    escaped = escaped.replace(':', r'\:').replace("'", r"'\''")
+    return f"subtitles=filename='{escaped}'"
+
+
+def burn_in_params(
+    captions: Optional[List[Dict]],
+    path: Path,
+    resolution: Tuple[int, int],
+    style: CaptionStyle
+) -> List[str]:
+    """
+    Extra FFmpeg output arguments that burn `captions` in while MoviePy
+    encodes, so the captions cost one filter instead of one layer each
+    """
+    if not captions:
+        return []
+    write_ass(captions, path, resolution, style)
+    return ['-vf', subtitles_filter(path)]
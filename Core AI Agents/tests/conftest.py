@@ -0,0 +1,6 @@
+"""The agent modules are flat files imported by bare name, like the CLIs do"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
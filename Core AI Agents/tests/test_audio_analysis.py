@@ -0,0 +1,111 @@
+"""Pause-based segmentation"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from audio_analysis import _enforce_min_length, align_slides, detect_segments  # noqa: E402
+
+FRAME = 0.1
+
+
+def _envelope(speech_seconds, pause_seconds=0.5):
+    """Loud speech runs separated by silent pauses, at FRAME seconds per frame"""
+    frames = []
+    for i, seconds in enumerate(speech_seconds):
+        if i:
+            frames += [0.0] * int(round(pause_seconds / FRAME))
+        frames += [1.0] * int(round(seconds / FRAME))
+    return np.array(frames)
+
+
+def test_segments_cut_at_pauses():
+    energy = _envelope([4, 4, 4])
+    duration = len(energy) * FRAME
+    segments = detect_segments(energy, FRAME, duration, min_segment=3.0, max_segment=10.0)
+
+    assert [round(s['end'], 2) for s in segments] == [4.25, 8.75, 13.0]
+    assert segments[0]['start'] == 0.0
+    for prev, cur in zip(segments, segments[1:]):
+        assert cur['start'] == prev['end']
+
+
+def test_short_segments_merge_and_long_ones_split():
+    energy = _envelope([1, 1, 12])
+    duration = len(energy) * FRAME
+    segments = detect_segments(energy, FRAME, duration, min_segment=3.0, max_segment=10.0)
+
+    lengths = [s['duration'] for s in segments]
+    assert all(length <= 10.0 + 1e-9 for length in lengths)
+    assert all(length >= 3.0 - 1e-9 for length in lengths)
+    assert segments[-1]['end'] == pytest.approx(duration)
+
+
+def test_target_segments_gives_exact_count():
+    energy = _envelope([3, 3, 3, 3, 3])
+    duration = len(energy) * FRAME
+    segments = detect_segments(energy, FRAME, duration, target_segments=3)
+
+    assert len(segments) == 3
+    assert segments[-1]['end'] == pytest.approx(duration)
+
+
+def test_silence_only_is_one_segment():
+    segments = detect_segments(np.array([]), FRAME, 5.0)
+    assert segments == [{'start': 0.0, 'end': 5.0, 'duration': 5.0, 'type': 'content'}]
+
+
+def test_enforce_min_length_drops_weaker_boundary():
+    boundaries = np.array([0.0, 4.0, 5.0, 10.0])
+    strength = np.array([np.inf, 2.0, 7.0, np.inf])
+    result = _enforce_min_length(boundaries, strength, 3.0)
+    assert result.tolist() == [0.0, 5.0, 10.0]
+
+
+def test_enforce_min_length_keeps_valid_gaps():
+    boundaries = np.array([0.0, 4.0, 8.0, 12.0])
+    strength = np.array([np.inf, 1.0, 1.0, np.inf])
+    assert _enforce_min_length(boundaries, strength, 3.0).tolist() == boundaries.tolist()
+
+
+def test_enforce_min_length_never_drops_the_ends():
+    boundaries = np.array([0.0, 1.0, 2.0])
+    strength = np.array([np.inf, 5.0, np.inf])
+    assert _enforce_min_length(boundaries, strength, 10.0).tolist() == [0.0, 2.0]
+
+
+def test_align_slides_snaps_to_nearby_pauses():
+    segments = [{'end': 9.0}, {'end': 21.0}, {'end': 30.0}]
+    durations = align_slides(segments, 30.0, 3)
+    assert durations == pytest.approx([9.0, 12.0, 9.0])
+
+
+def test_streaming_matches_whole_file_segmentation(monkeypatch):
+    import audio_analysis
+    from audio_analysis import HOP_LENGTH, frame_rms, stream_segments
+
+    rate = int(HOP_LENGTH / FRAME)
+    # Pauses at 4.25 s, 8.75 s and 28.75 s; 20 s of unbroken speech between
+    # the last two, which both paths must cut at max_segment
+    frames = _envelope([4, 4, 19.5, 4])
+    samples = np.repeat(frames, HOP_LENGTH).astype(np.float32)
+    blocks = [samples[i:i + 3 * rate + 77] for i in range(0, len(samples), 3 * rate + 77)]
+    monkeypatch.setattr(audio_analysis, "open_pcm_stream", lambda path, block_seconds: (rate, iter(blocks)))
+
+    duration = len(samples) / rate
+    streamed = list(stream_segments("episode.wav"))
+    whole = detect_segments(frame_rms(samples), FRAME, duration)
+
+    assert len(streamed) == len(whole) == 5
+    for a, b in zip(streamed, whole):
+        assert a['start'] == pytest.approx(b['start'], abs=FRAME)
+        assert a['end'] == pytest.approx(b['end'], abs=FRAME)
+
+
+def test_streaming_cuts_flat_speech_at_max_segment():
+    from audio_analysis import StreamingSegmenter
+
+    segmenter = StreamingSegmenter(FRAME, min_segment=3.0, max_segment=10.0)
+    segments = segmenter.feed(np.ones(250)) + segmenter.finish(25.0)
+
+    assert [round(s['end'], 6) for s in segments] == [10.0, 20.0, 25.0]
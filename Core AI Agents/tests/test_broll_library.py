@@ -0,0 +1,43 @@
+"""B-roll library indexing"""
+
+import os
+
+from broll_library import BrollLibrary
+from media_info import MediaInfo
+
+
+def _library(tmp_path, monkeypatch, probed):
+    def probe(path):
+        probed.append(os.path.basename(path))
+        if "broken" in path:
+            return None
+        return MediaInfo(path, 12.0, "mp4", has_video=True, width=1920, height=1080)
+
+    monkeypatch.setattr(BrollLibrary, "_probe", staticmethod(probe))
+    return BrollLibrary(str(tmp_path / "clips"), str(tmp_path / "index.sqlite3"))
+
+
+def test_unreadable_files_are_skipped_until_they_change(tmp_path, monkeypatch):
+    clips = tmp_path / "clips" / "city"
+    clips.mkdir(parents=True)
+    (clips / "night_traffic.mp4").write_bytes(b"video")
+    broken = clips / "broken.mp4"
+    broken.write_bytes(b"junk")
+    probed = []
+    library = _library(tmp_path, monkeypatch, probed)
+
+    stats = library.scan(workers=1)
+    assert (stats['added'], stats['unreadable']) == (1, 1)
+    assert len(library) == 1
+    assert [c.path for c in library.search("city traffic")] == [
+        str(clips / "night_traffic.mp4")
+    ]
+
+    probed.clear()
+    stats = library.scan(workers=1)
+    assert probed == []
+    assert (stats['added'], stats['unreadable'], stats['unchanged']) == (0, 0, 2)
+
+    broken.write_bytes(b"junk, rewritten")
+    library.scan(workers=1)
+    assert probed == ["broken.mp4"]
@@ -0,0 +1,52 @@
+"""B-roll windows and source offsets"""
+
+import pytest
+
+from broll_schedule import BrollWindow, assign_offsets, plan_windows
+
+
+def _cap(start, end, text="word"):
+    return {'start': start, 'end': end, 'text': text}
+
+
+def test_windows_tile_the_audio_on_caption_ends():
+    captions = [_cap(0, 2, "a"), _cap(2, 5.5, "b"), _cap(5.5, 9, "c"), _cap(9, 12, "d")]
+    windows = plan_windows(captions, 12.0)
+
+    assert [(w.start, w.end) for w in windows] == [(0.0, 5.5), (5.5, 12.0)]
+    assert [w.text for w in windows] == ["a b", "c d"]
+
+
+def test_long_gaps_are_split():
+    windows = plan_windows([_cap(0, 1)], 20.0, target=5.0, max_length=8.0)
+
+    assert windows[0].start == 0.0
+    assert windows[-1].end == 20.0
+    assert all(w.duration <= 8.0 for w in windows)
+    for prev, cur in zip(windows, windows[1:]):
+        assert cur.start == prev.end
+
+
+def test_trailing_sliver_joins_previous_window():
+    windows = plan_windows([_cap(0, 5), _cap(5, 10)], 11.0)
+    assert [(w.start, w.end) for w in windows] == [(0.0, 5.0), (5.0, 11.0)]
+
+
+def test_offsets_continue_and_wrap_per_source():
+    windows = [
+        BrollWindow(0, 4, source="a.mp4"),
+        BrollWindow(4, 8, source="b.mp4"),
+        BrollWindow(8, 12, source="a.mp4"),
+        BrollWindow(12, 16, source="a.mp4"),
+        BrollWindow(16, 20),
+    ]
+    assign_offsets(windows, {"a.mp4": 10.0, "b.mp4": 30.0})
+
+    assert [w.offset for w in windows] == pytest.approx([0.0, 0.0, 4.0, 0.0, 0.0])
+
+
+def test_trailing_sliver_never_makes_a_window_too_long():
+    windows = plan_windows([_cap(0, 8)], 10.4, target=5.0, max_length=8.0)
+
+    assert all(w.duration <= 8.0 for w in windows)
+    assert [(w.start, w.end) for w in windows] == [(0.0, 5.2), (5.2, 10.4)]
@@ -0,0 +1,59 @@
+"""Caption overlay lookup, bitmap cache and compositing"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+
+import caption_overlay  # noqa: E402
+from caption_overlay import CaptionOverlay  # noqa: E402
+from subtitles import CaptionStyle  # noqa: E402
+
+CAPTIONS = [
+    {'start': 0.0, 'end': 2.0, 'text': "first"},
+    {'start': 1.5, 'end': 3.0, 'text': "second"},
+    {'start': 5.0, 'end': 5.0, 'text': "empty"},
+    {'start': 6.0, 'end': 8.0, 'text': "third"},
+]
+
+
+def _overlay(**style):
+    return CaptionOverlay(CAPTIONS, (320, 180), CaptionStyle(fontsize=20, margin_v=10, **style))
+
+
+def test_active_caption_is_the_latest_started():
+    overlay = _overlay()
+    assert [overlay.active_index(t) for t in (0.0, 1.0, 1.5, 2.5, 3.0, 5.0, 7.9, 8.0)] == [
+        0, 0, 1, 1, None, None, 2, None
+    ]
+
+
+def test_bitmaps_are_drawn_once_and_the_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(caption_overlay, "BITMAP_CACHE_SIZE", 2)
+    overlay = _overlay()
+    drawn = []
+    rasterize = overlay._rasterize
+
+    def counting(text):
+        drawn.append(text)
+        return rasterize(text)
+
+    monkeypatch.setattr(overlay, "_rasterize", counting)
+    for index in (0, 0, 1, 0, 2, 1):
+        overlay._bitmap(index)
+
+    assert drawn == ["first", "second", "third", "second"]
+    assert len(overlay._bitmaps) == 2
+
+
+def test_blit_draws_only_while_a_caption_is_active():
+    overlay = _overlay(uppercase=True)
+    frame = np.full((180, 320, 3), 40, dtype=np.uint8)
+
+    assert overlay.blit(frame, 4.0) is frame
+    drawn = overlay.blit(frame, 0.5)
+    assert drawn.shape == frame.shape
+    assert (drawn != frame).any()
+    assert (frame == 40).all()
+    # Bottom-anchored: nothing above the caption band changes
+    assert (drawn[:60] == 40).all()
@@ -0,0 +1,73 @@
+"""Footage cache: single renders under concurrency and pinned clips"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from footage_cache import FootageCache
+
+RESOLUTION = (640, 360)
+
+
+class FakeRenderer:
+    """Writes `size` bytes per clip and counts calls per topic"""
+
+    def __init__(self, size=100, delay=0.0):
+        self.size = size
+        self.delay = delay
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, topic, duration, resolution, fps, path):
+        with self._lock:
+            self.calls[topic] = self.calls.get(topic, 0) + 1
+        time.sleep(self.delay)
+        path.write_bytes(b"x" * self.size)
+
+
+def test_concurrent_gets_render_a_key_once(tmp_path):
+    cache = FootageCache(str(tmp_path))
+    render = FakeRenderer(delay=0.05)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = list(pool.map(
+            lambda _: cache.get("ocean", 4.2, RESOLUTION, 30, render), range(8)
+        ))
+
+    assert render.calls == {"ocean": 1}
+    assert len(set(paths)) == 1
+    assert paths[0].name == "ocean_5s_640x360_30fps.mp4"
+    assert not list(tmp_path.glob("*.part.mp4"))
+
+
+def test_pinned_clips_survive_eviction_until_released(tmp_path):
+    cache = FootageCache(str(tmp_path), max_bytes=150)
+    render = FakeRenderer()
+
+    pinned = cache.get("city", 5, RESOLUTION, 30, render, pin=True)
+    other = cache.get("forest", 5, RESOLUTION, 30, render)
+
+    # Over the limit, but the only evictable clip is the newest one
+    assert pinned.exists()
+    assert other.exists()
+    cache.evict()
+    assert pinned.exists()
+    assert not other.exists()
+
+    cache.release([pinned])
+    cache.evict(max_bytes=0)
+    assert not pinned.exists()
+
+
+def test_prefetch_pins_every_clip_it_returns(tmp_path):
+    cache = FootageCache(str(tmp_path), max_bytes=150)
+    render = FakeRenderer()
+
+    paths = cache.prefetch(
+        [("a", 5), ("b", 5), ("c", 5)], RESOLUTION, 30, render, workers=3, pin=True
+    )
+
+    assert all(path.exists() for path in paths)
+    cache.release(paths)
+    cache.evict()
+    assert cache.size() <= 150
@@ -0,0 +1,52 @@
+"""Highlight span candidates and selection"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from highlights import candidate_spans, select_highlights  # noqa: E402
+
+
+def _cap(start, end):
+    return {'start': start, 'end': end, 'text': "word"}
+
+
+def test_spans_start_and_end_on_captions_within_limits():
+    captions = [_cap(0, 10), _cap(10, 20), _cap(20, 30), _cap(30, 70)]
+    starts, ends = candidate_spans(captions, 70.0, min_seconds=15.0, max_seconds=60.0)
+
+    spans = sorted(zip(starts.tolist(), ends.tolist()))
+    assert spans == [(0.0, 20.0), (0.0, 30.0), (10.0, 30.0), (10.0, 70.0),
+                     (20.0, 70.0), (30.0, 70.0)]
+
+
+def test_short_episode_is_one_span():
+    starts, ends = candidate_spans([_cap(0, 5)], 12.0)
+    assert starts.tolist() == [0.0]
+    assert ends.tolist() == [12.0]
+
+
+def test_grid_without_captions_stays_inside_the_episode():
+    starts, ends = candidate_spans([], 40.0, min_seconds=15.0, max_seconds=20.0)
+
+    assert len(starts) > 0
+    assert (ends <= 40.0).all()
+    assert ((ends - starts) >= 15.0).all()
+    assert ((ends - starts) <= 20.0).all()
+
+
+def test_select_skips_overlapping_spans():
+    starts = np.array([0.0, 5.0, 30.0, 50.0])
+    ends = np.array([20.0, 25.0, 45.0, 70.0])
+    scores = np.array([0.9, 1.0, 0.5, 0.7])
+
+    chosen = select_highlights(starts, ends, scores, 3)
+
+    assert chosen == [(5.0, 25.0, 1.0), (50.0, 70.0, 0.7), (30.0, 45.0, 0.5)]
+
+
+def test_select_stops_at_count():
+    starts = np.array([0.0, 20.0, 40.0])
+    ends = np.array([15.0, 35.0, 55.0])
+    chosen = select_highlights(starts, ends, np.array([1.0, 1.0, 2.0]), 2)
+    assert chosen == [(40.0, 55.0, 2.0), (0.0, 15.0, 1.0)]
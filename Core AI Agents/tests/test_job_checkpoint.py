@@ -0,0 +1,49 @@
+"""Job checkpoints: resuming stages and checking rendered outputs"""
+
+from job_checkpoint import JobCheckpoint
+
+IDENTITY = {'audio': 'abc', 'style': 'slides'}
+
+
+def test_resume_after_a_partial_job(tmp_path):
+    first = JobCheckpoint(str(tmp_path), IDENTITY)
+    first.save('segments', [{'start': 0.0, 'end': 5.0}])
+    (first.dir('chunks') / "chunk_0.mp4").write_bytes(b"part")
+
+    rerun = JobCheckpoint(str(tmp_path), dict(IDENTITY))
+    assert rerun.done('segments')
+    assert rerun.load('segments') == [{'start': 0.0, 'end': 5.0}]
+    assert not rerun.done('captions')
+    assert (rerun.path / "chunks" / "chunk_0.mp4").exists()
+
+    other = JobCheckpoint(str(tmp_path), {**IDENTITY, 'style': 'broll'})
+    assert not other.done('segments')
+
+
+def test_rendered_needs_every_output_unchanged(tmp_path):
+    main = tmp_path / "video.mp4"
+    short = tmp_path / "video_shorts.mp4"
+    main.write_bytes(b"main")
+    short.write_bytes(b"short")
+    checkpoint = JobCheckpoint(str(tmp_path / "jobs"), IDENTITY)
+    checkpoint.dir('chunks')
+
+    assert not checkpoint.rendered([str(main)])
+    checkpoint.finish([str(main), str(short)], shorts=[])
+
+    assert not (checkpoint.path / "chunks").exists()
+    assert checkpoint.rendered([str(main), str(short)])
+    assert not checkpoint.rendered([str(main), str(tmp_path / "video_720p.mp4")])
+
+    short.unlink()
+    assert not JobCheckpoint(str(tmp_path / "jobs"), IDENTITY).rendered([str(main)])
+
+
+def test_rendered_notices_a_rewritten_output(tmp_path):
+    main = tmp_path / "video.mp4"
+    main.write_bytes(b"main")
+    checkpoint = JobCheckpoint(str(tmp_path / "jobs"), IDENTITY)
+    checkpoint.finish([str(main)])
+
+    main.write_bytes(b"something else")
+    assert not checkpoint.rendered([str(main)])
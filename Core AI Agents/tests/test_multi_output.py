@@ -0,0 +1,43 @@
+"""One filtergraph for several renditions"""
+
+from multi_output import OUTPUT_TARGETS, build_multi_output_filtergraph
+
+
+def _build(names, subtitles=None, durations=(4.0, 6.0)):
+    targets = [OUTPUT_TARGETS[name] for name in names]
+    return build_multi_output_filtergraph(
+        list(durations), (1920, 1080), 30, 0.5, targets,
+        subtitles or [None] * len(targets), audio_input=len(durations)
+    )
+
+
+def test_single_target_at_base_resolution_is_a_passthrough():
+    graph, lengths = _build(['1080p'])
+    chains = graph.split(";\n")
+
+    assert lengths == [5.0, 6.0]  # first slide extended by the 1 s crossfade
+    assert "[vout]null[b0]" in chains
+    assert "[b0]null[v0]" in chains
+    assert "split" not in graph
+
+
+def test_targets_share_one_decode_and_get_one_output_each():
+    graph, _ = _build(['1080p', '720p', 'shorts'], subtitles=[None, "720p.ass", None])
+    chains = graph.split(";\n")
+
+    assert "[vout]split=3[b0][b1][b2]" in chains
+    assert sum(chain.count("[0:v]") for chain in chains) == 1
+    for i in range(3):
+        assert sum(chain.endswith(f"[v{i}]") for chain in chains) == 1
+    assert "[l1]subtitles=720p.ass[v1]" in chains
+    assert any(chain.startswith("[b1]scale=1280:720") for chain in chains)
+
+
+def test_audiograms_split_the_audio_only_when_there_are_several():
+    graph, _ = _build(['1080p', 'audiogram'])
+    assert "asplit" not in graph
+    assert "[2:a]showwaves" in graph
+
+    graph, _ = _build(['audiogram', 'audiogram'])
+    assert "[2:a]asplit=2[a0][a1]" in graph.split(";\n")
+    assert "[a0]showwaves" in graph and "[a1]showwaves" in graph
@@ -0,0 +1,42 @@
+"""Chunk planning for parallel MoviePy renders"""
+
+import pytest
+
+from parallel_render import _shift_filters, plan_render_chunks
+
+
+def test_chunks_split_evenly_without_boundaries():
+    assert plan_render_chunks(60.0, 30, 3) == [0.0, 20.0, 40.0, 60.0]
+
+
+def test_cuts_snap_to_nearby_boundaries_on_frames():
+    edges = plan_render_chunks(60.0, 30, 2, boundaries=[27.0, 31.01, 45.0])
+    assert edges == [0.0, 31.0, 60.0]
+
+
+def test_distant_boundaries_are_ignored():
+    assert plan_render_chunks(100.0, 25, 2, boundaries=[99.0]) == [0.0, 50.0, 100.0]
+
+
+def test_short_timelines_are_not_split():
+    assert plan_render_chunks(15.0, 30, 8) == [0.0, 15.0]
+
+
+def test_max_chunk_seconds_adds_chunks():
+    edges = plan_render_chunks(120.0, 30, 2, max_chunk_seconds=30.0)
+    assert len(edges) == 5
+    assert max(b - a for a, b in zip(edges, edges[1:])) == pytest.approx(30.0)
+
+
+def test_shift_filters_wraps_vf_for_later_chunks():
+    params = ['-preset', 'fast', '-vf', "subtitles=filename='a.ass'"]
+    shifted = _shift_filters(params, 12.5)
+
+    assert shifted[3] == "setpts=PTS+12.500000/TB,subtitles=filename='a.ass',setpts=PTS-STARTPTS"
+    assert params[3] == "subtitles=filename='a.ass'"
+
+
+def test_shift_filters_leaves_first_chunk_and_plain_params():
+    params = ['-vf', 'subtitles=a.ass']
+    assert _shift_filters(params, 0.0) == params
+    assert _shift_filters(['-crf', '20'], 5.0) == ['-crf', '20']
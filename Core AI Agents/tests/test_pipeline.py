@@ -0,0 +1,28 @@
+"""Stage pipeline configuration and failure reporting"""
+
+import pytest
+
+import pipeline
+from batch import BatchJob
+
+
+def test_parse_stage_workers():
+    assert pipeline.parse_stage_workers("captions=2, encode=3") == {'captions': 2, 'encode': 3}
+    assert pipeline.parse_stage_workers("") == {}
+
+
+def test_parse_stage_workers_rejects_unknown_stages():
+    with pytest.raises(ValueError, match="render"):
+        pipeline.parse_stage_workers("render=2")
+
+
+def test_agent_setup_failure_is_reported(monkeypatch):
+    class BrokenAgent:
+        def __init__(self, *args, **kwargs):
+            raise OSError("no temp dir")
+
+    monkeypatch.setattr(pipeline, "NotebookLMVideoAgent", BrokenAgent)
+    results = pipeline.StagePipeline().run([BatchJob("a.mp3", "slides", "out.mp4")])
+
+    assert results[0]['status'] == 'failed'
+    assert results[0]['error'] == "setup: OSError: no temp dir"
@@ -0,0 +1,53 @@
+"""Result cache hits, misses and LRU eviction"""
+
+import os
+
+from result_cache import ResultCache
+
+
+def _audio(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_hit_and_miss(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    audio = _audio(tmp_path, "a.wav", b"episode one")
+
+    assert cache.get(audio, {'model': 'base'}) is None
+    cache.put(audio, {'model': 'base'}, [{'start': 0.0, 'end': 1.0}])
+
+    assert cache.get(audio, {'model': 'base'}) == [{'start': 0.0, 'end': 1.0}]
+    assert cache.get(audio, {'model': 'small'}) is None
+    assert cache.get(_audio(tmp_path, "b.wav", b"episode two"), {'model': 'base'}) is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    audios = [_audio(tmp_path, f"{i}.wav", f"episode {i}".encode()) for i in range(3)]
+    for i, audio in enumerate(audios):
+        cache.put(audio, {}, "x" * 100)
+        os.utime(cache._entry_path(audio, {}), (1000 + i, 1000 + i))
+
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get(audios[0], {}) == "x" * 100
+    entry_size = cache.size() // 3
+    cache.evict(max_bytes=2 * entry_size)
+
+    assert cache.get(audios[1], {}) is None
+    assert cache.get(audios[0], {}) is not None
+    assert cache.get(audios[2], {}) is not None
+
+
+def test_invalidate_leaves_other_caches_alone(tmp_path):
+    root = tmp_path / "cache"
+    (root / "jobs").mkdir(parents=True)
+    cache = ResultCache(str(root))
+    audio = _audio(tmp_path, "a.wav", b"episode")
+    cache.put(audio, {}, 1)
+
+    cache.invalidate()
+
+    assert cache.get(audio, {}) is None
+    assert (root / "jobs").is_dir()
@@ -0,0 +1,32 @@
+"""Job server failure reporting"""
+
+import asyncio
+
+import pipeline
+from batch import BatchJob
+from server import JobServer, ServerJob
+
+
+def test_agent_setup_failure_finishes_the_job(monkeypatch):
+    class BrokenAgent:
+        def __init__(self, *args, **kwargs):
+            raise OSError("no temp dir")
+
+    monkeypatch.setattr(pipeline, "NotebookLMVideoAgent", BrokenAgent)
+    server = JobServer()
+    server_job = ServerJob("job1", BatchJob("a.mp3", "slides", "out.mp4"))
+
+    async def run():
+        server._active = asyncio.Semaphore(1)
+        await server._run(server_job)
+
+    try:
+        asyncio.run(run())
+    finally:
+        for executor in server.executors.values():
+            executor.shutdown(wait=True)
+
+    assert server_job.status == "failed"
+    assert server_job.error == "setup: OSError: no temp dir"
+    assert server_job.events[-1]['event'] == 'finished'
+    assert not any(event['event'] == 'stage' for event in server_job.events)
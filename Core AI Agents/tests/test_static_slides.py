@@ -0,0 +1,67 @@
+"""Concat list of the static slide renderer"""
+
+import subprocess
+
+import ffmpeg_render
+from ffmpeg_render import _concat_entries, render_static_slides
+
+
+def test_concat_entries_cover_exact_frames():
+    piece = ffmpeg_render.Path("still_0000.ts")
+    assert _concat_entries(piece, 120, 60, 30) == ["file 'still_0000.ts'"] * 2
+    assert _concat_entries(piece, 75, 60, 30) == [
+        "file 'still_0000.ts'", "file 'still_0000.ts'", "outpoint 0.500000"
+    ]
+    assert _concat_entries(piece, 20, 20, 30) == ["file 'still_0000.ts'"]
+
+
+def _fake_encoders(monkeypatch, encoded):
+    def still(slide, out, frames, resolution, fps, x264):
+        encoded.append(('still', out.name, frames))
+        out.write_bytes(b"")
+        return out
+
+    def transition(first, second, out, frames, resolution, fps, x264):
+        encoded.append(('fade', out.name, frames))
+        out.write_bytes(b"")
+        return out
+
+    commands = []
+    monkeypatch.setattr(ffmpeg_render, "_encode_still", still)
+    monkeypatch.setattr(ffmpeg_render, "_encode_transition", transition)
+    monkeypatch.setattr(subprocess, "run", lambda cmd, **kwargs: commands.append(cmd))
+    return commands
+
+
+def _listed_frames(concat_text, encoded, fps):
+    """Frames the concat demuxer plays for a list built from `encoded` pieces"""
+    lengths = {name: frames for _, name, frames in encoded}
+    total, last = 0, None
+    for line in concat_text.splitlines():
+        if line.startswith("file "):
+            last = line[len("file '"):-1]
+            total += lengths[last]
+        elif line.startswith("outpoint "):
+            total += round(float(line.split()[1]) * fps) - lengths[last]
+    return total
+
+
+def test_static_slides_concat_matches_the_slide_durations(tmp_path, monkeypatch):
+    encoded = []
+    commands = _fake_encoders(monkeypatch, encoded)
+    slides = [tmp_path / f"slide_{i}.png" for i in range(3)]
+
+    render_static_slides(
+        slides, [5.0, 3.3, 7.0], str(tmp_path / "episode.m4a"), str(tmp_path / "out.webm"),
+        tmp_path / "work", fps=30, transition=0.5, copy_audio=False,
+        subtitles_file=tmp_path / "work" / "captions.ass"
+    )
+
+    concat_text = (tmp_path / "work" / "static_concat.txt").read_text()
+    assert _listed_frames(concat_text, encoded, 30) == round((5.0 + 3.3 + 7.0) * 30)
+    assert [kind for kind, _, _ in encoded].count('fade') == 2
+    assert all(frames == 30 for kind, _, frames in encoded if kind == 'fade')
+
+    cmd = commands[-1]
+    assert cmd[cmd.index('-c:a') + 1] == 'libopus'
+    assert '-c:s' in cmd and cmd[cmd.index('-c:s') + 1] == 'webvtt'
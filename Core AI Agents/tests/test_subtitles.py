@@ -0,0 +1,52 @@
+"""ASS caption tracks"""
+
+from subtitles import CaptionStyle, build_ass, get_caption_style
+
+
+def _dialogue(document):
+    return [line for line in document.splitlines() if line.startswith("Dialogue:")]
+
+
+def test_header_and_events():
+    captions = [
+        {'start': 0.0, 'end': 1.5, 'text': "Hello"},
+        {'start': 61.25, 'end': 3725.0, 'text': "Much later"},
+    ]
+    document = build_ass(captions, (1920, 1080), CaptionStyle())
+
+    assert "PlayResX: 1920" in document
+    assert "PlayResY: 1080" in document
+    assert _dialogue(document) == [
+        "Dialogue: 0,0:00:00.00,0:00:01.50,Caption,,0,0,0,,Hello",
+        "Dialogue: 0,0:01:01.25,1:02:05.00,Caption,,0,0,0,,Much later",
+    ]
+
+
+def test_text_is_escaped_and_uppercased():
+    style = CaptionStyle(uppercase=True)
+    document = build_ass([{'start': 0, 'end': 1, 'text': "a {b}\nc"}], (1280, 720), style)
+    assert _dialogue(document) == [r"Dialogue: 0,0:00:00.00,0:00:01.00,Caption,,0,0,0,,A (B)\NC"]
+
+
+def test_empty_captions_are_skipped():
+    document = build_ass([{'start': 2, 'end': 2, 'text': "x"}], (1280, 720), CaptionStyle())
+    assert _dialogue(document) == []
+
+
+def test_boxed_style_adds_a_box_layer():
+    document = build_ass(
+        [{'start': 0, 'end': 1, 'text': "hi"}], (1920, 1080), get_caption_style('youtube')
+    )
+    assert [line.split(",")[0] + "," + line.split(",")[3] for line in _dialogue(document)] == [
+        "Dialogue: 0,CaptionBox", "Dialogue: 1,Caption"
+    ]
+
+
+def test_style_colours_and_margins():
+    style = CaptionStyle(color=(255, 255, 0), width_ratio=0.75, margin_v=80)
+    document = build_ass([], (1920, 1080), style)
+    line = next(s for s in document.splitlines() if s.startswith("Style: Caption,"))
+    fields = line[len("Style: "):].split(",")
+
+    assert fields[3] == "&H0000FFFF"  # yellow as &HAABBGGRR
+    assert fields[19:22] == ["240", "240", "80"]
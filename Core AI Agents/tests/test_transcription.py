@@ -0,0 +1,50 @@
+"""Chunked transcription planning and caption stitching"""
+
+import pytest
+
+from transcription import merge_chunk_captions, plan_chunks
+
+RATE = 512  # one analysis frame (HOP_LENGTH samples) per second
+
+
+def _cap(start, end, text):
+    return {'start': start, 'end': end, 'text': text}
+
+
+def test_short_audio_is_one_chunk():
+    assert plan_chunks([0.0] * (RATE * 30), RATE, chunk_seconds=120.0) == [0.0, 30.0]
+
+
+def test_chunks_cut_at_pauses():
+    np = pytest.importorskip("numpy")
+    samples = np.ones(RATE * 300, dtype=np.float32)
+    samples[RATE * 95:RATE * 98] = 0.0  # pause around 96.5 s
+    samples[RATE * 205:RATE * 208] = 0.0  # pause around 206.5 s
+
+    boundaries = plan_chunks(samples, RATE, chunk_seconds=100.0)
+
+    assert boundaries[0] == 0.0
+    assert boundaries[-1] == pytest.approx(300.0)
+    assert len(boundaries) == 4
+    assert boundaries[1] == pytest.approx(96.5)
+    assert boundaries[2] == pytest.approx(206.5)
+
+
+def test_merge_keeps_overlap_captions_once():
+    boundaries = [0.0, 10.0, 20.0]
+    first = [_cap(0.0, 4.0, "a"), _cap(8.0, 11.0, "b"), _cap(10.5, 12.0, "c")]
+    second = [_cap(8.0, 11.0, "b"), _cap(10.5, 12.0, "c"), _cap(15.0, 19.0, "d")]
+
+    merged = merge_chunk_captions([first, second], boundaries)
+
+    assert [c['text'] for c in merged] == ["a", "b", "c", "d"]
+
+
+def test_merge_keeps_everything_at_the_outer_edges():
+    boundaries = [1.0, 10.0, 20.0]
+    first = [_cap(0.0, 1.5, "early")]
+    second = [_cap(19.0, 22.0, "late")]
+
+    merged = merge_chunk_captions([first, second], boundaries)
+
+    assert [c['text'] for c in merged] == ["early", "late"]
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Whisper transcription helpers
+Loads each model once per process and keeps it resident between jobs
+"""
+
+import importlib.util
+import math
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from audio_analysis import CANONICAL_SAMPLE_RATE, HOP_LENGTH, PcmFile, detect_segments, frame_rms
+
+# Whisper's input rate; the job PCM can be handed over as-is when it matches
+WHISPER_SAMPLE_RATE = CANONICAL_SAMPLE_RATE
+
+
+def whisper_available() -> bool:
+    """True when the openai-whisper package can be imported"""
+    return importlib.util.find_spec('whisper') is not None
+
+
+def result_to_captions(result: Dict, offset: float = 0.0) -> List[Dict]:
+    """Convert a Whisper result into caption dicts, shifted by `offset` seconds"""
+    return [
+        {
+            'text': segment["text"].strip(),
+            'start': segment["start"] + offset,
+            'end': segment["end"] + offset
+        } for segment in result["segments"]
+    ]
+
+
+class WhisperModelRegistry:
+    """
+    Process-wide Whisper model cache
+    Every model size is read from disk at most once per process and then
+    shared by all agents and jobs in it
+    """
+
+    _models: Dict[str, object] = {}
+    _model_locks: Dict[str, threading.Lock] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, name: str = "base"):
+        """Return the loaded model, loading it on first use"""
+        model = cls._models.get(name)
+        if model is None:
+            with cls._lock:
+                model = cls._models.get(name)
+                if model is None:
+                    import whisper
+                    print(f"🧠 Loading Whisper model '{name}'...")
+                    model = whisper.load_model(name)
+                    cls._models[name] = model
+                    cls._model_locks[name] = threading.Lock()
+        return model
+
+    @classmethod
+    def preload(cls, *names: str):
+        """Load models up front, e.g. at worker or server startup"""
+        for name in names or ("base",):
+            cls.get(name)
+
+    @classmethod
+    def loaded(cls) -> List[str]:
+        return list(cls._models)
+
+    @classmethod
+    def transcribe(cls, name: str, audio, **options) -> Dict:
+        """
+        Run `model.transcribe` on a shared model
+        Whisper installs per-call decoder hooks, so calls on one model are serialized
+        """
+        model = cls.get(name)
+        with cls._model_locks[name]:
+            return model.transcribe(audio, **options)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._models.clear()
+            cls._model_locks.clear()
+
+
+def limit_torch_threads(threads: Optional[int]):
+    """Cap the intra-op threads Whisper (torch) uses in this process"""
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+
+def _init_worker(model_name: str, threads: Optional[int]):
+    """Worker initializer: pin torch threads and load the model once"""
+    limit_torch_threads(threads)
+    WhisperModelRegistry.get(model_name)
+
+
+def _transcribe_in_worker(model_name: str, audio, options: Dict) -> Dict:
+    source = audio.open() if isinstance(audio, PcmFile) else audio
+    return WhisperModelRegistry.transcribe(model_name, source, **options)
+
+
+class TranscriptionWorkerPool:
+    """
+    Long-lived worker processes with the Whisper model already resident
+    Create one per batch or server and hand it to every agent; jobs then
+    skip model loading entirely
+    """
+
+    def __init__(
+        self,
+        model_name: str = "base",
+        workers: int = 1,
+        threads_per_worker: Optional[int] = None
+    ):
+        self.model_name = model_name
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(model_name, threads_per_worker)
+        )
+        # Start every worker now so the first job does not pay for loading
+        for future in [self._executor.submit(_noop) for _ in range(workers)]:
+            future.result()
+
+    def submit(self, audio, **options) -> Future:
+        """Queue a transcription; `audio` is a file path, PcmFile or array"""
+        return self._executor.submit(_transcribe_in_worker, self.model_name, audio, options)
+
+    def transcribe(self, audio, **options) -> Dict:
+        return self.submit(audio, **options).result()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _noop():
+    return None
+
+
+def default_worker_count() -> int:
+    """One transcription worker per core"""
+    return max(1, os.cpu_count() or 1)
+
+
+def plan_chunks(
+    samples,
+    sample_rate: int,
+    chunk_seconds: float = 120.0,
+    threshold_ratio: float = 0.5,
+    min_pause: float = 0.3
+) -> List[float]:
+    """
+    Chunk boundaries (seconds, including 0 and the duration) of roughly
+    `chunk_seconds` each, moved onto the nearest pause so no word is cut
+    """
+    duration = len(samples) / float(sample_rate)
+    count = max(1, int(math.ceil(duration / chunk_seconds)))
+    if count == 1:
+        return [0.0, duration]
+    segments = detect_segments(
+        frame_rms(samples, HOP_LENGTH),
+        HOP_LENGTH / sample_rate,
+        duration,
+        threshold_ratio=threshold_ratio,
+        min_pause=min_pause,
+        target_segments=count
+    )
+    return [segments[0]['start']] + [s['end'] for s in segments]
+
+
+def merge_chunk_captions(
+    chunk_captions: List[List[Dict]],
+    boundaries: List[float]
+) -> List[Dict]:
+    """
+    Stitch per-chunk captions (already on the global timeline) into one list
+    Each chunk owns [boundaries[i], boundaries[i+1]); a caption from the
+    overlap is kept only by the chunk that owns its midpoint
+    """
+    merged = []
+    last = len(chunk_captions) - 1
+    for i, captions in enumerate(chunk_captions):
+        lo, hi = boundaries[i], boundaries[i + 1]
+        for cap in captions:
+            mid = (cap['start'] + cap['end']) / 2.0
+            if (i == 0 or mid >= lo) and (i == last or mid < hi):
+                merged.append(cap)
+    merged.sort(key=lambda c: c['start'])
+    return merged
+
+
+def transcribe_chunked(
+    pool: TranscriptionWorkerPool,
+    pcm: PcmFile,
+    boundaries: List[float],
+    overlap: float = 2.0,
+    **options
+) -> List[Dict]:
+    """
+    Transcribe every chunk of `pcm` concurrently on `pool` and return one
+    caption list with global timestamps; chunks are padded by `overlap`
+    seconds on each side so words at the cuts are heard in full
+    """
+    total = pcm.length if pcm.length >= 0 else None
+    jobs: List[Tuple[float, Future]] = []
+    for lo, hi in zip(boundaries[:-1], boundaries[1:]):
+        start = max(0, int((lo - overlap) * pcm.sample_rate))
+        end = int((hi + overlap) * pcm.sample_rate)
+        if total is not None:
+            end = min(end, total)
+        chunk = PcmFile(pcm.path, pcm.sample_rate, pcm.start + start, end - start)
+        jobs.append((start / float(pcm.sample_rate), pool.submit(chunk, **options)))
+
+    chunk_captions = [
+        result_to_captions(future.result(), offset) for offset, future in jobs
+    ]
+    return merge_chunk_captions(chunk_captions, boundaries)
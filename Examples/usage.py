@@ -45,36 +45,55 @@ finally:
 import os
 import glob
 
-def batch_process(audio_dir: str, slides_base_dir: str, output_dir: str):
-    """Process multiple NotebookLM exports at once"""
+def batch_process(audio_dir: str, slides_base_dir: str, output_dir: str, workers: int = 4):
+    """Process multiple NotebookLM exports at once on a worker pool"""
+    from batch import BatchJob, run_batch
 
-    agent = NotebookLMVideoAgent()
-
-    audio_files = glob.glob(os.path.join(audio_dir, "*.mp3"))
-
-    for audio_path in audio_files:
+    jobs = []
+    for audio_path in sorted(glob.glob(os.path.join(audio_dir, "*.mp3"))):
         basename = os.path.splitext(os.path.basename(audio_path))[0]
         slides_dir = os.path.join(slides_base_dir, basename)
-        output_path = os.path.join(output_dir, f"{basename}.mp4")
 
         if not os.path.exists(slides_dir):
             print(f"⚠️  Skipping {basename} - no slides found")
             continue
 
-        print(f"\n🎬 Processing {basename}...")
-
-        try:
-            agent.process_notebooklm_export(
-                audio_path=audio_path,
-                visual_assets_dir=slides_dir,
-                output_path=output_path,
-                style="slides"
-            )
-            print(f"✅ Complete: {output_path}")
-        except Exception as e:
-            print(f"❌ Failed: {e}")
+        jobs.append(BatchJob(
+            audio=audio_path,
+            visuals=slides_dir,
+            output=os.path.join(output_dir, f"{basename}.mp4")
+        ))
 
-    agent.cleanup()
+    # Each worker keeps Whisper loaded and gets its own temp dir per job
+    summary = run_batch(
+        jobs, VideoConfig(), workers=workers,
+        summary_path=os.path.join(output_dir, "batch_results.json")
+    )
+    print(f"✅ {summary['succeeded']} complete, ❌ {summary['failed']} failed")
 
 # Uncomment to run batch processing:
-# batch_process("audio/", "slides/", "output/")
\ No newline at end of file
+# batch_process("audio/", "slides/", "output/")
+#
+# Or from the command line with a manifest:
+# python podcast_video_creator.py batch jobs.json --workers 4
+
+
+# Example 3: Long-lived transcription workers
+from transcription import TranscriptionWorkerPool
+
+def batch_process_with_workers(audio_files: list, slides_dir: str, output_dir: str):
+    """Keep Whisper resident in a worker process for the whole batch"""
+
+    with TranscriptionWorkerPool(model_name="base", workers=1) as pool:
+        agent = NotebookLMVideoAgent(transcriber=pool)
+        try:
+            for audio_path in audio_files:
+                basename = os.path.splitext(os.path.basename(audio_path))[0]
+                agent.process_notebooklm_export(
+                    audio_path=audio_path,
+                    visual_assets_dir=slides_dir,
+                    output_path=os.path.join(output_dir, f"{basename}.mp4"),
+                    style="slides"
+                )
+        finally:
+            agent.cleanup()
\ No newline at end of file